@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ApkConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apk'
+
+    def ready(self):
+        from . import signals  # noqa: F401
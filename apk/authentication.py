@@ -0,0 +1,127 @@
+import time
+
+import jwt
+from django.conf import settings
+from rest_framework import authentication
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated, PermissionDenied
+
+from codeedex.lru import LRUCache
+from employees import refs
+
+
+# =====================================================
+# APK TOKEN AUTHENTICATION
+# =====================================================
+# The APK sends the token from /apk/login/ as `Authorization: Bearer`.
+# The principal is built from the claims alone (no DB hit), and tokens
+# already verified by this process skip the signature check until they
+# expire.
+
+class EmployeePrincipal:
+    """Authenticated APK employee, straight from the token claims."""
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, claims):
+        self.claims = claims
+        self.pk = claims.get("pk")
+        self.employee_id = claims["employee_id"]
+        self.email = claims.get("email")
+        self.name = claims.get("name")
+        self.role = claims.get("role")
+
+    def as_employee(self):
+        """Partial Employee for lookups / FK assignment."""
+        if self.pk is None:
+            # Token issued before the pk claim existed
+            return refs.by_code(self.employee_id)
+
+        return refs.partial(
+            id=self.pk,
+            employee_id=self.employee_id,
+            email=self.email,
+            name=self.name,
+            role=self.role,
+        )
+
+    def __str__(self):
+        return self.employee_id
+
+
+_claims = None
+
+
+def _claims_cache():
+    global _claims
+    if _claims is None:
+        _claims = LRUCache(settings.APK_AUTH["CLAIMS_CACHE_SIZE"])
+    return _claims
+
+
+def decode_employee_token(token):
+    """Verified claims of an APK token (cached until the token expires)."""
+    claims = _claims_cache().get(token)
+    if claims is not None:
+        return claims
+
+    leeway = settings.APK_AUTH["LEEWAY"]
+    try:
+        claims = jwt.decode(
+            token,
+            settings.JWT_SECRET,
+            algorithms=[settings.JWT_ALGORITHM],
+            leeway=leeway,
+            options={"require": ["exp", "employee_id"]},
+        )
+    except jwt.ExpiredSignatureError:
+        raise AuthenticationFailed("Token expired")
+    except jwt.InvalidTokenError:
+        raise AuthenticationFailed("Invalid token")
+
+    remaining = claims["exp"] + leeway - time.time()
+    if remaining > 0:
+        _claims_cache().set(token, claims, remaining)
+    return claims
+
+
+class EmployeeTokenAuthentication(authentication.BaseAuthentication):
+    keyword = "Bearer"
+
+    def authenticate(self, request):
+        header = authentication.get_authorization_header(request).split()
+
+        if not header or header[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(header) != 2:
+            raise AuthenticationFailed("Invalid token header")
+
+        try:
+            token = header[1].decode()
+        except UnicodeError:
+            raise AuthenticationFailed("Invalid token header")
+
+        return EmployeePrincipal(decode_employee_token(token)), token
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+def request_employee(request, employee_code=None):
+    """
+    Employee the request acts for: the token holder, or (for app builds
+    that send no token) the body-supplied code when
+    APK_ALLOW_LEGACY_EMPLOYEE_CODE is on. None when the code is unknown.
+    """
+    principal = request.user
+
+    if isinstance(principal, EmployeePrincipal):
+        if employee_code and employee_code != principal.employee_id:
+            raise PermissionDenied("Token does not belong to this employee")
+        return principal.as_employee()
+
+    if not settings.APK_ALLOW_LEGACY_EMPLOYEE_CODE:
+        raise NotAuthenticated()
+
+    return refs.by_code(employee_code)
@@ -0,0 +1,131 @@
+import os
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client, override_settings
+
+from apk.utils import create_employee_token
+from codeedex.synthetic import seed_org
+from employees.models import Employee
+
+
+class Command(BaseCommand):
+    help = (
+        "Check-in throughput under concurrent taps. Runs against a scratch "
+        "database (created and dropped per mode), never the configured one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", type=int, default=4, help="Synthetic org size (24 employees per unit)")
+        parser.add_argument("--workers", type=int, default=8, help="Concurrent client threads")
+        parser.add_argument("--taps", type=int, default=4, help="Check-in/out taps per employee")
+        parser.add_argument(
+            "--sqlite-profiles",
+            default=",".join(settings.SQLITE_PROFILES),
+            help="SQLite only: comma-separated SQLITE_PROFILES to compare"
+        )
+
+    def handle(self, *args, **options):
+        if connection.vendor == "sqlite":
+            modes = [mode.strip() for mode in options["sqlite_profiles"].split(",") if mode.strip()]
+            unknown = set(modes) - set(settings.SQLITE_PROFILES)
+            if unknown:
+                raise CommandError(f"Unknown SQLite profile(s): {', '.join(sorted(unknown))}")
+        else:
+            modes = ["pool" if connection.settings_dict["OPTIONS"].get("pool") else "persistent"]
+
+        self.stdout.write(
+            f"{'mode':<12} {'taps':>6} {'errors':>6} {'taps/s':>8} {'p50 ms':>8} {'p95 ms':>8}"
+        )
+        for mode in modes:
+            result = self.run_mode(mode, options)
+            self.stdout.write(
+                f"{mode:<12} {result['taps']:>6} {result['errors']:>6} "
+                f"{result['rate']:>8.1f} {result['p50']:>8.1f} {result['p95']:>8.1f}"
+            )
+
+    # -----------------------------
+    # ONE MODE ON A SCRATCH DB
+    # -----------------------------
+    def run_mode(self, mode, options):
+        settings_dict = connection.settings_dict
+        saved_options = settings_dict["OPTIONS"]
+        saved_test_name = settings_dict["TEST"].get("NAME")
+        scratch_dir = None
+
+        if connection.vendor == "sqlite":
+            # A file, not the in-memory test DB: threads need real locking
+            scratch_dir = tempfile.mkdtemp(prefix="loadtest-")
+            settings_dict["TEST"]["NAME"] = os.path.join(scratch_dir, "loadtest.sqlite3")
+            settings_dict["OPTIONS"] = dict(settings.SQLITE_PROFILES[mode])
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            seed_org(scale=options["scale"], months=0)
+            employees = list(Employee.objects.all())
+            cache.clear()
+            return self.hammer(employees, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            settings_dict["OPTIONS"] = saved_options
+            settings_dict["TEST"]["NAME"] = saved_test_name
+            if scratch_dir:
+                for name in os.listdir(scratch_dir):
+                    os.remove(os.path.join(scratch_dir, name))
+                os.rmdir(scratch_dir)
+
+    def hammer(self, employees, options):
+        tokens = [create_employee_token(employee) for employee in employees]
+        workers = max(1, min(options["workers"], len(tokens)))
+        latencies, errors = [], []
+        lock = threading.Lock()
+
+        def work(mine):
+            from django.db import connection as thread_connection
+
+            client = Client()
+            timings, failed = [], 0
+            try:
+                for _ in range(options["taps"]):
+                    for token in mine:
+                        started = time.perf_counter()
+                        response = client.post("/apk/check/", HTTP_AUTHORIZATION=f"Bearer {token}")
+                        timings.append(time.perf_counter() - started)
+                        if response.status_code != 200:
+                            failed += 1
+            finally:
+                thread_connection.close()
+                with lock:
+                    latencies.extend(timings)
+                    errors.append(failed)
+
+        threads = [
+            threading.Thread(target=work, args=(tokens[n::workers],))
+            for n in range(workers)
+        ]
+
+        with override_settings(ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, "testserver"]):
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            elapsed = time.perf_counter() - started
+
+        latencies.sort()
+
+        def percentile(p):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000 if latencies else 0
+
+        return {
+            "taps": len(latencies),
+            "errors": sum(errors),
+            "rate": len(latencies) / elapsed if elapsed else 0,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+        }
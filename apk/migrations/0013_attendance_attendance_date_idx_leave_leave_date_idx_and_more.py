@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apk', '0012_alter_attendance_unique_together'),
+        ('employees', '0017_employee_employee_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['date', 'id'], name='attendance_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='leave',
+            index=models.Index(fields=['leave_date', 'id'], name='leave_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='loginhistory',
+            index=models.Index(fields=['login_time', 'id'], name='login_time_idx'),
+        ),
+    ]
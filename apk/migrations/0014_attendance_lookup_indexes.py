@@ -0,0 +1,26 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apk', '0013_attendance_attendance_date_idx_leave_leave_date_idx_and_more'),
+        ('employees', '0018_idsequence'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['employee', 'check_in'], name='attendance_emp_checkin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(fields=['employee', 'date'], name='attendance_emp_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='attendance',
+            index=models.Index(condition=models.Q(('check_out__isnull', True)), fields=['employee', 'check_in'], name='attendance_open_session_idx'),
+        ),
+    ]
@@ -0,0 +1,77 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .models import Attendance
+
+
+# =====================================================
+# PRESENCE STATE CACHE
+# =====================================================
+# One cache entry per employee (by pk) holding the session the check-in
+# toggle acts on: the open session if there is one, else the latest.
+# CheckInOutView and HomeAttendanceStatusView answer from it, so a tap
+# at the morning peak is a single INSERT/UPDATE.
+#
+# Write-through: the check-in view stores the new state after its write.
+# apk.signals drops the entry on any other Attendance write, and a miss
+# rebuilds it from the DB. Writes based on the state stay conditional
+# (check-out only closes a session that is still open), so a stale entry
+# costs a reload, never a wrong row.
+#
+# Only used with a cache shared by every worker (APK_PRESENCE_CACHE, off
+# on locmem): a per-process copy would miss the other workers' writes.
+
+KEY = "apk:presence:v2:{}"
+
+
+def _key(employee_pk):
+    return KEY.format(employee_pk)
+
+
+def enabled():
+    return settings.APK_PRESENCE_CACHE
+
+
+def _state(employee, session):
+    return {
+        "checked_in": bool(session and session.check_out is None),
+        "session_id": session.pk if session else None,
+        "date": session.date if session else None,
+        "check_in": session.check_in if session else None,
+        "check_out": session.check_out if session else None,
+    }
+
+
+def store(employee, session):
+    """Write-through after a check-in / check-out."""
+    state = _state(employee, session)
+    if enabled():
+        cache.set(_key(employee.pk), state, settings.APK_PRESENCE_TIMEOUT)
+    return state
+
+
+def forget(employee_pk):
+    if enabled():
+        cache.delete(_key(employee_pk))
+
+
+def load(employee):
+    """Presence state of `employee` (a full or partial Employee)."""
+    state = cache.get(_key(employee.pk)) if enabled() else None
+    if state is not None:
+        return state
+
+    session = (
+        Attendance.open_session(employee)
+        or Attendance.objects.filter(employee=employee).order_by("-check_in").first()
+    )
+    return store(employee, session)
+
+
+def checked_in_on(state, day):
+    """The cached session when it was checked in on `day` (local time)."""
+    check_in = state["check_in"]
+    if check_in and timezone.localtime(check_in).date() == day:
+        return state
+    return None
@@ -1,6 +1,7 @@
+from django.conf import settings
 from rest_framework import serializers
 from employees.models import Employee
-from .models import Attendance, Leave, LoginHistory
+from .models import Attendance, Leave, LoginHistory, SyncEvent
 
 
 class AttendanceSerializer(serializers.ModelSerializer):
@@ -92,3 +93,42 @@ class LoginHistorySerializer(serializers.ModelSerializer):
             'login_time',
             'login_date',
         ]
+
+
+# =====================================================
+# OFFLINE SYNC (/apk/sync/)
+# =====================================================
+
+class SyncEventSerializer(serializers.Serializer):
+    key = serializers.CharField(max_length=64)
+    type = serializers.ChoiceField(choices=SyncEvent.TYPE_CHOICES)
+    timestamp = serializers.DateTimeField()
+
+    # leave only
+    leave_date = serializers.DateField(required=False)
+    reason = serializers.CharField(max_length=255, required=False)
+
+    def validate(self, data):
+        if data["type"] == "leave":
+            if not data.get("leave_date"):
+                raise serializers.ValidationError({"leave_date": "Leave date is required"})
+            if not data.get("reason"):
+                raise serializers.ValidationError({"reason": "Reason is required"})
+        return data
+
+
+class SyncRequestSerializer(serializers.Serializer):
+    employee = serializers.CharField(required=False)
+    events = SyncEventSerializer(many=True, allow_empty=False)
+
+    def validate_events(self, events):
+        if len(events) > settings.APK_SYNC_MAX_EVENTS:
+            raise serializers.ValidationError(
+                f"At most {settings.APK_SYNC_MAX_EVENTS} events per sync"
+            )
+
+        keys = [event["key"] for event in events]
+        if len(keys) != len(set(keys)):
+            raise serializers.ValidationError("Event keys must be unique")
+
+        return events
@@ -0,0 +1,19 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Attendance
+from . import presence
+
+
+# =====================================================
+# PRESENCE CACHE INVALIDATION
+# =====================================================
+# Any Attendance write drops the employee's presence state; the
+# check-in view stores the fresh state right after its own write.
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def forget_presence(sender, instance, raw=False, **kwargs):
+    if not raw:
+        # FK value only: no Employee fetch per row cascaded from an employee delete
+        presence.forget(instance.employee_id)
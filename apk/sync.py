@@ -0,0 +1,221 @@
+from datetime import timedelta
+from functools import partial
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from attendance import reports
+from dashboard import rollups
+from dashboard.cache import invalidate_on_commit
+
+from . import presence
+from .models import Attendance, Leave, SyncEvent
+
+
+# =====================================================
+# OFFLINE SYNC
+# =====================================================
+# The APK queues check-in / check-out / leave actions while offline and
+# replays them in one /apk/sync/ call. Events are applied in timestamp
+# order inside one transaction with bulk writes; each outcome (applied
+# or rejected) is stored under the event key, so a retried batch gets
+# the same answers without applying anything twice.
+#
+# Bulk writes skip model signals → presence, dashboard and timesheet
+# report caches are invalidated, and the attendance rollups updated, here.
+#
+# Timestamps come from the device clock: up to APK_SYNC_CLOCK_SKEW ahead
+# of the server is read as "now", further ahead the event is rejected.
+
+
+class SyncInProgress(Exception):
+    """The same events were stored by a concurrent sync of this batch."""
+
+def _applied(message, **ids):
+    return {"status": "applied", "message": message, **ids}
+
+
+def _rejected(message):
+    return {"status": "rejected", "message": message}
+
+
+def _insert_leaves(leaves):
+    """
+    Insert `leaves` in one statement. A concurrent ApplyLeave request
+    can take an (employee, leave_date) after our check → then each row
+    goes in its own savepoint and the taken ones are left unsaved.
+    """
+    if not leaves:
+        return
+
+    try:
+        with transaction.atomic():
+            Leave.objects.bulk_create(leaves)
+        return
+    except IntegrityError:
+        pass
+
+    for leave in leaves:
+        try:
+            with transaction.atomic():
+                Leave.objects.bulk_create([leave])
+        except IntegrityError:
+            leave.pk = None
+
+
+def apply_events(employee, events):
+    """
+    Apply validated SyncEventSerializer data for `employee`.
+    Returns one result per event, in request order. Raises SyncInProgress
+    when a concurrent replay stored the same event keys first.
+    """
+    try:
+        return _apply(employee, events)
+    except IntegrityError:
+        # Only the (employee, key) constraint means a replay; any other
+        # failure is not a duplicate and goes up unchanged
+        if SyncEvent.objects.filter(
+            employee=employee,
+            key__in=[event["key"] for event in events]
+        ).exists():
+            raise SyncInProgress
+        raise
+
+
+def _apply(employee, events):
+    now = timezone.now()
+    latest = now + timedelta(seconds=settings.APK_SYNC_CLOCK_SKEW)
+
+    with transaction.atomic():
+        done = {
+            event.key: event.result
+            for event in SyncEvent.objects.filter(
+                employee=employee,
+                key__in=[event["key"] for event in events]
+            )
+        }
+
+        # sorted() is stable → same-timestamp events keep request order
+        pending = sorted(
+            (event for event in events if event["key"] not in done),
+            key=lambda event: event["timestamp"]
+        )
+
+        open_session = None
+        if any(event["type"] != "leave" for event in pending):
+            open_session = Attendance.open_session(employee)
+
+        taken_dates = set(
+            Leave.objects.filter(
+                employee=employee,
+                leave_date__in=[e["leave_date"] for e in pending if e["type"] == "leave"]
+            ).values_list("leave_date", flat=True)
+        )
+
+        new_sessions, closed_sessions, new_leaves = [], [], []
+        outcomes = []  # (event, result, attendance / leave row)
+
+        for event in pending:
+            kind = event["type"]
+            if event["timestamp"] > latest:
+                outcomes.append((event, _rejected("Timestamp is in the future"), None))
+                continue
+            timestamp = min(event["timestamp"], now)
+
+            # 1️⃣ CHECK-IN
+            if kind == "check_in":
+                if open_session:
+                    outcomes.append((event, _rejected("Already checked in"), None))
+                    continue
+
+                open_session = Attendance(
+                    employee=employee,
+                    date=timezone.localtime(timestamp).date(),
+                    check_in=timestamp
+                )
+                new_sessions.append(open_session)
+                outcomes.append((event, _applied("Checked in successfully"), open_session))
+
+            # 2️⃣ CHECK-OUT
+            elif kind == "check_out":
+                if open_session is None:
+                    outcomes.append((event, _rejected("Not checked in"), None))
+                    continue
+
+                if timestamp < open_session.check_in:
+                    outcomes.append((event, _rejected("Check-out is before check-in"), None))
+                    continue
+
+                open_session.check_out = timestamp
+                if open_session.pk:
+                    closed_sessions.append(open_session)
+                outcomes.append((event, _applied("Checked out successfully"), open_session))
+                open_session = None
+
+            # 3️⃣ LEAVE
+            else:
+                if event["leave_date"] in taken_dates:
+                    outcomes.append((event, _rejected("Leave already applied for this date"), None))
+                    continue
+
+                leave = Leave(
+                    employee=employee,
+                    leave_date=event["leave_date"],
+                    reason=event["reason"]
+                )
+                taken_dates.add(leave.leave_date)
+                new_leaves.append(leave)
+                outcomes.append((event, _applied("Leave applied successfully"), leave))
+
+        # bulk_create / bulk_update bypass Attendance.save()
+        for session in new_sessions + closed_sessions:
+            session.calculate_hours()
+
+        Attendance.objects.bulk_create(new_sessions)
+        rollups.sessions_added(employee, new_sessions)
+        Attendance.objects.bulk_update(
+            closed_sessions,
+            ["check_out", "working_hours", "overtime_hours"]
+        )
+        _insert_leaves(new_leaves)
+        new_leaves = [leave for leave in new_leaves if leave.pk]
+
+        records = []
+        for event, result, row in outcomes:
+            if isinstance(row, Attendance):
+                result["session_id"] = row.pk
+            elif isinstance(row, Leave) and row.pk is None:
+                result = _rejected("Leave already applied for this date")
+            elif isinstance(row, Leave):
+                result["leave_id"] = row.pk
+
+            done[event["key"]] = result
+            records.append(SyncEvent(
+                employee=employee,
+                key=event["key"],
+                event_type=event["type"],
+                timestamp=event["timestamp"],
+                result=result
+            ))
+        SyncEvent.objects.bulk_create(records)
+
+        if new_sessions or closed_sessions:
+            transaction.on_commit(partial(presence.forget, employee.pk))
+            invalidate_on_commit()
+
+        reports.invalidate_days(
+            [session.date for session in new_sessions + closed_sessions]
+            + [leave.leave_date for leave in new_leaves]
+        )
+
+    fresh = {event["key"] for event in pending}
+    return [
+        {
+            "key": event["key"],
+            "type": event["type"],
+            "duplicate": event["key"] not in fresh,
+            **done[event["key"]],
+        }
+        for event in events
+    ]
@@ -1,3 +1,194 @@
-from django.test import TestCase
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.db import IntegrityError
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from codeedex.synthetic import seed_org
+from employees import refs
+from employees.models import Employee
+
+from . import presence
+from .models import Attendance, Leave, SyncEvent
+from .utils import create_employee_token
+
+
+# =====================================================
+# CHECK-IN / CHECK-OUT WITH A STALE PRESENCE CACHE
+# =====================================================
+
+@override_settings(APK_PRESENCE_CACHE=True)
+class CheckInOutPresenceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sample = seed_org(scale=1, months=1)
+
+    def setUp(self):
+        cache.clear()
+        refs.clear()
+        self.employee = self.sample["staff"]
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {create_employee_token(self.employee)}")
+
+    def tap(self):
+        response = self.client.post("/apk/check/", {}, format="json")
+        self.assertEqual(response.status_code, 200)
+        return response.json()["data"]["status"]
+
+    def stale(self):
+        # Cached state as another worker would still see it
+        return cache.get(presence._key(self.employee.pk))
+
+    def test_stale_check_out_does_not_touch_a_closed_session(self):
+        self.assertEqual(self.tap(), "CHECKED_IN")
+        entry = self.stale()
+
+        self.assertEqual(self.tap(), "CHECKED_OUT")
+        closed = Attendance.objects.get(pk=entry["session_id"])
+
+        # Stale "checked in" entry → the tap opens a new session instead
+        cache.set(presence._key(self.employee.pk), entry)
+        self.assertEqual(self.tap(), "CHECKED_IN")
+
+        self.assertEqual(Attendance.objects.get(pk=closed.pk).check_out, closed.check_out)
+        self.assertTrue(Attendance.open_session(self.employee))
+
+    def test_stale_check_in_entry_closes_the_open_session(self):
+        self.assertEqual(self.tap(), "CHECKED_IN")
+        entry = self.stale()
+
+        # Closed and reopened by another worker
+        Attendance.objects.filter(pk=entry["session_id"]).update(check_out=timezone.now())
+        reopened = Attendance.objects.create(
+            employee=self.employee, check_in=timezone.now() + timedelta(seconds=1)
+        )
+        cache.set(presence._key(self.employee.pk), entry)
+
+        self.assertEqual(self.tap(), "CHECKED_OUT")
+        self.assertIsNotNone(Attendance.objects.get(pk=reopened.pk).check_out)
+
+    @override_settings(APK_PRESENCE_CACHE=False)
+    def test_no_presence_cache(self):
+        self.assertEqual(self.tap(), "CHECKED_IN")
+        self.assertIsNone(self.stale())
+        self.assertEqual(self.tap(), "CHECKED_OUT")
+
+
+# =====================================================
+# LOGIN AFTER A PASSWORD CHANGE ELSEWHERE
+# =====================================================
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    PASSWORD_HASHING={**settings.PASSWORD_HASHING, "WORKERS": 0},
+)
+class LoginPasswordChangeTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sample = seed_org(scale=1, months=1)
+
+    def setUp(self):
+        refs.clear()
+        self.client = APIClient()
+        self.employee = self.sample["staff"]
+
+    def login(self, password):
+        return self.client.post(
+            "/apk/login/", {"email": self.employee.email, "password": password}, format="json"
+        ).status_code
+
+    def test_old_password_stops_working_at_once(self):
+        self.assertEqual(self.login(self.sample["password"]), 200)  # ref now cached
+
+        # Changed by another worker: this process's LRU is not told
+        Employee.objects.filter(pk=self.employee.pk).update(password=make_password("changed1"))
+
+        self.assertEqual(self.login(self.sample["password"]), 400)
+        self.assertEqual(self.login("changed1"), 200)
+
+
+# =====================================================
+# OFFLINE SYNC: DEVICE CLOCKS AND CONSTRAINT FAILURES
+# =====================================================
+
+@override_settings(APK_SYNC_CLOCK_SKEW=60)
+class SyncTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sample = seed_org(scale=1, months=1)
+
+    def setUp(self):
+        cache.clear()
+        refs.clear()
+        self.employee = self.sample["staff"]
+        Attendance.objects.filter(employee=self.employee, check_out__isnull=True).update(
+            check_out=timezone.now()
+        )
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {create_employee_token(self.employee)}")
+
+    def sync(self, *events):
+        return self.client.post("/apk/sync/", {"events": [
+            {"key": key, "type": kind, "timestamp": timestamp} for key, kind, timestamp in events
+        ]}, format="json")
+
+    def test_future_timestamps(self):
+        now = timezone.now()
+        response = self.sync(
+            ("ahead", "check_in", now + timedelta(hours=1)),
+            ("skewed", "check_in", now + timedelta(seconds=30)),
+        )
+
+        self.assertEqual(response.status_code, 200)
+        ahead, skewed = response.json()["data"]["results"]
+        self.assertEqual(ahead["status"], "rejected")
+        self.assertEqual(skewed["status"], "applied")
+
+        # Within the tolerance → clamped to the server clock
+        session = Attendance.objects.get(pk=skewed["session_id"])
+        self.assertLessEqual(session.check_in, timezone.now())
+
+    def test_leave_taken_by_a_concurrent_request(self):
+        day = timezone.localdate() + timedelta(days=30)
+
+        def apply_leave(*args):
+            # ApplyLeave commits between the taken-dates check and the insert
+            Leave.objects.create(employee=self.employee, leave_date=day, reason="Other request")
+
+        with mock.patch("apk.sync.rollups.sessions_added", side_effect=apply_leave):
+            response = self.client.post("/apk/sync/", {"events": [
+                {"key": "in", "type": "check_in", "timestamp": timezone.now()},
+                {"key": "leave", "type": "leave", "timestamp": timezone.now(),
+                 "leave_date": day, "reason": "Synced"},
+            ]}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        check_in, leave = response.json()["data"]["results"]
+        self.assertEqual(check_in["status"], "applied")
+        self.assertEqual(leave["status"], "rejected")
+        self.assertEqual(SyncEvent.objects.get(key="leave").result["status"], "rejected")
+        self.assertEqual(Leave.objects.get(employee=self.employee, leave_date=day).reason, "Other request")
+
+    def test_concurrent_replay_is_409(self):
+        # Stored by the other request between our lookup and insert
+        SyncEvent.objects.create(
+            employee=self.employee, key="replayed", event_type="check_in",
+            timestamp=timezone.now(), result={"status": "applied"}
+        )
+        with mock.patch("apk.sync._apply", side_effect=IntegrityError):
+            response = self.sync(("replayed", "check_in", timezone.now()))
+
+        self.assertEqual(response.status_code, 409)
+
+    def test_other_constraint_failure_is_not_a_duplicate(self):
+        with mock.patch("apk.sync._apply", side_effect=IntegrityError("NOT NULL constraint failed")):
+            with self.assertRaises(IntegrityError):
+                self.sync(("fresh", "check_in", timezone.now()))
@@ -0,0 +1,138 @@
+import json
+
+from django.db.models import CharField, DateTimeField, DecimalField, F, IntegerField, Value
+from django.http import StreamingHttpResponse
+from rest_framework import serializers
+
+from .models import Attendance, Leave
+
+
+# =====================================================
+# ATTENDANCE + LEAVE TIMELINE
+# =====================================================
+# Attendance and leave rows share one shape so both tables can be
+# merged in SQL (UNION ALL) instead of sorting Python dicts. Columns
+# are renamed so they never clash with a model field name.
+# `kind` breaks ties between the two tables on the same date:
+# attendance (0) is listed before leave (1).
+
+TIMELINE_ORDERING = ("-day", "kind", "id")
+
+_datetime_field = serializers.DateTimeField()
+_hours_field = serializers.DecimalField(max_digits=5, decimal_places=2)
+
+
+def employee_type_filter(user_type):
+    """Employee filter used by the `?type=employee|intern` query param."""
+    if user_type == "employee":
+        return {"employee__employee_id__startswith": "EMP"}
+    if user_type == "intern":
+        return {"employee__employee_id__startswith": "INT"}
+    return {}
+
+
+def timeline_querysets(**filters):
+    """
+    Return the attendance and leave `values()` querysets with identical
+    columns, ready to be merged with `union(all=True)`.
+    """
+    attendance = (
+        Attendance.objects
+        .filter(**filters)
+        .values(
+            "id",
+            day=F("date"),
+            time_in=F("check_in"),
+            time_out=F("check_out"),
+            hours=F("working_hours"),
+            overtime=F("overtime_hours"),
+            code=F("employee__employee_id"),
+            name=F("employee__name"),
+            note=Value(None, output_field=CharField()),
+            kind=Value(0, output_field=IntegerField()),
+        )
+    )
+
+    leaves = (
+        Leave.objects
+        .filter(**filters)
+        .values(
+            "id",
+            day=F("leave_date"),
+            time_in=Value(None, output_field=DateTimeField()),
+            time_out=Value(None, output_field=DateTimeField()),
+            hours=Value(None, output_field=DecimalField()),
+            overtime=Value(None, output_field=DecimalField()),
+            code=F("employee__employee_id"),
+            name=F("employee__name"),
+            note=F("reason"),
+            kind=Value(1, output_field=IntegerField()),
+        )
+    )
+
+    return attendance, leaves
+
+
+def timeline_row(row):
+    """Format a timeline row like the AttendanceSerializer output."""
+    return {
+        "id": row["id"],
+        "employee_id": row["code"],
+        "employee_name": row["name"],
+        "date": row["day"].isoformat() if row["day"] else None,
+        "check_in": _datetime_field.to_representation(row["time_in"]) if row["time_in"] else None,
+        "check_out": _datetime_field.to_representation(row["time_out"]) if row["time_out"] else None,
+        "working_hours": _hours_field.to_representation(row["hours"]) if row["hours"] is not None else None,
+        "overtime_hours": _hours_field.to_representation(row["overtime"]) if row["overtime"] is not None else None,
+        "reason": row["note"],
+    }
+
+
+# =====================================================
+# STREAMING
+# =====================================================
+# The merged timeline is read with a server-side cursor and written out
+# row by row, so memory stays flat and the first byte is sent as soon
+# as SQLite/Postgres returns the first row.
+
+STREAM_CHUNK_SIZE = 2000
+
+
+def merged_timeline(**filters):
+    """UNION ALL of attendance and leave, ordered newest first."""
+    attendance, leaves = timeline_querysets(**filters)
+    return attendance.union(leaves, all=True).order_by(*TIMELINE_ORDERING)
+
+
+def _json_array_stream(rows, message):
+    # Same envelope as api_response, with `data` written incrementally
+    yield '{"success": true, "message": %s, "data": [' % json.dumps(message)
+    separator = ""
+    for row in rows:
+        yield separator + json.dumps(timeline_row(row))
+        separator = ","
+    yield "]}"
+
+
+def _ndjson_stream(rows):
+    for row in rows:
+        yield json.dumps(timeline_row(row)) + "\n"
+
+
+def streaming_timeline_response(message, stream="json", **filters):
+    """
+    Stream the merged timeline as a JSON envelope (default) or as
+    NDJSON (`stream="ndjson"`, one record per line).
+    """
+    rows = merged_timeline(**filters).iterator(chunk_size=STREAM_CHUNK_SIZE)
+
+    if stream == "ndjson":
+        return StreamingHttpResponse(
+            _ndjson_stream(rows),
+            content_type="application/x-ndjson"
+        )
+
+    return StreamingHttpResponse(
+        _json_array_stream(rows, message),
+        content_type="application/json"
+    )
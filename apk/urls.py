@@ -7,7 +7,8 @@ from .views import (
     AttendanceListView,
     LeaveListView,
     LoginListView,
-    LogoutView
+    LogoutView,
+    SyncView
 )
 
 urlpatterns = [
@@ -19,5 +20,6 @@ urlpatterns = [
     path('leave-list/', LeaveListView.as_view(), name='leave-list'),
     path("home-status/", HomeAttendanceStatusView.as_view()),
     path("attendance-list/", AttendanceListView.as_view()),
+    path("sync/", SyncView.as_view(), name='sync'),
     
 ]
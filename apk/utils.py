@@ -13,7 +13,9 @@ def api_response(success, message, data=None, status_code=200):
 
 def create_employee_token(employee):
     payload = {
+        "pk": employee.pk,
         "employee_id": employee.employee_id,
+        "name": employee.name,
         "email": employee.email,
         "role": employee.role,
         "exp": datetime.utcnow() + timedelta(hours=2),
@@ -1,20 +1,31 @@
 from datetime import date
 import re
+from django.db import IntegrityError
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from django.contrib.auth import authenticate
 from rest_framework import status
-from django.contrib.auth.hashers import check_password
 from .models import Attendance, Leave, LoginHistory
-from .serializers import AttendanceSerializer, LeaveSerializer, LoginHistorySerializer
+from .serializers import LeaveSerializer, LoginHistorySerializer, SyncRequestSerializer
+from .sync import SyncInProgress, apply_events
+from employees.hashing import HashingBusy, hash_password, verify_password
+from employees import refs
+from employees.utils import hashing_busy_response
 from employees.models import Employee
 from rest_framework.generics import ListAPIView
-from .utils import api_response 
 from .utils import api_response, create_employee_token
+from . import presence
+from .authentication import EmployeeTokenAuthentication, request_employee
+from .timeline import employee_type_filter, streaming_timeline_response
+from codeedex.pagination import KeysetPagination
+from attendance import reports
+from dashboard.cache import invalidate_on_commit
 
 
 class ApkLoginView(APIView):
+    authentication_classes = []  # issues the token; a stale one must not block login
+
     def post(self, request):
         email = request.data.get("email", "").strip().lower()
         password = request.data.get("password", "").strip()
@@ -30,13 +41,27 @@ class ApkLoginView(APIView):
         if not re.match(pattern, email):
             return api_response(False, "Only gmail.com email is allowed", None, 400)
 
-        try:
-            user = Employee.objects.get(email__iexact=email)
-        except Employee.DoesNotExist:
+        user = refs.by_email(email)
+        if user is None:
+            return api_response(False, "Invalid credentials", None, 400)
+
+        # Not part of the cached ref → a password change applies at once
+        encoded = Employee.objects.filter(pk=user.pk).values_list("password", flat=True).first()
+        if encoded is None:
             return api_response(False, "Invalid credentials", None, 400)
 
+        def upgrade_hash(raw):
+            # Stored hash used old hasher settings → store a fresh one
+            Employee.objects.filter(pk=user.pk).update(password=hash_password(raw))
+
         # ✅ Only hash check — DO NOT re-validate format
-        if not check_password(password, user.password):
+        # Hashing runs in the worker pool; a full queue answers 503
+        try:
+            valid = verify_password(password, encoded, setter=upgrade_hash)
+        except HashingBusy:
+            return hashing_busy_response()
+
+        if not valid:
             return api_response(False, "Invalid credentials", None, 400)
 
         today = date.today()
@@ -60,56 +85,94 @@ class ApkLoginView(APIView):
 
 
 # ✅ CHECK-IN / CHECK-OUT (FIXED & SAFE)
+# Presence state comes from apk.presence → one write per tap on a cache hit
 class CheckInOutView(APIView):
-    def post(self, request):
-        employee_code = request.data.get("employee")
+    authentication_classes = [EmployeeTokenAuthentication]
 
-        try:
-            employee = Employee.objects.get(employee_id=employee_code)
-        except Employee.DoesNotExist:
+    def post(self, request):
+        employee = request_employee(request, request.data.get("employee"))
+        if employee is None:
             return api_response(False, "Invalid Employee", None, 400)
 
         now = timezone.now()
         today = date.today()
 
-        # 🔍 Find last open session (check_in but no check_out)
-        last_session = Attendance.objects.filter(
+        # A stale presence entry fails the conditional check-out → reload once
+        for _ in range(2):
+            state = presence.load(employee)
+
+            # 1️⃣ If NO open session → create NEW check-in
+            if not state["checked_in"]:
+                try:
+                    session = Attendance.objects.create(
+                        employee=employee,
+                        date=today,        # IMPORTANT
+                        check_in=now
+                    )
+                except IntegrityError:
+                    # Token of an employee deleted since login
+                    return api_response(False, "Invalid Employee", None, 400)
+                presence.store(employee, session)
+                return api_response(True, "Checked in successfully", {
+                    "status": "CHECKED_IN",
+                    "time": now,
+                })
+
+            # 2️⃣ If there is an open session → CHECK OUT
+            session = self.check_out(employee, state, now)
+            if session is not None:
+                presence.store(employee, session)
+                return api_response(True, "Checked out successfully", {
+                    "status": "CHECKED_OUT",
+                    "time": now,
+                })
+
+            # Closed or removed behind the cache → act on the DB state
+            presence.forget(employee.pk)
+
+        return api_response(False, "Attendance changed, please try again", None, 409)
+
+    @staticmethod
+    def check_out(employee, state, now):
+        """Close the session of `state` if it is still open, else None."""
+        session = Attendance(
+            pk=state["session_id"],
             employee=employee,
-            check_out__isnull=True
-        ).order_by('-check_in').first()
-
-        # 1️⃣ If NO open session → create NEW check-in
-        if not last_session:
-            Attendance.objects.create(
-                employee=employee,
-                date=today,        # IMPORTANT
-                check_in=now
-            )
-            return api_response(True, "Checked in successfully", {
-                "status": "CHECKED_IN",
-                "time": now,
-            })
+            date=state["date"],
+            check_in=state["check_in"],
+            check_out=now
+        )
+        session.calculate_hours()
 
-        # 2️⃣ If there is an open session → CHECK OUT
-        last_session.check_out = now
-        last_session.save()
+        closed = Attendance.objects.filter(
+            pk=session.pk,
+            check_out__isnull=True
+        ).update(
+            check_out=session.check_out,
+            working_hours=session.working_hours,
+            overtime_hours=session.overtime_hours,
+        )
+        if not closed:
+            return None
 
-        return api_response(True, "Checked out successfully", {
-            "status": "CHECKED_OUT",
-            "time": now,
-        })
+        # update() skips the model signals; rollups count check-ins only
+        invalidate_on_commit()
+        reports.invalidate_days([session.date])
+        return session
 
 
 
 # ✅ APPLY LEAVE (FIXED)
 class ApplyLeaveView(APIView):
+    authentication_classes = [EmployeeTokenAuthentication]
+
     def post(self, request):
         employee_code = request.data.get("employee")
         leave_date = request.data.get("leave_date")
         reason = request.data.get("reason")
 
         # Validate inputs
-        if not employee_code:
+        if not employee_code and not request.user.is_authenticated:
             return api_response(False, "Employee code is required", None, 400)
 
         if not leave_date:
@@ -119,9 +182,8 @@ class ApplyLeaveView(APIView):
             return api_response(False, "Reason is required", None, 400)
 
         # Check employee exists
-        try:
-            employee = Employee.objects.get(employee_id=employee_code)
-        except Employee.DoesNotExist:
+        employee = request_employee(request, employee_code)
+        if employee is None:
             return api_response(False, "Invalid Employee", None, 400)
 
         # ❌ Prevent duplicate leave
@@ -139,22 +201,48 @@ class ApplyLeaveView(APIView):
 
 
 
-# ✅ HOME PAGE STATUS (SHOW TODAY CHECK-IN & CHECK-OUT)
-class HomeAttendanceStatusView(APIView):
+# ✅ OFFLINE SYNC (batch of queued check-in / check-out / leave events)
+class SyncView(APIView):
+    authentication_classes = [EmployeeTokenAuthentication]
+
     def post(self, request):
-        employee_code = request.data.get("employee")
+        serializer = SyncRequestSerializer(data=request.data)
+        if not serializer.is_valid():
+            return api_response(False, "Invalid sync request", serializer.errors, 400)
+
+        employee = request_employee(request, serializer.validated_data.get("employee"))
+        if employee is None:
+            return api_response(False, "Invalid Employee", None, 400)
 
         try:
-            employee = Employee.objects.get(employee_id=employee_code)
-        except Employee.DoesNotExist:
+            results = apply_events(employee, serializer.validated_data["events"])
+        except SyncInProgress:
+            # Same batch replayed concurrently → the retry gets stored results
+            return api_response(False, "Sync already in progress, please retry", None, 409)
+        except IntegrityError:
+            # Token of an employee deleted since login
+            if not Employee.objects.filter(pk=employee.pk).exists():
+                return api_response(False, "Invalid Employee", None, 400)
+            raise
+
+        return api_response(True, "Sync completed", {"results": results})
+
+
+
+# ✅ HOME PAGE STATUS (SHOW TODAY CHECK-IN & CHECK-OUT)
+class HomeAttendanceStatusView(APIView):
+    authentication_classes = [EmployeeTokenAuthentication]
+
+    def post(self, request):
+        employee = request_employee(request, request.data.get("employee"))
+        if employee is None:
             return api_response(False, "Invalid Employee", None, 400)
 
+        state = presence.load(employee)
         today = date.today()
 
-        last_session = Attendance.objects.filter(
-            employee=employee,
-            check_in__date=today
-        ).order_by('-check_in').first()
+        # Latest session, if it was checked in today
+        last_session = presence.checked_in_on(state, today)
 
         if not last_session:
             return api_response(True, "No attendance marked today", {
@@ -165,19 +253,22 @@ class HomeAttendanceStatusView(APIView):
 
         return api_response(True, "Attendance status fetched", {
             "date": str(today),
-            "check_in": last_session.check_in,
-            "check_out": last_session.check_out
+            "check_in": last_session["check_in"],
+            "check_out": last_session["check_out"]
         })
 
 class LeaveListView(APIView):
+    authentication_classes = [EmployeeTokenAuthentication]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("-leave_date", "id")
+
     def get(self, request):
         employee_code = request.query_params.get("employee") 
 
         # If filtering by employee
         if employee_code:
-            try:
-                employee = Employee.objects.get(employee_id=employee_code)
-            except Employee.DoesNotExist:
+            employee = refs.by_code(employee_code)
+            if employee is None:
                 return api_response(False, "Invalid Employee ID", None, 400)
 
             leaves = Leave.objects.filter(employee=employee).order_by("-leave_date")
@@ -185,105 +276,76 @@ class LeaveListView(APIView):
             # Return all leaves
             leaves = Leave.objects.all().order_by("-leave_date")
 
-        serializer = LeaveSerializer(leaves, many=True)
-        return api_response(True, "Leave list fetched successfully", serializer.data)
+        paginator = self.pagination_class()
+        page = paginator.paginate_queryset(
+            leaves.select_related("employee"), request, view=self
+        )
+
+        serializer = LeaveSerializer(page, many=True)
+        return paginator.get_paginated_response(
+            serializer.data,
+            message="Leave list fetched successfully"
+        )
 
 
 class AttendanceListView(APIView):
+    authentication_classes = [EmployeeTokenAuthentication]
+
     def get(self, request):
         user_type = request.GET.get("type")  # employee / intern / None
+        stream = request.GET.get("stream", "json")  # json / ndjson
 
-        # 1️⃣ Filter employees
-        employees = Employee.objects.all()
-        if user_type == "employee":
-            employees = employees.filter(employee_id__startswith="EMP")
-        elif user_type == "intern":
-            employees = employees.filter(employee_id__startswith="INT")
-
-        employee_ids = employees.values_list("id", flat=True)
-
-        # 2️⃣ Fetch attendance + leave
-        attendance = Attendance.objects.filter(employee_id__in=employee_ids)
-        leaves = Leave.objects.filter(employee_id__in=employee_ids)
-
-        # 3️⃣ Serialize
-        attendance_data = AttendanceSerializer(attendance, many=True).data
-        leave_data = LeaveSerializer(leaves, many=True).data
-
-        # 4️⃣ Format LEAVE records (KEEP reason, remove status)
-        formatted_leaves = []
-        for leave in leave_data:
-            formatted_leaves.append({
-                "id": leave["id"],
-                "employee_id": leave["employee_id"],
-                "employee_name": leave["employee_name"],
-                "date": leave["leave_date"],
-                "check_in": None,
-                "check_out": None,
-                "working_hours": None,
-                "overtime_hours": None,
-                "reason": leave["reason"]      # Only for leave
-            })
-
-        # 5️⃣ Format attendance records (remove status + keep reason None)
-        for a in attendance_data:
-            a["reason"] = None                # present has no reason
-            if "status" in a:
-                a.pop("status")
-
-        # 6️⃣ Merge
-        combined = attendance_data + formatted_leaves
-
-        # 7️⃣ Sort by date
-        combined_sorted = sorted(combined, key=lambda x: x["date"], reverse=True)
-
-        return api_response(
-            True,
+        # Attendance + leave merged in SQL (newest first) and streamed
+        return streaming_timeline_response(
             "Attendance + Leave list fetched successfully",
-            combined_sorted
+            stream=stream,
+            **employee_type_filter(user_type)
         )
 
 
 class LoginListView(ListAPIView):
-    queryset = LoginHistory.objects.all().order_by('-login_time')
+    authentication_classes = [EmployeeTokenAuthentication]
+    queryset = LoginHistory.objects.select_related("employee").order_by('-login_time')
     serializer_class = LoginHistorySerializer
+    pagination_class = KeysetPagination
+    cursor_ordering = ("-login_time", "id")
 
     def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.get_serializer(page, many=True)
 
-        return api_response(
-            True,
-            "Login history fetched successfully",
-            response.data
+        return self.paginator.get_paginated_response(
+            serializer.data,
+            message="Login history fetched successfully"
         )
 class LogoutView(APIView):
+    authentication_classes = [EmployeeTokenAuthentication]
+
     def post(self, request):
         emp_code = request.data.get("employee_id")
 
-        if not emp_code:
+        if not emp_code and not request.user.is_authenticated:
             return api_response(False, "employee_id is required", status=400)
 
-        try:
-            # Find employee by code
-            employee = Employee.objects.get(employee_id=emp_code)
+        # Find employee by code
+        employee = request_employee(request, emp_code)
+        if employee is None:
+            return api_response(False, "Employee not found", status=404)
 
-            # Find today’s login record
-            login_record = LoginHistory.objects.filter(
-                employee=employee,
-                login_date=timezone.now().date()
-            ).first()
-
-            if not login_record:
-                return api_response(False, "No login found for today", status=400)
+        # Find today’s login record
+        login_record = LoginHistory.objects.filter(
+            employee=employee,
+            login_date=timezone.now().date()
+        ).first()
 
-            # Update logout time
-            login_record.logout_time = timezone.now()
-            login_record.save()
+        if not login_record:
+            return api_response(False, "No login found for today", status=400)
 
-            return api_response(True, "Logout successful", {
-                "employee_id": emp_code,
-                "logout_time": login_record.logout_time
-            })
+        # Update logout time
+        login_record.logout_time = timezone.now()
+        login_record.save()
 
-        except Employee.DoesNotExist:
-            return api_response(False, "Employee not found", status=404)
\ No newline at end of file
+        return api_response(True, "Logout successful", {
+            "employee_id": employee.employee_id,
+            "logout_time": login_record.logout_time
+        })
\ No newline at end of file
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from attendance import reports
+
+
+class Command(BaseCommand):
+    help = (
+        "Per-employee timesheet for a pay period (worked hours, overtime, days "
+        "present, leave days) as CSV or XLSX. Closed periods come from the cache."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--period", help="YYYY-MM (or use --start / --end)")
+        parser.add_argument("--start", help="YYYY-MM-DD")
+        parser.add_argument("--end", help="YYYY-MM-DD")
+        parser.add_argument("--type", choices=["employee", "intern"], help="Default: everyone")
+        parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+        parser.add_argument("-o", "--output", help="File path (CSV default: stdout)")
+
+    def handle(self, *args, **options):
+        try:
+            start, end = reports.parse_period(options["period"], options["start"], options["end"])
+        except ValueError as error:
+            raise CommandError(error)
+
+        rows = reports.timesheet(start, end, **reports.employee_filter(options["type"]))
+
+        if options["format"] == "xlsx":
+            if reports.Workbook is None:
+                raise CommandError("XLSX export needs openpyxl (pip install openpyxl)")
+            if not options["output"]:
+                raise CommandError("XLSX needs --output")
+
+            with open(options["output"], "wb") as fileobj:
+                reports.write_xlsx(rows, fileobj)
+
+        elif options["output"]:
+            with open(options["output"], "w", newline="", encoding="utf-8") as fileobj:
+                fileobj.writelines(reports.csv_lines(rows))
+        else:
+            # Written as the rows arrive
+            for line in reports.csv_lines(rows):
+                self.stdout.write(line, ending="")
+            return
+
+        self.stdout.write(self.style.SUCCESS(f"Timesheet {start} → {end} written to {options['output']}"))
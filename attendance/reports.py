@@ -0,0 +1,242 @@
+import calendar
+import csv
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from functools import partial
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, DecimalField, IntegerField, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from apk.models import Attendance, Leave
+from employees.models import Employee
+
+try:
+    from openpyxl import Workbook
+except ImportError:  # optional: XLSX export only
+    Workbook = None
+
+
+# =====================================================
+# TIMESHEET / PAYROLL PERIOD REPORT
+# =====================================================
+# One row per employee for a pay period: worked hours, overtime, days
+# present and leave days. Every total is a correlated subquery over the
+# (employee, date) index of Attendance / Leave, so the database returns
+# the finished rows and nothing is summed in Python.
+#
+# Closed periods (ending before today) are cached without expiry. Each
+# month has a version key, bumped by Attendance / Leave writes on one
+# of its days (attendance.signals, apk.sync for the bulk path); employee
+# edits bump the global one. A report is cached under the versions of
+# every month it spans, so a backdated write recomputes only the
+# periods it touches.
+
+COLUMNS = (
+    ("employee_id", "Employee ID"),
+    ("name", "Name"),
+    ("employment_type", "Type"),
+    ("department", "Department"),
+    ("days_present", "Days Present"),
+    ("leave_days", "Leave Days"),
+    ("worked_hours", "Worked Hours"),
+    ("overtime_hours", "Overtime Hours"),
+)
+
+EMPLOYEES_VERSION_KEY = "attendance:timesheet:employees"
+MONTH_VERSION_KEY = "attendance:timesheet:month:{:%Y-%m}"
+
+_HOURS = DecimalField(max_digits=9, decimal_places=2)
+_CENTS = Decimal("0.01")
+
+STREAM_CHUNK_SIZE = 2000
+
+
+def _config():
+    return settings.TIMESHEET_REPORT
+
+
+# -----------------------------
+# PERIODS
+# -----------------------------
+def month_period(value):
+    """'YYYY-MM' → (first day, last day) of that month."""
+    first = date.fromisoformat(f"{value}-01")
+    return first, first.replace(day=calendar.monthrange(first.year, first.month)[1])
+
+
+def parse_period(period=None, start=None, end=None):
+    """
+    `period` ('YYYY-MM') or `start` + `end` ('YYYY-MM-DD') → (start, end).
+    Raises ValueError with a message for the client.
+    """
+    if not period and not (start and end):
+        raise ValueError("Give a period (YYYY-MM) or a start and end date")
+
+    try:
+        if period:
+            start, end = month_period(period)
+        else:
+            start, end = date.fromisoformat(str(start)), date.fromisoformat(str(end))
+    except ValueError:
+        raise ValueError("Invalid date (period is YYYY-MM, start / end are YYYY-MM-DD)")
+
+    if start > end:
+        raise ValueError("start must be on or before end")
+    if (end - start).days >= _config()["MAX_DAYS"]:
+        raise ValueError(f"Period longer than {_config()['MAX_DAYS']} days")
+
+    return start, end
+
+
+def employee_filter(user_type):
+    """`?type=employee|intern` → Employee filter (EMP ids are the staff)."""
+    if user_type == "employee":
+        return {"employment_type": "staff"}
+    if user_type == "intern":
+        return {"employment_type": "intern"}
+    return {}
+
+
+def is_closed(end):
+    return end < timezone.localdate()
+
+
+def _months(start, end):
+    month = start.replace(day=1)
+    while month <= end:
+        yield month
+        month = (month + timedelta(days=32)).replace(day=1)
+
+
+# -----------------------------
+# AGGREGATION
+# -----------------------------
+def _total(model, date_field, aggregate, output_field, start, end):
+    rows = (
+        model.objects
+        .filter(employee=OuterRef("pk"), **{f"{date_field}__range": (start, end)})
+        .order_by()
+        .values("employee")
+        .annotate(total=aggregate)
+        .values("total")
+    )
+    return Coalesce(Subquery(rows, output_field=output_field), 0, output_field=output_field)
+
+
+def timesheet_queryset(start, end, **filters):
+    """
+    Employees with their totals for `start`..`end` (inclusive): every
+    active employee, plus inactive ones with attendance or leave then.
+    """
+    return (
+        Employee.objects
+        .filter(**filters)
+        .annotate(
+            days_present=_total(Attendance, "date", Count("date", distinct=True), IntegerField(), start, end),
+            leave_days=_total(Leave, "leave_date", Count("id"), IntegerField(), start, end),
+            worked_hours=_total(Attendance, "date", Sum("working_hours"), _HOURS, start, end),
+            overtime_hours=_total(Attendance, "date", Sum("overtime_hours"), _HOURS, start, end),
+        )
+        .filter(Q(status="active") | Q(days_present__gt=0) | Q(leave_days__gt=0))
+        .order_by("employee_id")
+        .values(*(field for field, _ in COLUMNS))
+    )
+
+
+def _clean(row):
+    # SQLite returns floats for decimal sums
+    for field in ("worked_hours", "overtime_hours"):
+        row[field] = Decimal(str(row[field] or 0)).quantize(_CENTS)
+    return row
+
+
+# -----------------------------
+# CACHE (closed periods)
+# -----------------------------
+def _cache_key(start, end, filters):
+    keys = [EMPLOYEES_VERSION_KEY] + [MONTH_VERSION_KEY.format(month) for month in _months(start, end)]
+    versions = cache.get_many(keys)
+
+    missing = {key: time.time_ns() for key in keys if key not in versions}
+    if missing:
+        # Never restart from a number an evicted version may have used
+        for key, version in missing.items():
+            cache.add(key, version, None)
+        versions = cache.get_many(keys)
+
+    scope = ",".join(f"{name}={value}" for name, value in sorted(filters.items()))
+    stamp = ".".join(str(versions.get(key, 0)) for key in keys)
+    return f"attendance:timesheet:{start}:{end}:{scope}:{stamp}"
+
+
+def _bump(*keys):
+    for key in keys:
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), None)
+
+
+def invalidate_days(days):
+    """Drop the cached reports of the months of `days`, once the write commits."""
+    # Views may save a model with the date still as the posted string
+    keys = {MONTH_VERSION_KEY.format(date.fromisoformat(str(day))) for day in days}
+    if keys:
+        transaction.on_commit(partial(_bump, *keys))
+
+
+def invalidate_employees():
+    transaction.on_commit(partial(_bump, EMPLOYEES_VERSION_KEY))
+
+
+def timesheet(start, end, **filters):
+    """
+    Report rows for `start`..`end` (an iterable, consume once); closed
+    periods come from the cache.
+    """
+    if not is_closed(end):
+        # Still changing → computed on every call and streamed
+        rows = timesheet_queryset(start, end, **filters).iterator(chunk_size=STREAM_CHUNK_SIZE)
+        return (_clean(row) for row in rows)
+
+    key = _cache_key(start, end, filters)
+    rows = cache.get(key)
+    if rows is None:
+        rows = [_clean(row) for row in timesheet_queryset(start, end, **filters)]
+        cache.set(key, rows, _config()["CACHE_TIMEOUT"])
+    return rows
+
+
+# -----------------------------
+# OUTPUT
+# -----------------------------
+class _Echo:
+    """csv.writer target that hands every line back instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def csv_lines(rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow([title for _, title in COLUMNS])
+    for row in rows:
+        yield writer.writerow([row[field] for field, _ in COLUMNS])
+
+
+def write_xlsx(rows, fileobj):
+    """Write the report as an XLSX workbook (requires openpyxl)."""
+    if Workbook is None:
+        raise RuntimeError("XLSX export needs openpyxl (pip install openpyxl)")
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Timesheet")
+    sheet.append([title for _, title in COLUMNS])
+    for row in rows:
+        sheet.append([row[field] for field, _ in COLUMNS])
+    workbook.save(fileobj)
@@ -0,0 +1,43 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from apk.models import Attendance, Leave
+from employees.models import Employee
+
+from . import reports
+
+
+# =====================================================
+# TIMESHEET REPORT CACHE INVALIDATION
+# =====================================================
+# A write drops the cached reports of its month (and of the month it
+# was moved from); employee edits drop them all (names, type, status).
+
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def forget_attendance_month(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    days = {instance.date}
+    # Day the row was loaded / last saved with → moved sessions. Own
+    # attribute: the dashboard receivers move _rollup_key in post_save
+    old_day = getattr(instance, "_report_date", None)
+    if old_day:
+        days.add(old_day)
+    reports.invalidate_days(days)
+    instance._report_date = instance.date
+
+
+@receiver(post_save, sender=Leave)
+@receiver(post_delete, sender=Leave)
+def forget_leave_month(sender, instance, raw=False, **kwargs):
+    if not raw:
+        reports.invalidate_days([instance.leave_date])
+
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def forget_employee_reports(sender, instance, raw=False, **kwargs):
+    if not raw:
+        reports.invalidate_employees()
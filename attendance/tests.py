@@ -1,3 +1,126 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db.models.signals import post_save
+from django.db.models import Sum
 from django.test import TestCase
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apk.models import Attendance, Leave
+from codeedex.synthetic import seed_org
+
+from . import reports
+from .signals import forget_attendance_month
+
+
+# =====================================================
+# TIMESHEET REPORT
+# =====================================================
+
+class TimesheetReportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sample = seed_org(scale=1, months=2)
+        cls.admin = User.objects.create_user("report-admin", "report.admin@gmail.com", "Admin@12345", is_staff=True)
+
+        # Last closed month
+        cls.start, cls.end = reports.month_period(
+            f"{timezone.localdate().replace(day=1) - timedelta(days=1):%Y-%m}"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def row(self, rows, employee):
+        return next(row for row in rows if row["employee_id"] == employee.employee_id)
+
+    def test_totals(self):
+        staff = self.sample["staff"]
+        rows = list(reports.timesheet(self.start, self.end))
+
+        sessions = Attendance.objects.filter(employee=staff, date__range=(self.start, self.end))
+        totals = sessions.aggregate(worked=Sum("working_hours"), overtime=Sum("overtime_hours"))
+        row = self.row(rows, staff)
+
+        self.assertEqual(row["days_present"], sessions.dates("date", "day").count())
+        self.assertEqual(row["worked_hours"], Decimal(totals["worked"] or 0).quantize(Decimal("0.01")))
+        self.assertEqual(row["overtime_hours"], Decimal(totals["overtime"] or 0).quantize(Decimal("0.01")))
+        self.assertEqual(
+            row["leave_days"],
+            Leave.objects.filter(employee=staff, leave_date__range=(self.start, self.end)).count()
+        )
+
+    def test_closed_period_is_cached_until_a_write_to_it(self):
+        staff = self.sample["staff"]
+        before = self.row(list(reports.timesheet(self.start, self.end)), staff)
+
+        with self.assertNumQueries(0):
+            list(reports.timesheet(self.start, self.end))
+
+        # Backdated session → that month is recomputed
+        check_in = timezone.now() - timedelta(days=60)
+        with self.captureOnCommitCallbacks(execute=True):
+            Attendance.objects.create(
+                employee=staff,
+                date=self.start,
+                check_in=check_in,
+                check_out=check_in + timedelta(hours=2),
+            )
+
+        after = self.row(list(reports.timesheet(self.start, self.end)), staff)
+        self.assertEqual(after["worked_hours"], before["worked_hours"] + 1)  # 2 h - 1 h break
+
+    def test_moved_session_drops_the_old_month(self):
+        staff = self.sample["staff"]
+        before = self.row(list(reports.timesheet(self.start, self.end)), staff)
+        session = Attendance.objects.filter(
+            employee=staff, date__range=(self.start, self.end), working_hours__gt=0
+        ).first()
+        moved = session.working_hours
+
+        # Runs after the dashboard receivers whatever the app order
+        post_save.disconnect(forget_attendance_month, sender=Attendance)
+        post_save.connect(forget_attendance_month, sender=Attendance)
+
+        session.date = self.end + timedelta(days=1)
+        with self.captureOnCommitCallbacks(execute=True):
+            session.save()
+
+        after = self.row(list(reports.timesheet(self.start, self.end)), staff)
+        self.assertEqual(after["worked_hours"], before["worked_hours"] - moved)
+
+    def test_csv_export_streams(self):
+        response = self.client.get(
+            "/attendance/timesheet-report/",
+            {"start": self.start, "end": self.end, "type": "intern", "export": "csv"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], ",".join(title for _, title in reports.COLUMNS))
+        self.assertTrue(all(line.startswith("INT") for line in lines[1:]))
+        self.assertIn(self.sample["intern"].employee_id, "\n".join(lines))
+
+    def test_invalid_period(self):
+        for params in ({}, {"period": "2024-13"}, {"start": "2024-02-01", "end": "2024-01-01"}):
+            response = self.client.get("/attendance/timesheet-report/", params)
+            self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(None)
+        self.assertIn(self.client.get("/attendance/timesheet-report/").status_code, (401, 403))
+
+    def test_command(self):
+        out = StringIO()
+        call_command("timesheet_report", period=f"{self.start:%Y-%m}", stdout=out)
 
-# Create your tests here.
+        lines = out.getvalue().splitlines()
+        self.assertEqual(len(lines) - 1, len(list(reports.timesheet(self.start, self.end))))
@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import AdminAttendanceList
+from .views import AdminAttendanceList, TimesheetReportView
 
 urlpatterns = [
     path('admin-attendance/', AdminAttendanceList.as_view(), name='admin-attendance'),
+    path('timesheet-report/', TimesheetReportView.as_view(), name='timesheet-report'),
 ]
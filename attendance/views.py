@@ -1,76 +1,107 @@
+from tempfile import SpooledTemporaryFile
+
+from django.http import FileResponse, StreamingHttpResponse
 from rest_framework.views import APIView
-from django.utils import timezone
-from apk.models import Attendance, Leave
-from apk.serializers import AttendanceSerializer, LeaveSerializer
-from employees.models import Employee
-from apk.utils import api_response  
-from rest_framework.permissions import AllowAny
+from apk.timeline import (
+    TIMELINE_ORDERING,
+    employee_type_filter,
+    streaming_timeline_response,
+    timeline_querysets,
+    timeline_row,
+)
+from codeedex.db_routers import replica_reads
+from codeedex.pagination import KeysetPagination
+from rest_framework.permissions import AllowAny, IsAdminUser
+
+from . import reports
+from .utils import api_response
 
+@replica_reads
 class AdminAttendanceList(APIView):
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
+    cursor_ordering = TIMELINE_ORDERING
 
     def get(self, request):
         user_type = request.GET.get("type")  # employee | intern | None
+        stream = request.GET.get("stream")  # json | ndjson | None
 
-        # 1️⃣ Filter employees
-        employees = Employee.objects.all()
+        # Full history export → streamed, constant memory
+        if stream:
+            return streaming_timeline_response(
+                "Attendance fetched successfully",
+                stream=stream,
+                **employee_type_filter(user_type)
+            )
 
-        if user_type == "employee":
-            employees = employees.filter(employee_id__startswith="EMP")
-        elif user_type == "intern":
-            employees = employees.filter(employee_id__startswith="INT")
+        # 1️⃣ Attendance & Leave with the same columns
+        attendance, leaves = timeline_querysets(**employee_type_filter(user_type))
 
-        # 2️⃣ Attendance & Leave
-        attendance = Attendance.objects.filter(
-            employee__in=employees
-        )
+        # 2️⃣ Merge & sort in the database, one page at a time
+        paginator = self.pagination_class()
+        rows = paginator.paginate_querysets([attendance, leaves], request, view=self)
 
-        leaves = Leave.objects.filter(
-            employee__in=employees
+        return paginator.get_paginated_response(
+            [timeline_row(row) for row in rows],
+            message="Attendance fetched successfully"
         )
 
-        attendance_data = AttendanceSerializer(
-            attendance,
-            many=True,
-            context={"request": request}
-        ).data
-
-        leave_data = LeaveSerializer(
-            leaves,
-            many=True,
-            context={"request": request}
-        ).data
-
-        # 3️⃣ Normalize leave records to attendance format
-        formatted_leaves = [
-            {
-                "id": leave["id"],
-                "employee_id": leave["employee_id"],
-                "employee_name": leave["employee_name"],
-                "date": leave["leave_date"],
-                "check_in": None,
-                "check_out": None,
-                "working_hours": None,
-                "overtime_hours": None,
-                "reason": leave["reason"],
-            }
-            for leave in leave_data
-        ]
-
-        # 4️⃣ Ensure attendance also has `reason`
-        for a in attendance_data:
-            a["reason"] = None
-
-        # 5️⃣ Merge & sort
-        combined = attendance_data + formatted_leaves
-        combined_sorted = sorted(
-            combined,
-            key=lambda x: x["date"],
-            reverse=True
-        )
 
+# ---------------------------------------------
+# TIMESHEET / PAYROLL PERIOD REPORT
+# ---------------------------------------------
+# ?period=YYYY-MM or ?start=&end=, optional ?type=employee|intern,
+# ?export=csv|xlsx for a download instead of JSON.
+# Served by the primary: closed periods are cached without expiry, so
+# they must not be computed from a lagging replica.
+class TimesheetReportView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        try:
+            start, end = reports.parse_period(
+                request.GET.get("period"),
+                request.GET.get("start"),
+                request.GET.get("end"),
+            )
+        except ValueError as error:
+            return api_response(False, str(error), status_code=400)
+
+        export = request.GET.get("export")
+        if export not in (None, "csv", "xlsx"):
+            return api_response(False, "export must be csv or xlsx", status_code=400)
+        if export == "xlsx" and reports.Workbook is None:
+            return api_response(False, "XLSX export is not available (openpyxl not installed)", status_code=400)
+
+        rows = reports.timesheet(start, end, **reports.employee_filter(request.GET.get("type")))
+        filename = f"timesheet_{start}_{end}"
+
+        # 1️⃣ CSV → streamed line by line
+        if export == "csv":
+            response = StreamingHttpResponse(reports.csv_lines(rows), content_type="text/csv")
+            response["Content-Disposition"] = f'attachment; filename="{filename}.csv"'
+            return response
+
+        # 2️⃣ XLSX → a zip archive, built in a (spooled) temp file
+        if export == "xlsx":
+            workbook = SpooledTemporaryFile(max_size=10 * 1024 * 1024)
+            reports.write_xlsx(rows, workbook)
+            workbook.seek(0)
+            return FileResponse(
+                workbook,
+                as_attachment=True,
+                filename=f"{filename}.xlsx",
+                content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+            )
+
+        # 3️⃣ JSON
         return api_response(
             success=True,
-            message="Attendance fetched successfully",
-            data=combined_sorted
+            message="Timesheet report fetched successfully",
+            data={
+                "start": start,
+                "end": end,
+                "closed": reports.is_closed(end),
+                "rows": list(rows),
+            }
         )
@@ -0,0 +1,60 @@
+import hashlib
+
+from django.db.models import F, Func, Subquery
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+
+# =====================================================
+# CONDITIONAL GET (ETag / Last-Modified)
+# =====================================================
+# Detail views declare a `version(request, **kwargs)` function that
+# returns (version parts, last modified) from one cheap query, or None
+# when the object does not exist. Matching If-None-Match /
+# If-Modified-Since requests get a 304 before the view (and its
+# serializers) runs. A last modified of None sends the ETag only, for
+# versions a delete can change without moving any timestamp.
+
+def conditional(version):
+    """Method decorator for the GET handler of an APIView / ViewSet action."""
+
+    def load(request, *args, **kwargs):
+        # condition() asks for the etag and last-modified separately
+        if not hasattr(request, "_conditional_version"):
+            request._conditional_version = version(request, *args, **kwargs)
+        return request._conditional_version
+
+    def etag(request, *args, **kwargs):
+        loaded = load(request, *args, **kwargs)
+        if loaded is None:
+            return None
+
+        parts, _ = loaded
+        # Same data renders differently per path / params / host (absolute URLs)
+        key = repr((request.path, sorted(request.GET.lists()), request.get_host(), parts))
+        return hashlib.sha1(key.encode()).hexdigest()
+
+    def last_modified(request, *args, **kwargs):
+        loaded = load(request, *args, **kwargs)
+        return loaded[1] if loaded else None
+
+    return method_decorator(condition(etag_func=etag, last_modified_func=last_modified))
+
+
+def latest(*values):
+    """Newest of the given timestamps (None ignored)."""
+    return max((value for value in values if value is not None), default=None)
+
+
+def max_of(queryset, field="updated_at"):
+    """Scalar subquery: MAX(field) over `queryset` (may use OuterRef)."""
+    return Subquery(
+        queryset.order_by().annotate(value=Func(F(field), function="MAX")).values("value")[:1]
+    )
+
+
+def count_of(queryset):
+    """Scalar subquery: COUNT(*) over `queryset` (may use OuterRef)."""
+    return Subquery(
+        queryset.order_by().annotate(value=Func(F("pk"), function="COUNT")).values("value")[:1]
+    )
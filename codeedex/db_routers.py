@@ -0,0 +1,121 @@
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db import connections
+
+
+# =====================================================
+# READ REPLICA ROUTING
+# =====================================================
+# Read-only endpoints (dashboard aggregates, attendance and list views)
+# read from the `replica` alias so reporting does not compete with
+# check-in writes on the primary. Everything else, and every write,
+# uses `default`.
+#
+# A view opts in with the `replica_reads` decorator (function views,
+# APIView classes or handler methods) or, on a ViewSet, with a
+# `replica_reads = {"list", ...}` attribute naming the actions.
+# codeedex.middleware.ReplicaRoutingMiddleware sets the per-request flag
+# this router reads; GET / HEAD only.
+#
+# Read-your-writes: a request that wrote sets a short-lived cookie, and
+# requests carrying it stay on the primary until the replica caught up.
+# A write inside a replica request also moves the rest of it to the
+# primary.
+
+_state = threading.local()
+
+
+def _config():
+    return settings.DB_REPLICA
+
+
+def replica_enabled():
+    return _config()["ALIAS"] in settings.DATABASES
+
+
+def replica_reads(view):
+    """Mark a view function, APIView class or handler method as read-only."""
+    view.replica_reads = True
+    return view
+
+
+def wants_replica(view_func, method):
+    """Is the resolved view tagged for replica reads for this HTTP method?"""
+    if method not in ("GET", "HEAD"):
+        return False
+
+    view_class = getattr(view_func, "cls", None) or getattr(view_func, "view_class", None)
+    if view_class is None:
+        return getattr(view_func, "replica_reads", False) is True
+
+    # HEAD is served by the GET handler / action
+    actions = getattr(view_func, "actions", None)  # ViewSet.as_view({...})
+    handler_name = actions.get("get") if actions else "get"
+
+    tagged = getattr(view_class, "replica_reads", False)
+    if tagged is True or (not isinstance(tagged, bool) and handler_name in tagged):
+        return True
+
+    handler = getattr(view_class, handler_name, None) if handler_name else None
+    return getattr(handler, "replica_reads", False) is True
+
+
+# -----------------------------
+# PER-REQUEST STATE
+# -----------------------------
+def use_replica(value):
+    _state.replica = value
+
+
+def reading_replica():
+    return getattr(_state, "replica", False)
+
+
+def start_request():
+    _state.replica = False
+    _state.wrote = False
+
+
+def request_wrote():
+    return getattr(_state, "wrote", False)
+
+
+@contextmanager
+def primary_reads():
+    """Reads inside the block go to the primary, in any request."""
+    previous = reading_replica()
+    use_replica(False)
+    try:
+        yield
+    finally:
+        # A write in the block keeps the rest of the request on the primary
+        use_replica(previous and not request_wrote())
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        if not reading_replica() or not replica_enabled():
+            return None
+
+        # Inside a transaction on the primary → read its own rows
+        if connections["default"].in_atomic_block:
+            return None
+
+        return _config()["ALIAS"]
+
+    def db_for_write(self, model, **hints):
+        _state.wrote = True
+        # Later reads of this request must see the write
+        _state.replica = False
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both aliases
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica gets its schema from the primary
+        return db != _config()["ALIAS"]
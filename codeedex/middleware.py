@@ -0,0 +1,297 @@
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework import serializers
+
+from . import db_routers
+
+
+logger = logging.getLogger("codeedex.perf")
+
+
+# =====================================================
+# REQUEST PROFILING
+# =====================================================
+# A sampled request records: route + view, SQL count and time,
+# duplicated SQL (same statement run again with other params → N+1),
+# statements slower than SLOW_SQL_MS, serializer time and response size.
+#
+#   - every sampled request feeds the per-route percentiles served by
+#     /dashboard/perf/ (process-local, like employees.hashing.HashMetrics)
+#   - slow or duplicate-heavy ones are logged as one JSON line to the
+#     `codeedex.perf` logger (rotating file, see LOGGING in settings)
+#
+# SAMPLE_RATE = 0 removes the middleware from the stack at startup.
+
+_active = ContextVar("codeedex_profile", default=None)
+
+
+def _config():
+    return settings.REQUEST_PROFILING
+
+
+class Profile:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.statements = Counter()
+        self.slow_sql = []
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+        self.size = 0
+
+    # connection.execute_wrapper hook
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.sql_count += 1
+            self.sql_time += elapsed
+            self.statements[sql] += 1
+
+            if elapsed * 1000 >= _config()["SLOW_SQL_MS"]:
+                self.slow_sql.append({"sql": sql[:500], "ms": round(elapsed * 1000, 2)})
+
+    def duplicates(self):
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def as_record(self, request, status):
+        match = request.resolver_match
+        most_repeated = self.statements.most_common(1)
+
+        return {
+            "route": "/" + match.route if match else None,
+            "view": (match.view_name or match._func_path) if match else None,
+            "method": request.method,
+            "path": request.path,
+            "status": status,
+            "ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "sql_count": self.sql_count,
+            "sql_ms": round(self.sql_time * 1000, 2),
+            "duplicate_sql": self.duplicates(),
+            "most_repeated_sql": (
+                {"sql": most_repeated[0][0][:500], "count": most_repeated[0][1]}
+                if most_repeated and most_repeated[0][1] > 1 else None
+            ),
+            "slow_sql": self.slow_sql,
+            "serializer_ms": round(self.serializer_time * 1000, 2),
+            "bytes": self.size,
+        }
+
+
+# -----------------------------
+# SERIALIZER TIMING
+# -----------------------------
+# Views call `serializer.data` once per payload; time it (outermost call
+# only, nested .data calls are already inside) while a profile is active.
+def _timed_data(prop):
+    def data(self):
+        profile = _active.get()
+        if profile is None:
+            return prop.fget(self)
+
+        profile._serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return prop.fget(self)
+        finally:
+            profile._serializer_depth -= 1
+            if not profile._serializer_depth:
+                profile.serializer_time += time.perf_counter() - started
+
+    data._profiled = True
+    return property(data)
+
+
+def _instrument_serializers():
+    for cls in (serializers.Serializer, serializers.ListSerializer):
+        prop = cls.__dict__["data"]
+        if not getattr(prop.fget, "_profiled", False):
+            cls.data = _timed_data(prop)
+
+
+# -----------------------------
+# PER-ROUTE METRICS
+# -----------------------------
+class RouteMetrics:
+    """Recent samples per route (process-local)."""
+
+    FIELDS = ("ms", "sql_count", "sql_ms", "serializer_ms", "bytes")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=_config()["WINDOW"]))
+
+    def record(self, record):
+        key = (record["method"], record["route"])
+        with self._lock:
+            self._samples[key].append(tuple(record[field] for field in self.FIELDS))
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self):
+        with self._lock:
+            samples = {key: list(rows) for key, rows in self._samples.items()}
+
+        def percentile(values, p):
+            return values[min(len(values) - 1, int(len(values) * p))]
+
+        report = []
+        for (method, route), rows in samples.items():
+            entry = {"method": method, "route": route, "samples": len(rows)}
+            for n, field in enumerate(self.FIELDS):
+                values = sorted(row[n] for row in rows)
+                entry[field] = {
+                    "p50": percentile(values, 0.50),
+                    "p95": percentile(values, 0.95),
+                    "p99": percentile(values, 0.99),
+                    "max": values[-1],
+                }
+            report.append(entry)
+
+        return sorted(report, key=lambda entry: entry["ms"]["p95"], reverse=True)
+
+
+metrics = RouteMetrics()
+
+
+# -----------------------------
+# MIDDLEWARE
+# -----------------------------
+class RequestProfilingMiddleware:
+
+    def __init__(self, get_response):
+        if not _config()["SAMPLE_RATE"]:
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+        _instrument_serializers()
+
+    def __call__(self, request):
+        if random.random() >= _config()["SAMPLE_RATE"]:
+            return self.get_response(request)
+
+        profile = Profile()
+        wrapped = connections.all()
+        for connection in wrapped:
+            connection.execute_wrappers.append(profile)
+
+        def finish(response):
+            for connection in wrapped:
+                if profile in connection.execute_wrappers:
+                    connection.execute_wrappers.remove(profile)
+            self.report(request, response, profile)
+
+        # Serializers run inside the view; the body may stream later
+        token = _active.set(profile)
+        try:
+            response = self.get_response(request)
+        except Exception:
+            finish(None)
+            raise
+        finally:
+            _active.reset(token)
+
+        if response.streaming:
+            # Rows are read while the body streams → finish after the last chunk
+            response.streaming_content = self._stream(
+                response.streaming_content, response, profile, finish
+            )
+        else:
+            profile.size = len(response.content)
+            finish(response)
+
+        return response
+
+    @staticmethod
+    def _stream(content, response, profile, finish):
+        try:
+            for chunk in content:
+                profile.size += len(chunk)
+                yield chunk
+        finally:
+            finish(response)
+
+    @staticmethod
+    def report(request, response, profile):
+        status = response.status_code if response is not None else 500
+        record = profile.as_record(request, status)
+        if record["route"] is None:
+            return  # 404 before URL resolution
+
+        metrics.record(record)
+
+        config = _config()
+        if record["ms"] >= config["SLOW_MS"] or record["duplicate_sql"] >= config["DUPLICATE_SQL"]:
+            logger.warning(json.dumps(record, default=str))
+
+
+# =====================================================
+# REPLICA ROUTING (codeedex.db_routers)
+# =====================================================
+# Sends the reads of views tagged `replica_reads` to the replica, and
+# keeps a client that just wrote on the primary for STICKY_SECONDS via
+# a cookie. Not loaded when no replica alias is configured.
+
+class ReplicaRoutingMiddleware:
+
+    def __init__(self, get_response):
+        if not db_routers.replica_enabled():
+            raise MiddlewareNotUsed()
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        db_routers.start_request()
+        try:
+            response = self.get_response(request)
+            on_replica = db_routers.reading_replica()
+            wrote = db_routers.request_wrote()
+        finally:
+            db_routers.start_request()
+
+        config = settings.DB_REPLICA
+        if wrote:
+            response.set_cookie(
+                config["COOKIE"],
+                "1",
+                max_age=config["STICKY_SECONDS"],
+                httponly=True,
+                samesite="Lax",
+            )
+
+        if on_replica and response.streaming:
+            # Rows are read while the body streams
+            response.streaming_content = self._stream(response.streaming_content)
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        if settings.DB_REPLICA["COOKIE"] in request.COOKIES:
+            return None  # read-your-writes
+
+        if db_routers.wants_replica(view_func, request.method):
+            db_routers.use_replica(True)
+        return None
+
+    @staticmethod
+    def _stream(content):
+        db_routers.use_replica(True)
+        try:
+            yield from content
+        finally:
+            db_routers.use_replica(False)
@@ -0,0 +1,235 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import date, datetime
+from decimal import Decimal
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+# =====================================================
+# KEYSET (CURSOR) PAGINATION
+# =====================================================
+# The cursor holds the ordering values of the last (or first) row of
+# the current page, so the next page is a plain range predicate on an
+# indexed ordering instead of an OFFSET scan.
+# Views declare the ordering with `cursor_ordering`, e.g.
+#     cursor_ordering = ("-created_at", "id")
+# The fields must be non-null and the last one unique, so the ordering
+# is total.
+
+class KeysetPagination(BasePagination):
+    page_size = 50
+    max_page_size = 500
+    page_size_query_param = "page_size"
+    cursor_query_param = "cursor"
+    ordering = ("-created_at", "id")
+
+    invalid_cursor_message = "Invalid cursor"
+
+    # -----------------------------
+    # PUBLIC API
+    # -----------------------------
+    def paginate_queryset(self, queryset, request, view=None):
+        return self.paginate_querysets([queryset], request, view)
+
+    def paginate_querysets(self, querysets, request, view=None):
+        """
+        Paginate one queryset, or several `values()` querysets that are
+        merged with UNION ALL. Every part is filtered by the cursor
+        before the union, so each side can use its own index.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = tuple(getattr(view, "cursor_ordering", self.ordering))
+
+        reverse, position = self.decode_cursor(request)
+        if position is not None:
+            position = self.clean_position(querysets[0], position)
+        self.is_reverse = reverse
+
+        ordering = self._invert(self.ordering) if reverse else self.ordering
+
+        parts = []
+        for queryset in querysets:
+            if position is not None:
+                queryset = queryset.filter(self._after(ordering, position))
+            parts.append(queryset.order_by() if len(querysets) > 1 else queryset)
+
+        if len(parts) > 1:
+            queryset = parts[0].union(*parts[1:], all=True)
+        else:
+            queryset = parts[0]
+
+        rows = list(queryset.order_by(*ordering)[:self.page_size + 1])
+
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        self.first_position = self._position(rows[0]) if rows else None
+        self.last_position = self._position(rows[-1]) if rows else None
+
+        # An empty page reached through "previous" still links forward
+        if not rows and position is not None:
+            self.first_position = self.last_position = position
+
+        return rows
+
+    def get_paginated_response(self, data, message="Data fetched successfully"):
+        return Response({
+            "success": True,
+            "message": message,
+            "data": data,
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+        })
+
+    def get_next_link(self):
+        if not self.has_next or self.last_position is None:
+            return None
+        return self._link(False, self.last_position)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_position is None:
+            return None
+        return self._link(True, self.first_position)
+
+    def get_page_size(self, request):
+        value = request.query_params.get(self.page_size_query_param)
+        if value:
+            try:
+                size = int(value)
+            except (TypeError, ValueError):
+                size = 0
+            if size > 0:
+                return min(size, self.max_page_size)
+        return self.page_size
+
+    # -----------------------------
+    # CURSOR ENCODING
+    # -----------------------------
+    def encode_cursor(self, reverse, position):
+        payload = json.dumps({"r": int(reverse), "p": position}, separators=(",", ":"))
+        return urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return False, None
+
+        try:
+            padded = encoded + "=" * (-len(encoded) % 4)
+            payload = json.loads(urlsafe_b64decode(padded.encode()).decode())
+            reverse = bool(payload["r"])
+            position = list(payload["p"])
+        except (TypeError, ValueError, KeyError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+
+        return reverse, position
+
+    def clean_position(self, queryset, position):
+        """
+        Convert cursor values with the ordering fields (or annotations)
+        of `queryset`, so a tampered value is a 404 and not an error
+        from the filter.
+        """
+        cleaned = []
+        for field, value in zip(self.ordering, position):
+            try:
+                model_field = self._ordering_field(queryset, field.lstrip("-"))
+                if model_field is not None:
+                    value = model_field.to_python(value)
+            except (FieldDoesNotExist, ValidationError, TypeError, ValueError):
+                raise NotFound(self.invalid_cursor_message)
+
+            # Ordering fields are non-null
+            if value is None:
+                raise NotFound(self.invalid_cursor_message)
+            cleaned.append(value)
+        return cleaned
+
+    # -----------------------------
+    # HELPERS
+    # -----------------------------
+    @staticmethod
+    def _ordering_field(queryset, name):
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+
+        opts, field = queryset.model._meta, None
+        for part in name.split("__"):
+            field = opts.get_field(part)
+            if field.is_relation:
+                opts = field.related_model._meta
+        return field
+
+    def _link(self, reverse, position):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.cursor_query_param)
+        return replace_query_param(
+            url,
+            self.cursor_query_param,
+            self.encode_cursor(reverse, position)
+        )
+
+    @staticmethod
+    def _invert(ordering):
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in ordering
+        )
+
+    @staticmethod
+    def _after(ordering, position):
+        """
+        Build the row-value comparison `(a, b) > (x, y)` for a mixed
+        ascending/descending ordering:
+            a > x OR (a = x AND b > y)
+        """
+        condition = Q()
+        equal = {}
+
+        for field, value in zip(ordering, position):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= Q(**equal, **{f"{name}__{lookup}": value})
+            equal[name] = value
+
+        return condition
+
+    def _position(self, row):
+        values = []
+        for field in self.ordering:
+            name = field.lstrip("-")
+            if isinstance(row, dict):
+                value = row[name]
+            else:
+                value = row
+                for attr in name.split("__"):
+                    value = getattr(value, attr)
+            values.append(self._serialize(value))
+        return values
+
+    @staticmethod
+    def _serialize(value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
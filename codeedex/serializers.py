@@ -0,0 +1,91 @@
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+# =====================================================
+# SPARSE FIELDSETS  (?fields= / ?expand=)
+# =====================================================
+# GET requests can trim a serializer's payload:
+#
+#   ?fields=id,project_id,project_name   → only these fields
+#   ?expand=team_members                 → embed only these heavy fields
+#   ?expand=                             → embed none of them
+#
+# "Heavy" fields (nested serializers, absolute media URLs, computed
+# lists) are listed in Meta.expandable_fields. Without either param the
+# full payload is returned as before.
+#
+# Meta.select_related_for / Meta.prefetch_related_for map a field to the
+# relations it reads, so views only join / prefetch what is rendered
+# (see `setup_queryset`). A prefetch entry may be a callable returning
+# the lookups, to build fresh Prefetch(queryset=...) objects per
+# request. Only the top-level serializer reacts to the params; nested
+# ones always render in full.
+
+def _param(request, name):
+    if name not in request.query_params:
+        return None
+    value = request.query_params.get(name, "")
+    return {part.strip() for part in value.split(",") if part.strip()}
+
+
+def requested_fields(request):
+    """(fields, expand) sets from the query string, None when not given."""
+    if request is None or request.method not in SAFE_METHODS:
+        return None, None
+    return _param(request, "fields"), _param(request, "expand")
+
+
+class SparseFieldsMixin:
+
+    @classmethod
+    def renders(cls, request, name):
+        """Will field `name` be in the payload for this request?"""
+        fields, expand = requested_fields(request)
+        expandable = getattr(cls.Meta, "expandable_fields", ())
+
+        if name in expandable and expand is not None:
+            return name in expand or bool(fields and name in fields)
+        return fields is None or name in fields
+
+    @classmethod
+    def setup_queryset(cls, queryset, request):
+        """Add the select_related / prefetch_related the rendered fields need."""
+        meta = cls.Meta
+        selects, prefetches = [], []
+
+        for name, relations in getattr(meta, "select_related_for", {}).items():
+            if cls.renders(request, name):
+                selects += [relations] if isinstance(relations, str) else list(relations)
+
+        for name, lookups in getattr(meta, "prefetch_related_for", {}).items():
+            if cls.renders(request, name):
+                if callable(lookups):
+                    lookups = lookups()
+                prefetches += [lookups] if isinstance(lookups, (str, Prefetch)) else list(lookups)
+
+        if selects:
+            queryset = queryset.select_related(*dict.fromkeys(selects))
+        if prefetches:
+            queryset = queryset.prefetch_related(*prefetches)
+        return queryset
+
+    def _is_root(self):
+        parent = getattr(self, "parent", None)
+        if isinstance(parent, serializers.ListSerializer):
+            parent = getattr(parent, "parent", None)
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+
+        request = self.context.get("request")
+        if request is None or not self._is_root():
+            return fields
+
+        return {
+            name: field
+            for name, field in fields.items()
+            if self.renders(request, name)
+        }
@@ -54,6 +54,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware', 
+    'codeedex.middleware.RequestProfilingMiddleware',  # off unless REQUEST_PROFILING samples
+    'codeedex.middleware.ReplicaRoutingMiddleware',    # off unless a replica is configured
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -86,13 +88,92 @@ WSGI_APPLICATION = 'codeedex.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# DB_ENGINE=sqlite (default) | postgres
+#
+# sqlite: DB_NAME (file), DB_SQLITE_PROFILE
+#   default → stock SQLite settings
+#   tuned   → WAL (readers don't block the writer), synchronous=NORMAL,
+#             busy_timeout, mmap reads, and BEGIN IMMEDIATE so concurrent
+#             writers queue on busy_timeout instead of failing with
+#             "database is locked" when upgrading a read lock.
+#             Single-node installs; WAL is persisted in the db file.
+#
+# postgres: DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT (needs psycopg)
+#   DB_POOL=1 → psycopg_pool connection pool per process (psycopg[pool]),
+#   DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE / DB_POOL_TIMEOUT
+#   otherwise persistent connections (DB_CONN_MAX_AGE seconds)
+
+SQLITE_PROFILES = {
+    'default': {},
+    'tuned': {
+        'init_command': (
+            'PRAGMA journal_mode=WAL;'
+            'PRAGMA synchronous=NORMAL;'
+            'PRAGMA busy_timeout=5000;'
+            'PRAGMA mmap_size=134217728;'
+        ),
+        'transaction_mode': 'IMMEDIATE',
+    },
+}
+
+DB_ENGINE = os.environ.get("DB_ENGINE", "sqlite")
+
+if DB_ENGINE == "postgres":
+    DB_POOL = os.environ.get("DB_POOL", "0") == "1"
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get("DB_NAME", "codeedex"),
+            'USER': os.environ.get("DB_USER", "codeedex"),
+            'PASSWORD': os.environ.get("DB_PASSWORD", ""),
+            'HOST': os.environ.get("DB_HOST", "localhost"),
+            'PORT': os.environ.get("DB_PORT", "5432"),
+            # The pool keeps connections itself → no persistent ones on top
+            'CONN_MAX_AGE': 0 if DB_POOL else int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'pool': {
+                    'min_size': int(os.environ.get("DB_POOL_MIN_SIZE", 2)),
+                    'max_size': int(os.environ.get("DB_POOL_MAX_SIZE", 10)),
+                    'timeout': int(os.environ.get("DB_POOL_TIMEOUT", 10)),
+                },
+            } if DB_POOL else {},
+        }
     }
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get("DB_NAME", str(BASE_DIR / 'db.sqlite3')),
+            'CONN_MAX_AGE': int(os.environ.get("DB_CONN_MAX_AGE", 0)),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': dict(SQLITE_PROFILES[os.environ.get("DB_SQLITE_PROFILE", "default")]),
+        }
+    }
+
+# Read replica (codeedex.db_routers): views tagged `replica_reads` read
+# from it. sqlite: DB_REPLICA_NAME (a second file, refreshed with
+# `manage.py sync_sqlite_replica`); postgres: DB_REPLICA_HOST / _PORT.
+
+DB_REPLICA = {
+    'ALIAS': 'replica',
+    'COOKIE': 'db_primary',  # set after a write → reads stay on the primary
+    'STICKY_SECONDS': int(os.environ.get("DB_REPLICA_STICKY_SECONDS", 5)),  # > replica lag
 }
 
+if os.environ.get("DB_REPLICA_HOST" if DB_ENGINE == "postgres" else "DB_REPLICA_NAME"):
+    replica = dict(DATABASES['default'])
+    if DB_ENGINE == "postgres":
+        replica['HOST'] = os.environ["DB_REPLICA_HOST"]
+        replica['PORT'] = os.environ.get("DB_REPLICA_PORT", replica['PORT'])
+    else:
+        replica['NAME'] = os.environ["DB_REPLICA_NAME"]
+    # Tests: the replica is the test primary
+    replica['TEST'] = {'MIRROR': 'default'}
+    DATABASES[DB_REPLICA['ALIAS']] = replica
+
+DATABASE_ROUTERS = ['codeedex.db_routers.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -174,7 +255,134 @@ AUTHENTICATION_BACKENDS = [
 JWT_SECRET = "mysecret123"
 JWT_ALGORITHM = "HS256"
 
+# APK bearer tokens (apk.authentication)
+APK_AUTH = {
+    'LEEWAY': 30,                    # seconds of clock skew tolerated on exp / iat
+    'CLAIMS_CACHE_SIZE': 10000,      # verified tokens kept per worker process
+}
+# Accept the body-supplied employee code when no token is sent (old app builds)
+APK_ALLOW_LEGACY_EMPLOYEE_CODE = os.environ.get("APK_ALLOW_LEGACY_EMPLOYEE_CODE", "true").lower() == "true"
+# Max events accepted by one /apk/sync/ call
+APK_SYNC_MAX_EVENTS = 500
+# Seconds a synced event may be ahead of the server clock (then read as now)
+APK_SYNC_CLOCK_SKEW = int(os.environ.get("APK_SYNC_CLOCK_SKEW", 5 * 60))
+
+
+# Password hashing (employees.hashing)
+# Login/password hashing runs in a bounded process pool.
+# WORKERS = 0 → hash inline in the request thread.
+
+PASSWORD_HASHING = {
+    'WORKERS': int(os.environ.get("PASSWORD_HASHING_WORKERS", os.cpu_count() or 1)),
+    'MAX_PENDING': int(os.environ.get("PASSWORD_HASHING_MAX_PENDING", 64)),  # queued + running
+    'QUEUE_TIMEOUT': 2,  # seconds to wait for a free slot before answering 503
+    'TIMEOUT': 15,       # seconds per hash
+    'RETRY_AFTER': 5,    # Retry-After (seconds) of the 503
+    'START_METHOD': 'spawn',
+}
+
 
+# Cache
+# locmem (default, per process) | file | db (shared across processes)
+# `db` needs: python manage.py createcachetable
 
+CACHE_BACKEND = os.environ.get("CACHE_BACKEND", "locmem")
 
+if CACHE_BACKEND == "file":
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get("CACHE_LOCATION", str(BASE_DIR / 'cache')),
+        }
+    }
+elif CACHE_BACKEND == "db":
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': os.environ.get("CACHE_LOCATION", 'django_cache'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'codeedex',
+        }
+    }
+
+# Dashboard response cache (seconds)
+DASHBOARD_CACHE = {
+    'TIMEOUT': int(os.environ.get("DASHBOARD_CACHE_TIMEOUT", 60)),  # fresh
+    'STALE_TIMEOUT': 600,  # stale copy served while another request recomputes
+    'LOCK_TIMEOUT': 10,    # max time one request may hold the recompute lock
+}
+
+# Employee code / email → ref lookups used by the APK endpoints
+EMPLOYEE_REF_CACHE = {
+    'SIZE': 10000,                 # entries per worker process
+    'LOCAL_TIMEOUT': 60,           # max lag behind writes made in another process
+    'TIMEOUT': 60 * 60,            # shared cache entries
+    'SHARED': os.environ.get("EMPLOYEE_REF_CACHE_SHARED", "false").lower() == "true",
+}
+
+# Project change feed (project.changes)
+PROJECT_CHANGE_FEED = {
+    'PAGE_SIZE': 200,       # rows per kind per call
+    'SETTLE_SECONDS': 2,    # rows newer than this wait for the next poll (in-flight commits)
+    'TOMBSTONE_DAYS': 30,   # older sync tokens must do a full reload
+}
+
+# APK presence state per employee (apk.presence); rebuilt from the DB on a miss.
+# Needs a cache shared by every worker → off on locmem (state read from the DB).
+APK_PRESENCE_CACHE = CACHE_BACKEND != "locmem"
+APK_PRESENCE_TIMEOUT = int(os.environ.get("APK_PRESENCE_TIMEOUT", 60 * 60 * 24))  # seconds
+
+# Timesheet / payroll report (attendance.reports)
+TIMESHEET_REPORT = {
+    'CACHE_TIMEOUT': None,  # closed periods; writes to them bump a version instead
+    'MAX_DAYS': 366,        # longest period per report
+}
+
+
+# Request profiling (codeedex.middleware)
+# SAMPLE_RATE = share of requests profiled; 0 → middleware not loaded.
+# Slow / duplicate-heavy requests are logged to PERF_LOG_FILE (JSONL),
+# per-route percentiles are served at /dashboard/perf/ (admin users).
+
+REQUEST_PROFILING = {
+    'SAMPLE_RATE': float(os.environ.get("REQUEST_PROFILING_SAMPLE_RATE", 0)),
+    'SLOW_MS': int(os.environ.get("REQUEST_PROFILING_SLOW_MS", 500)),  # whole request
+    'SLOW_SQL_MS': 100,   # single statement, captured with its SQL
+    'DUPLICATE_SQL': 10,  # repeated statements (N+1) before a request is logged
+    'WINDOW': 1000,       # samples kept per route
+}
+
+PERF_LOG_FILE = os.environ.get("PERF_LOG_FILE", str(BASE_DIR / 'logs' / 'perf.jsonl'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'formatters': {
+        'message': {'format': '%(message)s'},
+    },
+    'handlers': {
+        'perf_file': {
+            'class': 'logging.handlers.RotatingFileHandler',
+            'filename': PERF_LOG_FILE,
+            'maxBytes': 10 * 1024 * 1024,
+            'backupCount': 5,
+            'delay': True,  # file opened on the first slow request
+            'formatter': 'message',
+        },
+    },
+    'loggers': {
+        'codeedex.perf': {
+            'handlers': ['perf_file'],
+            'level': 'WARNING',
+            'propagate': False,
+        },
+    },
+}
 
+if REQUEST_PROFILING['SAMPLE_RATE']:
+    os.makedirs(os.path.dirname(PERF_LOG_FILE), exist_ok=True)
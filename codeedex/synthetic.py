@@ -0,0 +1,170 @@
+import random
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.utils import timezone
+
+from apk.models import Attendance, Leave, LoginHistory
+from dashboard import rollups
+from employees.models import Employee
+from project.counters import rebuild_counters
+from project.models import PhaseTask, Project, ProjectPhase
+
+
+# =====================================================
+# SYNTHETIC ORGANISATION
+# =====================================================
+# Seeds a realistic org for budget tests and load tests: managers,
+# staff, interns, projects with phases and tasks, and `months` of
+# weekday attendance for everyone. Rows are bulk-inserted, so the
+# derived data signals would maintain (task counters) is rebuilt here.
+#
+# Sizes per `scale` unit: 2 managers, 16 staff, 6 interns, 5 projects.
+# Calling it again adds another org of that size to the same tables
+# (numbering continues), e.g. to check a query count does not grow.
+
+PASSWORD = "123456"
+DEPARTMENTS = ("python", "mern", "uiux", "flutter", "devops")
+PHASE_TYPES = [code for code, _ in ProjectPhase.PHASE_CHOICES]
+
+
+def _people(employment_type, count, **fields):
+    ids = Employee.generate_ids(employment_type, count)
+    start = Employee.objects.filter(employment_type=employment_type).count()
+    return [
+        Employee(
+            employee_id=employee_id,
+            name=f"{employment_type.title()} {start + n}",
+            email=f"{employment_type}{start + n}@gmail.com",
+            phone=f"9{start + n:09d}",
+            department=DEPARTMENTS[n % len(DEPARTMENTS)],
+            address="Synthetic street",
+            joining_date=timezone.localdate() - timedelta(days=400),
+            employment_type=employment_type,
+            **fields,
+        )
+        for n, employee_id in enumerate(ids)
+    ]
+
+
+@transaction.atomic
+def seed_org(scale=1, months=2, seed=0):
+    """Create the org; returns a dict of sample keys for URL parameters."""
+    rng = random.Random(seed)
+    password = make_password(PASSWORD)
+    today = timezone.localdate()
+
+    # -----------------------------
+    # PEOPLE
+    # -----------------------------
+    staff_fields = {
+        "salary": Decimal("50000.00"),
+        "salary_type": "monthly",
+        "payment_method": "bank",
+        "password": password,
+    }
+
+    managers = Employee.objects.bulk_create(
+        _people("staff", 2 * scale, position="manager", is_manager=True, **staff_fields)
+    )
+    staff = _people("staff", 16 * scale, position="junior", **staff_fields)
+    for n, employee in enumerate(staff):
+        employee.reporting_manager = managers[n % len(managers)]
+    staff = Employee.objects.bulk_create(staff)
+    interns = Employee.objects.bulk_create(
+        _people("intern", 6 * scale, password=password)
+    )
+    everyone = managers + staff + interns
+
+    # -----------------------------
+    # PROJECTS / PHASES / TASKS
+    # -----------------------------
+    projects = []
+    for n in range(5 * scale):
+        project = Project.objects.create(
+            project_name=f"Synthetic project {n}",
+            project_type=Project.TYPE_CHOICES[n % len(Project.TYPE_CHOICES)][0],
+            status=("pending", "in_progress", "completed")[n % 3],
+            priority=("low", "medium", "high")[n % 3],
+            project_manager=managers[n % len(managers)],
+            start_date=today - timedelta(days=90),
+            end_date=today + timedelta(days=90),
+            total_budget=Decimal("100000.00"),
+        )
+        projects.append(project)
+
+    Project.team_members.through.objects.bulk_create([
+        Project.team_members.through(project=project, employee=member)
+        for project in projects
+        for member in rng.sample(staff + interns, min(6, len(staff + interns)))
+    ])
+
+    phases = ProjectPhase.objects.bulk_create([
+        ProjectPhase(
+            project=project,
+            phase_type=phase_type,
+            phase_id=f"{project.project_id}-{ProjectPhase.PHASE_CODES[phase_type]}",
+        )
+        for project in projects
+        for phase_type in PHASE_TYPES[:rng.randint(2, len(PHASE_TYPES))]
+    ])
+
+    tasks = PhaseTask.objects.bulk_create([
+        PhaseTask(
+            phase=phase,
+            project=phase.project,
+            task_id=f"SYN-{phase.pk:04d}-{n}",
+            title=f"Task {n} of {phase.phase_id}",
+            status=rng.choice(("pending", "in_progress", "completed")),
+        )
+        for phase in phases
+        for n in range(4)
+    ])
+    PhaseTask.assigned_to.through.objects.bulk_create([
+        PhaseTask.assigned_to.through(phasetask=task, employee=rng.choice(staff))
+        for task in tasks
+    ])
+    rebuild_counters()
+
+    # -----------------------------
+    # ATTENDANCE / LEAVE / LOGINS
+    # -----------------------------
+    days = [
+        today - timedelta(days=offset)
+        for offset in range(1, months * 30 + 1)
+        if (today - timedelta(days=offset)).weekday() < 5
+    ]
+
+    sessions, leaves = [], []
+    for employee in everyone:
+        for day in days:
+            if rng.random() < 0.05:
+                leaves.append(Leave(employee=employee, leave_date=day, reason="Synthetic leave"))
+                continue
+
+            check_in = timezone.make_aware(datetime.combine(day, time(9, rng.randint(0, 59))))
+            session = Attendance(
+                employee=employee,
+                date=day,
+                check_in=check_in,
+                check_out=check_in + timedelta(hours=rng.randint(7, 10)),
+            )
+            session.calculate_hours()
+            sessions.append(session)
+
+    Attendance.objects.bulk_create(sessions, batch_size=2000)
+    Leave.objects.bulk_create(leaves, batch_size=2000)
+    LoginHistory.objects.bulk_create([LoginHistory(employee=employee) for employee in everyone])
+    rollups.rebuild()
+
+    return {
+        "manager": managers[0],
+        "staff": staff[0],
+        "intern": interns[0],
+        "project": projects[0],
+        "phase": phases[0],
+        "task": tasks[0],
+        "password": PASSWORD,
+    }
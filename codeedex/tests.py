@@ -0,0 +1,678 @@
+import json
+import os
+import time
+from datetime import timedelta
+from urllib.parse import parse_qs, urlparse
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, resolve
+from django.utils import timezone
+from rest_framework.exceptions import NotFound
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apk.models import Leave
+from apk.utils import create_employee_token
+from codeedex import db_routers
+from codeedex.middleware import ReplicaRoutingMiddleware
+from codeedex.pagination import KeysetPagination
+from codeedex.synthetic import seed_org
+from dashboard import cache as dashboard_cache
+from dashboard.cache import cached_dashboard
+from employees import refs
+
+
+# =====================================================
+# API BUDGETS (query count / latency / response size)
+# =====================================================
+# Every route in codeedex/urls.py is called against a synthetic org
+# (codeedex.synthetic) and must stay within its budget:
+#
+#   queries → fixed; measured again after a second org of the same
+#             size is added, and must not grow (an N+1 under the
+#             budget at one size still fails); set to the measured
+#             count, +1 on routes of 5 queries or more
+#   ms      → p95 latency at scale 1 (scaled by PERF_SCALE and
+#             PERF_LATENCY_FACTOR, for slow CI machines); wall-clock,
+#             so only checked with PERF_BUDGETS=1
+#   kb      → response size at scale 1 (scaled by PERF_SCALE), set
+#             close to the measured size so growth shows up
+#
+# Each call runs in a rolled-back savepoint with an empty cache, so
+# writes do not leak into the next call and reads take the cold path.
+#
+# Environment:
+#   PERF_BUDGETS=1         also assert the latency budgets
+#   PERF_SCALE=1           org size (see codeedex.synthetic)
+#   PERF_MONTHS=2          months of attendance
+#   PERF_REPEAT=5          calls per route for the latency percentiles
+#                          (default 1 without PERF_BUDGETS)
+#   PERF_LATENCY_FACTOR=1  multiplier on the ms budgets
+#   PERF_REPORT=path.json  write every measurement to this file
+
+CHECK_LATENCY = os.environ.get("PERF_BUDGETS") == "1"
+SCALE = int(os.environ.get("PERF_SCALE", 1))
+MONTHS = int(os.environ.get("PERF_MONTHS", 2))
+REPEAT = max(int(os.environ.get("PERF_REPEAT", 5 if CHECK_LATENCY else 1)), 1)
+LATENCY_FACTOR = float(os.environ.get("PERF_LATENCY_FACTOR", 1))
+REPORT = os.environ.get("PERF_REPORT")
+
+
+def _today(offset=0):
+    return str(timezone.localdate() + timedelta(days=offset))
+
+
+# route → request and budget. `data` receives the seeded sample keys.
+BUDGETS = {
+    # -----------------------------
+    # myapp1 (admin users)
+    # -----------------------------
+    "myapp1/register/": {
+        "method": "post",
+        "data": lambda s: {
+            "username": "perf-new",
+            "email": "perf.new@gmail.com",
+            "password": "Perf@12345",
+        },
+        "queries": 3, "ms": 100, "kb": 1,
+    },
+    "myapp1/login/": {
+        "method": "post",
+        "data": lambda s: {"email": s["admin"].email, "password": "Perf@12345"},
+        "queries": 1, "ms": 100, "kb": 1,
+    },
+    "myapp1/register-list/": {"queries": 1, "ms": 100, "kb": 1},
+    "myapp1/token/refresh/": {
+        "method": "post",
+        "data": lambda s: {"refresh": s["refresh"]},
+        "queries": 1, "ms": 100, "kb": 1,
+    },
+
+    # -----------------------------
+    # employees
+    # -----------------------------
+    "employee/emp/": {
+        "method": "post",
+        "format": "multipart",
+        "data": lambda s: {
+            "name": "Perf Intern",
+            "email": "perf.intern@gmail.com",
+            "phone": "9876543210",
+            "department": "python",
+            "employment_type": "intern",
+            "joining_date": _today(),
+            "address": "Synthetic street",
+            "password": "123456",
+        },
+        "queries": 4, "ms": 100, "kb": 1,
+    },
+    "employee/emp/bulk-import/": {
+        "method": "post",
+        "data": lambda s: {"employees": [{
+            "name": f"Perf Import {n}",
+            "email": f"perf.import{n}@gmail.com",
+            "phone": "9876543210",
+            "department": "python",
+            "employment_type": "intern",
+            "joining_date": _today(),
+            "address": "Synthetic street",
+            "password": "123456",
+        } for n in range(20)]},
+        "queries": 7, "ms": 250, "kb": 2,
+    },
+    "employee/emp-edit/<str:employee_id>/": {
+        "method": "patch",
+        "format": "multipart",
+        "kwargs": lambda s: {"employee_id": s["intern"].employee_id},
+        "data": lambda s: {"role": "Developer"},
+        "queries": 2, "ms": 100, "kb": 1,
+    },
+    "employee/emp-delete/<str:employee_id>/": {
+        "method": "delete",
+        "kwargs": lambda s: {"employee_id": s["intern"].employee_id},
+        # + one rollup rebuild of the deleted sessions' days
+        "queries": 22, "ms": 150, "kb": 1,
+    },
+    "employee/employees-interns/all/": {"queries": 1, "ms": 200, "kb": 20},
+    "employee/emp-list/": {"queries": 1, "ms": 100, "kb": 14},
+    "employee/interns-list/": {"queries": 1, "ms": 100, "kb": 5},
+    "employee/employee/full/<str:employee_id>/": {
+        "kwargs": lambda s: {"employee_id": s["staff"].employee_id},
+        "queries": 8, "ms": 100, "kb": 1,
+    },
+    "employee/employees/managers/": {"queries": 1, "ms": 100, "kb": 1},
+
+    # -----------------------------
+    # attendance
+    # -----------------------------
+    "attendance/admin-attendance/": {"queries": 1, "ms": 600, "kb": 14},
+    "attendance/timesheet-report/": {
+        "auth": "admin",
+        "data": lambda s: {"period": _today()[:7]},  # open period → computed
+        "queries": 2, "ms": 100, "kb": 5,
+    },
+
+    # -----------------------------
+    # project
+    # -----------------------------
+    "project/projects/create/": {
+        "method": "post",
+        "data": lambda s: {
+            "project_name": "Perf project",
+            "project_type": "web",
+            "project_manager_id": s["manager"].employee_id,
+            "team_member_ids": [s["staff"].employee_id],
+            "total_budget": "1000.00",
+        },
+        "queries": 10, "ms": 100, "kb": 1,
+    },
+    "project/projects/list/": {"queries": 2, "ms": 100, "kb": 7},
+    "project/projects/edit/<str:project_id>/": {
+        "method": "patch",
+        "kwargs": lambda s: {"project_id": s["project"].project_id},
+        "data": lambda s: {"priority": "high"},
+        "queries": 4, "ms": 100, "kb": 2,
+    },
+    # Tombstone + counter signals run per task / phase: grows with the
+    # deleted project's own tree, not with the org
+    "project/projects/delete/<str:project_id>/": {
+        "method": "delete",
+        "kwargs": lambda s: {"project_id": s["project"].project_id},
+        "queries": 77, "ms": 200, "kb": 1,
+    },
+    "project/projects/full/<str:project_id>/": {
+        "kwargs": lambda s: {"project_id": s["project"].project_id},
+        "queries": 6, "ms": 100, "kb": 8,
+    },
+    "project/projects/filter/type/<str:ptype>/": {
+        "kwargs": lambda s: {"ptype": s["project"].project_type},
+        "queries": 2, "ms": 100, "kb": 2,
+    },
+    "project/phases/create/": {
+        "method": "post",
+        "data": lambda s: {
+            "project_id": s["project"].project_id,
+            "phase_type": "deployment",
+            "employee_ids": [s["phase_member"].employee_id],
+        },
+        "queries": 20, "ms": 100, "kb": 2,
+    },
+    "project/phases/list/": {"queries": 4, "ms": 200, "kb": 22},
+    "project/projects/phases/<str:project_id>/": {
+        "kwargs": lambda s: {"project_id": s["project"].project_id},
+        "queries": 5, "ms": 100, "kb": 8,
+    },
+    "project/tasks/create/": {
+        "method": "post",
+        "data": lambda s: {
+            "phase_id": s["phase"].phase_id,
+            "title": "Perf task",
+            "employee_ids": [s["phase_member"].employee_id],
+        },
+        "queries": 20, "ms": 100, "kb": 1,
+    },
+    "project/tasks/list/": {"queries": 2, "ms": 100, "kb": 16},
+    "project/tasks/edit/<str:task_id>/": {
+        "method": "patch",
+        "kwargs": lambda s: {"task_id": s["task"].task_id},
+        "data": lambda s: {"phase_id": s["task"].phase.phase_id, "status": "completed"},
+        "queries": 9, "ms": 100, "kb": 1,
+    },
+    "project/tasks/delete/<str:task_id>/": {
+        "method": "delete",
+        "kwargs": lambda s: {"task_id": s["task"].task_id},
+        "queries": 10, "ms": 100, "kb": 1,
+    },
+    "project/projects/phases/<str:phase_id>/tasks/": {
+        "kwargs": lambda s: {"phase_id": s["phase"].phase_id},
+        "queries": 3, "ms": 100, "kb": 2,
+    },
+    "project/changes/": {"queries": 6, "ms": 300, "kb": 1},
+
+    # -----------------------------
+    # apk (employee app)
+    # -----------------------------
+    "apk/login/": {
+        "method": "post",
+        "auth": False,
+        "data": lambda s: {"email": s["staff"].email, "password": s["password"]},
+        "queries": 3, "ms": 100, "kb": 1,
+    },
+    "apk/apk/login-list/": {"queries": 1, "ms": 100, "kb": 4},
+    "apk/logout/": {"method": "post", "queries": 2, "ms": 100, "kb": 1},
+    # + attendance rollups; the day's first check-in of a group creates its row
+    "apk/check/": {"method": "post", "queries": 10, "ms": 100, "kb": 1},
+    "apk/apply-leave/": {
+        "method": "post",
+        "data": lambda s: {"leave_date": _today(7), "reason": "Perf leave"},
+        "queries": 2, "ms": 100, "kb": 1,
+    },
+    "apk/leave-list/": {"queries": 1, "ms": 100, "kb": 7},
+    "apk/home-status/": {"method": "post", "queries": 2, "ms": 100, "kb": 1},
+    "apk/attendance-list/": {"queries": 1, "ms": 600, "kb": 280},
+    "apk/sync/": {
+        "method": "post",
+        "data": lambda s: {"events": [
+            {"key": "perf-in", "type": "check_in", "timestamp": s["now"] - timedelta(hours=2)},
+            {"key": "perf-out", "type": "check_out", "timestamp": s["now"] - timedelta(hours=1)},
+            {"key": "perf-leave", "type": "leave", "timestamp": s["now"],
+             "leave_date": _today(8), "reason": "Perf leave"},
+        ]},
+        "queries": 16, "ms": 100, "kb": 1,
+    },
+
+    # -----------------------------
+    # dashboard
+    # -----------------------------
+    "dashboard/summary/": {"queries": 4, "ms": 100, "kb": 1},
+    "dashboard/ongoing-projects/": {"queries": 2, "ms": 100, "kb": 1},
+    "dashboard/performance-graph/": {"queries": 1, "ms": 100, "kb": 1},
+    "dashboard/project-status/": {"queries": 1, "ms": 100, "kb": 1},
+    "dashboard/perf/": {"auth": "admin", "queries": 1, "ms": 100, "kb": 1},
+}
+
+# Routes that cannot be exercised as wired, with the reason
+SKIP = {
+    "project/phases/edit/<str:project_id>/": (
+        "always 404: the URL captures project_id, but ProjectPhaseViewSet "
+        "(lookup_field = phase_id) reads the phase_id kwarg"
+    ),
+    "project/phases/delete/<str:project_id>/": (
+        "always 404: the URL captures project_id, but ProjectPhaseViewSet "
+        "(lookup_field = phase_id) reads the phase_id kwarg"
+    ),
+}
+
+
+def discover_routes(patterns=None, prefix=""):
+    """Every API route pattern as a string ('project/tasks/edit/<str:task_id>/')."""
+    if patterns is None:
+        patterns = get_resolver().url_patterns
+
+    routes = []
+    for entry in patterns:
+        route = prefix + str(entry.pattern)
+        if route.startswith("admin/"):
+            continue
+        if isinstance(entry, URLResolver):
+            routes += discover_routes(entry.url_patterns, route)
+        elif isinstance(entry, URLPattern):
+            routes.append(route)
+    return routes
+
+
+def build_path(route, kwargs):
+    path = route
+    for name, value in kwargs.items():
+        for converter in ("str", "int", "slug"):
+            path = path.replace(f"<{converter}:{name}>", str(value))
+    return "/" + path
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    # Spawned hashing workers would not see the overridden hashers
+    PASSWORD_HASHING={**settings.PASSWORD_HASHING, "WORKERS": 0},
+    # One process → locmem is shared; budgets are for the cached setup
+    APK_PRESENCE_CACHE=True,
+    ALLOWED_HOSTS=["*"],
+)
+class ApiBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sample = seed_org(scale=SCALE, months=MONTHS)
+
+        admin = User.objects.create_user(
+            "perf-admin", "perf.admin@gmail.com", "Perf@12345", is_staff=True
+        )
+        phase = cls.sample["phase"]
+        cls.sample.update(
+            admin=admin,
+            refresh=str(RefreshToken.for_user(admin)),
+            phase_member=phase.project.team_members.first(),
+            now=timezone.now(),
+        )
+
+    def setUp(self):
+        # Process-wide refs may hold employees of another test's database
+        refs.clear()
+        self.client = APIClient()
+        self.token = create_employee_token(self.sample["staff"])
+        self.admin_token = str(RefreshToken.for_user(self.sample["admin"]).access_token)
+
+    def call(self, route, spec):
+        kwargs = spec.get("kwargs", lambda s: {})(self.sample)
+        data = spec.get("data", lambda s: {})(self.sample)
+        method = spec.get("method", "get")
+
+        headers = {}
+        auth = spec.get("auth", route.startswith("apk/"))
+        if auth == "admin":
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {self.admin_token}"
+        elif auth:
+            headers["HTTP_AUTHORIZATION"] = f"Bearer {self.token}"
+
+        options = {"format": spec.get("format", "json")} if method != "get" else {}
+        request = getattr(self.client, method)
+
+        with transaction.atomic():
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                started = time.perf_counter()
+                response = request(build_path(route, kwargs), data, **options, **headers)
+                body = (
+                    b"".join(response.streaming_content)
+                    if response.streaming else response.content
+                )
+                elapsed = (time.perf_counter() - started) * 1000
+            transaction.set_rollback(True)
+
+        return response.status_code, len(queries), elapsed, len(body)
+
+    def measure(self, route, spec):
+        runs = [self.call(route, spec) for _ in range(REPEAT)]
+        latencies = [elapsed for _, _, elapsed, _ in runs]
+        return {
+            "route": route,
+            "status": runs[0][0],
+            "queries": max(count for _, count, _, _ in runs),
+            "p50_ms": round(percentile(latencies, 50), 2),
+            "p95_ms": round(percentile(latencies, 95), 2),
+            "kb": round(max(size for _, _, _, size in runs) / 1024, 2),
+        }
+
+    def test_every_route_has_a_budget(self):
+        missing = [
+            route for route in discover_routes()
+            if route not in BUDGETS and route not in SKIP
+        ]
+        self.assertEqual(missing, [], "Add these routes to BUDGETS (or SKIP)")
+
+        stale = [route for route in BUDGETS if route not in discover_routes()]
+        self.assertEqual(stale, [], "Budgeted routes no longer in codeedex/urls.py")
+
+    def test_every_skip_has_a_reason(self):
+        for route, reason in SKIP.items():
+            with self.subTest(route=route):
+                self.assertIn(route, discover_routes())
+                self.assertTrue(reason.strip())
+
+    def test_routes_within_budget(self):
+        results = []
+        routes = [route for route in discover_routes() if route not in SKIP]
+
+        for route in routes:
+            spec = BUDGETS[route]
+            result = self.measure(route, spec)
+            result["budget"] = {
+                "queries": spec["queries"],
+                "p95_ms": spec["ms"] * SCALE * LATENCY_FACTOR,
+                "kb": spec["kb"] * SCALE,
+            }
+            results.append(result)
+
+            with self.subTest(route=route):
+                self.assertLess(result["status"], 400, "request failed")
+                self.assertLessEqual(result["queries"], result["budget"]["queries"])
+                if CHECK_LATENCY:
+                    self.assertLessEqual(result["p95_ms"], result["budget"]["p95_ms"])
+                self.assertLessEqual(result["kb"], result["budget"]["kb"])
+
+        # Second org of the same size → twice the rows, same query counts
+        seed_org(scale=SCALE, months=MONTHS, seed=1)
+        refs.clear()
+
+        for result in results:
+            route = result["route"]
+            status, queries, _, _ = self.call(route, BUDGETS[route])
+            result["queries_at_double_scale"] = queries
+
+            with self.subTest(route=route, scale=2 * SCALE):
+                self.assertLess(status, 400, "request failed")
+                self.assertLessEqual(queries, result["queries"], "query count grows with the org")
+
+        if REPORT:
+            with open(REPORT, "w") as fh:
+                json.dump(
+                    {"scale": SCALE, "months": MONTHS, "repeat": REPEAT, "routes": results},
+                    fh,
+                    indent=2,
+                    default=str,
+                )
+
+
+# =====================================================
+# REQUEST PROFILING MIDDLEWARE
+# =====================================================
+
+@override_settings(
+    REQUEST_PROFILING={
+        **settings.REQUEST_PROFILING,
+        "SAMPLE_RATE": 1,
+        "SLOW_MS": 10 ** 6,
+        "DUPLICATE_SQL": 3,
+    },
+    ALLOWED_HOSTS=["*"],
+)
+class RequestProfilingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user(
+            "perf-admin", "perf.admin@gmail.com", "Perf@12345", is_staff=True
+        )
+        cls.user = User.objects.create_user("perf-user", "perf.user@gmail.com", "Perf@12345")
+
+    def setUp(self):
+        from codeedex.middleware import metrics
+
+        metrics.clear()
+        self.client = APIClient()
+
+    def test_records_sql_and_serializer_time(self):
+        with self.assertNoLogs("codeedex.perf"):
+            self.client.get("/myapp1/register-list/")
+
+        self.client.force_authenticate(self.admin)
+        routes = self.client.get("/dashboard/perf/").json()["data"]["routes"]
+
+        entry = next(route for route in routes if route["route"] == "/myapp1/register-list/")
+        self.assertEqual(entry["samples"], 1)
+        self.assertEqual(entry["sql_count"]["max"], 1)
+        self.assertGreater(entry["serializer_ms"]["max"], 0)
+        self.assertGreater(entry["bytes"]["max"], 0)
+
+    def test_duplicate_heavy_request_is_logged(self):
+        from codeedex.synthetic import seed_org
+
+        # Tombstone and counter writes repeat per task of the project
+        project = seed_org()["project"]
+
+        with self.assertLogs("codeedex.perf", "WARNING") as logs:
+            self.client.delete(f"/project/projects/delete/{project.project_id}/")
+
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["route"], "/project/projects/delete/<str:project_id>/")
+        self.assertGreaterEqual(record["duplicate_sql"], 3)
+        self.assertGreater(record["most_repeated_sql"]["count"], 1)
+
+    def test_perf_report_is_admin_only(self):
+        self.assertIn(self.client.get("/dashboard/perf/").status_code, (401, 403))
+
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get("/dashboard/perf/").status_code, 403)
+
+
+# =====================================================
+# READ REPLICA ROUTING
+# =====================================================
+
+# Any configured alias stands in for the replica: the router only names it
+@override_settings(DB_REPLICA={**settings.DB_REPLICA, "ALIAS": "default"})
+class ReplicaRoutingTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = db_routers.ReplicaRouter()
+        self.factory = RequestFactory()
+        db_routers.start_request()
+
+    def tearDown(self):
+        db_routers.start_request()
+
+    def view(self, path):
+        return resolve(path).func
+
+    def test_tagged_views(self):
+        self.assertTrue(db_routers.wants_replica(self.view("/dashboard/summary/"), "GET"))
+        self.assertTrue(db_routers.wants_replica(self.view("/dashboard/summary/"), "HEAD"))
+        self.assertFalse(db_routers.wants_replica(self.view("/dashboard/summary/"), "POST"))
+
+        # ViewSets: only the listed actions
+        self.assertTrue(db_routers.wants_replica(self.view("/project/projects/list/"), "GET"))
+        self.assertFalse(db_routers.wants_replica(self.view("/project/tasks/edit/T-1/"), "GET"))
+
+        self.assertFalse(db_routers.wants_replica(self.view("/project/changes/"), "GET"))
+
+    def test_write_moves_the_request_to_the_primary(self):
+        db_routers.use_replica(True)
+        self.assertEqual(self.router.db_for_read(None), "default")
+
+        self.router.db_for_write(None)
+        self.assertIsNone(self.router.db_for_read(None))
+
+    def test_writer_gets_sticky_cookie(self):
+        def write(request):
+            self.router.db_for_write(None)
+            return HttpResponse()
+
+        response = ReplicaRoutingMiddleware(write)(self.factory.post("/"))
+        self.assertEqual(
+            response.cookies[settings.DB_REPLICA["COOKIE"]]["max-age"],
+            settings.DB_REPLICA["STICKY_SECONDS"],
+        )
+        self.assertFalse(db_routers.reading_replica())
+
+    def test_sticky_cookie_keeps_reads_on_primary(self):
+        middleware = ReplicaRoutingMiddleware(lambda request: HttpResponse())
+        view = self.view("/dashboard/summary/")
+
+        request = self.factory.get("/dashboard/summary/")
+        middleware.process_view(request, view, (), {})
+        self.assertTrue(db_routers.reading_replica())
+
+        db_routers.start_request()
+        request.COOKIES[settings.DB_REPLICA["COOKIE"]] = "1"
+        middleware.process_view(request, view, (), {})
+        self.assertFalse(db_routers.reading_replica())
+
+    def test_dashboard_fill_after_invalidation_reads_primary(self):
+        seen = []
+
+        class View:
+            @cached_dashboard("replica-test")
+            def get(self, request):
+                seen.append(db_routers.reading_replica())
+                return Response({"ok": True})
+
+        request = Request(self.factory.get("/dashboard/replica-test/"))
+        try:
+            cache.clear()
+            db_routers.use_replica(True)
+            View().get(request)  # nothing written lately → replica
+
+            dashboard_cache.invalidate()
+            View().get(request)  # within the replica lag → primary
+
+            self.assertEqual(seen, [True, False])
+            self.assertTrue(db_routers.reading_replica())
+        finally:
+            cache.clear()
+
+
+# =====================================================
+# KEYSET PAGINATION
+# =====================================================
+
+class KeysetPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        sample = seed_org(scale=1, months=1)
+        Leave.objects.all().delete()
+
+        # Three leaves on one day → the id breaks the tie
+        day = timezone.localdate()
+        for employee, offset in (
+            (sample["manager"], 0), (sample["staff"], 0), (sample["intern"], 0),
+            (sample["staff"], 1), (sample["staff"], 2),
+        ):
+            Leave.objects.create(employee=employee, leave_date=day + timedelta(days=offset), reason="Paged")
+
+    def paginate(self, view, **params):
+        request = Request(RequestFactory().get("/leaves/", params))
+        paginator = KeysetPagination()
+        rows = paginator.paginate_queryset(Leave.objects.all(), request, view=view)
+        return paginator, [row.pk for row in rows]
+
+    def cursor(self, link):
+        return parse_qs(urlparse(link).query)["cursor"][0]
+
+    def view(self):
+        return type("View", (), {"cursor_ordering": ("-leave_date", "id")})()
+
+    def test_pages_across_ties(self):
+        expected = list(Leave.objects.order_by("-leave_date", "id").values_list("pk", flat=True))
+
+        seen, params, pages = [], {"page_size": 2}, []
+        while True:
+            paginator, ids = self.paginate(self.view(), **params)
+            seen += ids
+            pages.append(ids)
+            link = paginator.get_next_link()
+            if link is None:
+                break
+            params = {"page_size": 2, "cursor": self.cursor(link)}
+
+        self.assertEqual(seen, expected)
+        self.assertEqual([len(ids) for ids in pages], [2, 2, 1])
+
+        # Last page → no next, and previous leads back to the page before
+        previous = paginator.get_previous_link()
+        _, ids = self.paginate(self.view(), page_size=2, cursor=self.cursor(previous))
+        self.assertEqual(ids, pages[1])
+
+    def test_invalid_cursors_are_404(self):
+        paginator = KeysetPagination()
+        cursors = [
+            "not base64 json",
+            paginator.encode_cursor(False, ["2024-01-01"]),          # wrong length
+            paginator.encode_cursor(False, ["not-a-date", 1]),
+            paginator.encode_cursor(False, ["2024-01-01", "x"]),
+            paginator.encode_cursor(False, [None, 1]),
+        ]
+
+        for cursor in cursors:
+            with self.subTest(cursor=cursor), self.assertRaises(NotFound):
+                self.paginate(self.view(), cursor=cursor)
+
+    def test_invalid_timeline_cursor_is_404(self):
+        client = APIClient()
+        cursor = KeysetPagination().encode_cursor(False, ["2024-01-01", "leave", 1])
+
+        response = client.get("/attendance/admin-attendance/", {"cursor": cursor})
+        self.assertEqual(response.status_code, 404)
@@ -0,0 +1,127 @@
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+from codeedex import db_routers
+
+
+# =====================================================
+# DASHBOARD RESPONSE CACHE
+# =====================================================
+# Responses are cached per endpoint + query params under a global
+# "generation". Model signals (dashboard.signals) bump the generation,
+# which makes every cached response unreachable at once; the TIMEOUT
+# setting is the fallback when a write bypasses signals.
+#
+# Stampede protection: only the request that wins the recompute lock
+# hits the database. Other requests get the last good (stale) copy, or
+# wait briefly for the winner when there is none.
+#
+# Read replica: the views are tagged `replica_reads`, but for
+# DB_REPLICA STICKY_SECONDS (the allowed replica lag) after an
+# invalidation the recompute reads the primary. Otherwise a lagging
+# replica would put pre-write data back in the cache for TIMEOUT.
+
+GENERATION_KEY = "dashboard:generation"
+INVALIDATED_AT_KEY = "dashboard:invalidated-at"
+WAIT_STEP = 0.05
+
+
+def _config():
+    return settings.DASHBOARD_CACHE
+
+
+def _generation():
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        # Never restart from a number an evicted counter may have used
+        cache.add(GENERATION_KEY, time.time_ns(), None)
+        generation = cache.get(GENERATION_KEY, 0)
+    return generation
+
+
+def invalidate():
+    """Drop every cached dashboard response."""
+    cache.set(INVALIDATED_AT_KEY, time.time(), settings.DB_REPLICA["STICKY_SECONDS"])
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.set(GENERATION_KEY, time.time_ns(), None)
+
+
+def _recompute(get, *args, **kwargs):
+    if cache.get(INVALIDATED_AT_KEY) is None:
+        return get(*args, **kwargs)
+
+    # Just written → the replica may not have it yet
+    with db_routers.primary_reads():
+        return get(*args, **kwargs)
+
+
+def invalidate_on_commit():
+    # Invalidate once the write is visible, so a concurrent request
+    # cannot re-cache the old data under the new generation
+    transaction.on_commit(invalidate)
+
+
+def _params_hash(request):
+    params = sorted(request.query_params.lists())
+    return hashlib.md5(repr(params).encode()).hexdigest()
+
+
+def cached_dashboard(endpoint):
+    """Cache the `get` handler of a dashboard APIView."""
+
+    def decorator(get):
+        @wraps(get)
+        def wrapper(self, request, *args, **kwargs):
+            config = _config()
+            params = _params_hash(request)
+            key = f"dashboard:{endpoint}:{_generation()}:{params}"
+            stale_key = f"dashboard:{endpoint}:stale:{params}"
+
+            entry = cache.get(key)
+            if entry is not None and entry["expires"] > time.time():
+                return Response(entry["data"])
+
+            lock_key = f"{key}:lock"
+            if cache.add(lock_key, 1, config["LOCK_TIMEOUT"]):
+                try:
+                    response = _recompute(get, self, request, *args, **kwargs)
+                    if response.status_code == 200:
+                        entry = {
+                            "data": response.data,
+                            "expires": time.time() + config["TIMEOUT"],
+                        }
+                        cache.set_many(
+                            {key: entry, stale_key: entry},
+                            config["STALE_TIMEOUT"]
+                        )
+                    return response
+                finally:
+                    cache.delete(lock_key)
+
+            # Someone else is recomputing → serve the last good copy
+            stale = entry or cache.get(stale_key)
+            if stale is not None:
+                return Response(stale["data"])
+
+            deadline = time.time() + config["LOCK_TIMEOUT"]
+            while time.time() < deadline:
+                time.sleep(WAIT_STEP)
+                entry = cache.get(key)
+                if entry is not None:
+                    return Response(entry["data"])
+                if cache.get(lock_key) is None:
+                    break
+
+            return _recompute(get, self, request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
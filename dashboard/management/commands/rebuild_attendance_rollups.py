@@ -0,0 +1,39 @@
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from apk.models import Attendance
+from dashboard import rollups
+from dashboard.models import AttendanceDailyRollup, AttendanceMonthlyRollup
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill / repair the attendance rollups (dashboard.rollups) from the "
+        "Attendance table. --since limits it to the months from that date on."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", type=date.fromisoformat, help="YYYY-MM-DD")
+
+    def handle(self, *args, **options):
+        since = options["since"]
+        days = None
+
+        if since:
+            # Whole months, so the monthly rows are rebuilt from complete data
+            start = since.replace(day=1)
+            end = max(
+                Attendance.objects.filter(date__gte=start).order_by("-date").values_list("date", flat=True).first()
+                or start,
+                AttendanceDailyRollup.objects.filter(date__gte=start).order_by("-date").values_list("date", flat=True).first()
+                or start,
+            )
+            days = [start + timedelta(days=n) for n in range((end - start).days + 1)]
+
+        rollups.rebuild(days)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {AttendanceDailyRollup.objects.count()} daily and "
+            f"{AttendanceMonthlyRollup.objects.count()} monthly rollup rows"
+        ))
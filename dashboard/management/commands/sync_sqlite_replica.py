@@ -0,0 +1,43 @@
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+
+class Command(BaseCommand):
+    help = (
+        "Local replica setup: copy the primary SQLite file into the replica "
+        "file (DB_REPLICA_NAME) with the online backup API. --every N keeps "
+        "copying, which behaves like a replica lagging up to N seconds."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--every", type=float, default=0, help="Repeat every N seconds (0 → once)")
+
+    def handle(self, *args, **options):
+        alias = settings.DB_REPLICA["ALIAS"]
+        if alias not in settings.DATABASES:
+            raise CommandError("No replica configured (set DB_REPLICA_NAME)")
+
+        primary, replica = connections["default"], connections[alias]
+        if primary.vendor != "sqlite" or replica.vendor != "sqlite":
+            raise CommandError("Only SQLite replicas are copied; real replicas use database replication")
+
+        while True:
+            started = time.perf_counter()
+            source = sqlite3.connect(primary.settings_dict["NAME"])
+            target = sqlite3.connect(replica.settings_dict["NAME"])
+            try:
+                source.backup(target)
+            finally:
+                target.close()
+                source.close()
+
+            self.stdout.write(self.style.SUCCESS(
+                f"Replica refreshed in {(time.perf_counter() - started) * 1000:.0f} ms"
+            ))
+            if not options["every"]:
+                return
+            time.sleep(options["every"])
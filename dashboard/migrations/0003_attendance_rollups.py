@@ -0,0 +1,85 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:50
+
+from collections import defaultdict
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_attendance_rollups(apps, schema_editor):
+    # Same result as dashboard.rollups.rebuild(), with the historical models
+    Attendance = apps.get_model("apk", "Attendance")
+    AttendanceDailyRollup = apps.get_model("dashboard", "AttendanceDailyRollup")
+    AttendanceMonthlyRollup = apps.get_model("dashboard", "AttendanceMonthlyRollup")
+
+    rows = (
+        Attendance.objects
+        .values("date", "employee__employment_type", "employee__department")
+        .annotate(sessions=Count("id"), employees=Count("employee", distinct=True))
+        .order_by()
+    )
+
+    daily, months = [], defaultdict(lambda: [0, 0])
+    for row in rows:
+        group = {
+            "employment_type": row["employee__employment_type"],
+            "department": row["employee__department"],
+        }
+        daily.append(AttendanceDailyRollup(
+            date=row["date"], sessions=row["sessions"], employees=row["employees"], **group
+        ))
+        totals = months[(row["date"].replace(day=1), *group.values())]
+        totals[0] += row["sessions"]
+        totals[1] += row["employees"]
+
+    AttendanceDailyRollup.objects.bulk_create(daily, batch_size=1000)
+    AttendanceMonthlyRollup.objects.bulk_create([
+        AttendanceMonthlyRollup(
+            month=month,
+            employment_type=employment_type,
+            department=department,
+            sessions=sessions,
+            employee_days=employee_days,
+        )
+        for (month, employment_type, department), (sessions, employee_days) in months.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('apk', '0015_syncevent'),
+        ('dashboard', '0002_delete_dashboardsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceDailyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('employment_type', models.CharField(choices=[('staff', 'Staff'), ('intern', 'Intern')], max_length=20)),
+                ('department', models.CharField(choices=[('python', 'Python'), ('mern', 'MERN Stack'), ('uiux', 'UI/UX'), ('hr', 'HR'), ('flutter', 'Flutter'), ('software', 'Software Development'), ('tester', 'Software Testing'), ('data_analytics', 'Data Analytics'), ('devops', 'DevOps'), ('cybersecurity', 'Cyber Security'), ('digital_marketing', 'Digital Marketing')], max_length=20)),
+                ('sessions', models.IntegerField(default=0)),
+                ('employees', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('date', 'employment_type', 'department'), name='attendance_daily_rollup_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='AttendanceMonthlyRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField()),
+                ('employment_type', models.CharField(choices=[('staff', 'Staff'), ('intern', 'Intern')], max_length=20)),
+                ('department', models.CharField(choices=[('python', 'Python'), ('mern', 'MERN Stack'), ('uiux', 'UI/UX'), ('hr', 'HR'), ('flutter', 'Flutter'), ('software', 'Software Development'), ('tester', 'Software Testing'), ('data_analytics', 'Data Analytics'), ('devops', 'DevOps'), ('cybersecurity', 'Cyber Security'), ('digital_marketing', 'Digital Marketing')], max_length=20)),
+                ('sessions', models.IntegerField(default=0)),
+                ('employee_days', models.IntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('month', 'employment_type', 'department'), name='attendance_monthly_rollup_key')],
+            },
+        ),
+        migrations.RunPython(backfill_attendance_rollups, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+from django.db import models
+
+from employees.models import Employee
+
+
+# =====================================================
+# ATTENDANCE ROLLUPS (maintained by dashboard.rollups)
+# =====================================================
+# Pre-aggregated attendance per day / month and employee group, so the
+# dashboard reads a few rows instead of the Attendance table.
+#
+#   sessions  → Attendance rows (check-ins)
+#   employees → distinct employees present (daily)
+#   employee_days → sum of the daily `employees` (monthly)
+
+class AttendanceDailyRollup(models.Model):
+    date = models.DateField()
+    employment_type = models.CharField(max_length=20, choices=Employee.EMPLOYMENT_TYPE_CHOICES)
+    department = models.CharField(max_length=20, choices=Employee.DEPARTMENT_CHOICES)
+
+    sessions = models.IntegerField(default=0)
+    employees = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["date", "employment_type", "department"],
+                name="attendance_daily_rollup_key"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.date} {self.employment_type}/{self.department}: {self.sessions}"
+
+
+class AttendanceMonthlyRollup(models.Model):
+    month = models.DateField()  # first day of the month
+    employment_type = models.CharField(max_length=20, choices=Employee.EMPLOYMENT_TYPE_CHOICES)
+    department = models.CharField(max_length=20, choices=Employee.DEPARTMENT_CHOICES)
+
+    sessions = models.IntegerField(default=0)
+    employee_days = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["month", "employment_type", "department"],
+                name="attendance_monthly_rollup_key"
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.month:%Y-%m} {self.employment_type}/{self.department}: {self.sessions}"
@@ -0,0 +1,209 @@
+import threading
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncMonth
+
+from apk.models import Attendance
+from employees import refs
+
+from .models import AttendanceDailyRollup, AttendanceMonthlyRollup
+
+
+# =====================================================
+# ATTENDANCE ROLLUP MAINTENANCE
+# =====================================================
+# Check-ins and deletes shift the rollup rows of their (day, employment
+# type, department) with F() deltas; `employees` / `employee_days` only
+# move when the session is the employee's first / last of that day.
+#
+# Bulk paths call `sessions_added` / `sessions_removed` for the whole
+# batch. Deleting an employee cascades to its sessions: those days are
+# recomputed once with `rebuild(days)` after the delete.
+#
+# Rows are keyed by the employee's type and department at write time.
+# `manage.py rebuild_attendance_rollups` recomputes everything from the
+# Attendance table (backfill, or after moving employees between
+# departments).
+
+_deleting = threading.local()
+
+
+def _month(day):
+    return day.replace(day=1)
+
+
+def _group(employee):
+    missing = employee.get_deferred_fields() & {"employment_type", "department"}
+    if missing:
+        # Partial employee from token claims → the cached ref has both
+        if "employee_id" in employee.get_deferred_fields():
+            employee.refresh_from_db(fields=missing)
+        else:
+            employee = refs.by_code(employee.employee_id)
+
+    return {
+        "employment_type": employee.employment_type,
+        "department": employee.department,
+    }
+
+
+def _bump(model, key, **deltas):
+    """UPDATE the row at `key` by `deltas`, creating it on first use."""
+    changes = {field: F(field) + delta for field, delta in deltas.items() if delta}
+    if not changes or model.objects.filter(**key).update(**changes):
+        return
+
+    if any(delta < 0 for delta in deltas.values()):
+        return  # nothing to take from; `rebuild` repairs drift
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**key, **deltas)
+    except IntegrityError:
+        # Created concurrently
+        model.objects.filter(**key).update(**changes)
+
+
+def _apply(employee, per_day, sign):
+    # per_day: day → (sessions, 1 if the employee arrives / leaves that day)
+    group = _group(employee)
+    month_sessions, month_employee_days = Counter(), Counter()
+
+    for day, (sessions, present) in per_day.items():
+        _bump(
+            AttendanceDailyRollup,
+            {"date": day, **group},
+            sessions=sign * sessions,
+            employees=sign * present,
+        )
+        month_sessions[_month(day)] += sessions
+        month_employee_days[_month(day)] += present
+
+    for month, sessions in month_sessions.items():
+        _bump(
+            AttendanceMonthlyRollup,
+            {"month": month, **group},
+            sessions=sign * sessions,
+            employee_days=sign * month_employee_days[month],
+        )
+
+
+def _other_days(employee, days, exclude):
+    """Days among `days` on which the employee has sessions besides `exclude`."""
+    return set(
+        Attendance.objects
+        .filter(employee=employee, date__in=days)
+        .exclude(pk__in=exclude)
+        .values_list("date", flat=True)
+        .distinct()
+    )
+
+
+# -----------------------------
+# INCREMENTAL
+# -----------------------------
+def sessions_added(employee, sessions):
+    """After `sessions` of `employee` were inserted."""
+    if not sessions:
+        return
+
+    counts = Counter(session.date for session in sessions)
+    had = _other_days(employee, counts, [session.pk for session in sessions])
+
+    _apply(employee, {day: (n, int(day not in had)) for day, n in counts.items()}, +1)
+
+
+def sessions_removed(employee, days):
+    """After sessions on `days` (one entry per session) of `employee` were deleted."""
+    counts = Counter(days)
+    if not counts:
+        return
+
+    left = _other_days(employee, counts, [])
+
+    _apply(employee, {day: (n, int(day not in left)) for day, n in counts.items()}, -1)
+
+
+# -----------------------------
+# EMPLOYEE DELETE (cascade)
+# -----------------------------
+def begin_employee_delete(employee_pk):
+    if not hasattr(_deleting, "days"):
+        _deleting.days = {}
+    _deleting.days[employee_pk] = set()
+
+
+def deferred(session):
+    """Session removed by its employee's delete? Then remember its day."""
+    days = getattr(_deleting, "days", {}).get(session.employee_id)
+    if days is None:
+        return False
+    days.add(session.date)
+    return True
+
+
+def end_employee_delete(employee_pk):
+    days = getattr(_deleting, "days", {}).pop(employee_pk, None)
+    if days:
+        rebuild(days)
+
+
+# -----------------------------
+# REBUILD
+# -----------------------------
+@transaction.atomic
+def rebuild(days=None):
+    """Recompute the rollups of `days` (None → everything) from Attendance."""
+    sessions = Attendance.objects.all()
+    daily = AttendanceDailyRollup.objects.all()
+    months = None
+
+    if days is not None:
+        days = set(days)
+        months = {_month(day) for day in days}
+        sessions = sessions.filter(date__in=days)
+        daily = daily.filter(date__in=days)
+
+    rows = (
+        sessions
+        .values("date", "employee__employment_type", "employee__department")
+        .annotate(sessions=Count("id"), employees=Count("employee", distinct=True))
+        .order_by()
+    )
+
+    daily.delete()
+    AttendanceDailyRollup.objects.bulk_create([
+        AttendanceDailyRollup(
+            date=row["date"],
+            employment_type=row["employee__employment_type"],
+            department=row["employee__department"],
+            sessions=row["sessions"],
+            employees=row["employees"],
+        )
+        for row in rows
+    ], batch_size=1000)
+
+    _rebuild_months(months)
+
+
+def _rebuild_months(months):
+    daily = AttendanceDailyRollup.objects.annotate(month=TruncMonth("date"))
+    monthly = AttendanceMonthlyRollup.objects.all()
+
+    if months is not None:
+        daily = daily.filter(month__in=months)
+        monthly = monthly.filter(month__in=months)
+
+    rows = (
+        daily
+        .values("month", "employment_type", "department")
+        .annotate(sessions=Sum("sessions"), employee_days=Sum("employees"))
+        .order_by()
+    )
+
+    monthly.delete()
+    AttendanceMonthlyRollup.objects.bulk_create([
+        AttendanceMonthlyRollup(**row) for row in rows if row["sessions"]
+    ], batch_size=1000)
@@ -0,0 +1,74 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from apk.models import Attendance
+from employees.models import Employee
+from project.models import PhaseTask, Project
+
+from . import rollups
+from .cache import invalidate_on_commit
+
+
+# =====================================================
+# DASHBOARD CACHE INVALIDATION
+# =====================================================
+# Any write to a model the dashboard reads drops the cached responses.
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+@receiver(post_save, sender=PhaseTask)
+@receiver(post_delete, sender=PhaseTask)
+@receiver(post_save, sender=Attendance)
+@receiver(post_delete, sender=Attendance)
+def invalidate_dashboard(sender, raw=False, **kwargs):
+    if not raw:
+        invalidate_on_commit()
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+def invalidate_dashboard_team(sender, action, **kwargs):
+    # Ongoing project cards show the team
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_on_commit()
+
+
+# =====================================================
+# ATTENDANCE ROLLUPS (dashboard.rollups)
+# =====================================================
+
+@receiver(post_save, sender=Attendance)
+def rollup_attendance_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    key = (instance.employee_id, instance.date)
+    old_key = getattr(instance, "_rollup_key", None)
+
+    if created:
+        rollups.sessions_added(instance.employee, [instance])
+    elif old_key and None not in old_key and old_key != key:
+        # Moved to another employee / day (check-out updates keep the key)
+        old_employee = Employee.objects.only("employment_type", "department").get(pk=old_key[0])
+        rollups.sessions_removed(old_employee, [old_key[1]])
+        rollups.sessions_added(instance.employee, [instance])
+
+    instance._rollup_key = key
+
+
+@receiver(post_delete, sender=Attendance)
+def rollup_attendance_deleted(sender, instance, **kwargs):
+    if not rollups.deferred(instance):
+        rollups.sessions_removed(instance.employee, [instance.date])
+
+
+@receiver(pre_delete, sender=Employee)
+def rollup_employee_deleting(sender, instance, **kwargs):
+    # Its sessions are deleted first; their days are recomputed once after
+    rollups.begin_employee_delete(instance.pk)
+
+
+@receiver(post_delete, sender=Employee)
+def rollup_employee_deleted(sender, instance, **kwargs):
+    rollups.end_employee_delete(instance.pk)
@@ -1,3 +1,119 @@
-from django.test import TestCase
+from datetime import timedelta
+from io import StringIO
 
-# Create your tests here.
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apk.models import Attendance
+from apk.utils import create_employee_token
+from codeedex.synthetic import seed_org
+
+from . import rollups
+from .models import AttendanceDailyRollup, AttendanceMonthlyRollup
+
+
+# =====================================================
+# ATTENDANCE ROLLUPS
+# =====================================================
+# Whatever path a session takes in or out, the incrementally maintained
+# rows must equal a rebuild from the Attendance table.
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    PASSWORD_HASHING={**settings.PASSWORD_HASHING, "WORKERS": 0},
+)
+class AttendanceRollupTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.sample = seed_org(scale=1, months=1)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.credentials(
+            HTTP_AUTHORIZATION=f"Bearer {create_employee_token(self.sample['staff'])}"
+        )
+
+    @staticmethod
+    def rows():
+        return (
+            sorted(AttendanceDailyRollup.objects.values_list(
+                "date", "employment_type", "department", "sessions", "employees"
+            )),
+            sorted(AttendanceMonthlyRollup.objects.values_list(
+                "month", "employment_type", "department", "sessions", "employee_days"
+            )),
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = self.rows()
+        rollups.rebuild()
+        self.assertEqual(incremental, self.rows())
+
+    def test_check_in_and_out(self):
+        for _ in range(3):  # in, out, second session
+            self.assertEqual(self.client.post("/apk/check/", {}, format="json").status_code, 200)
+
+        today = AttendanceDailyRollup.objects.get(
+            date=timezone.localdate(), employment_type="staff", department="python"
+        )
+        self.assertEqual((today.sessions, today.employees), (2, 1))
+        self.assertMatchesRebuild()
+
+    def test_offline_sync(self):
+        now = timezone.now()
+        response = self.client.post("/apk/sync/", {"events": [
+            {"key": "in-1", "type": "check_in", "timestamp": now - timedelta(hours=5)},
+            {"key": "out-1", "type": "check_out", "timestamp": now - timedelta(hours=4)},
+            {"key": "in-2", "type": "check_in", "timestamp": now - timedelta(hours=3)},
+        ]}, format="json")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertMatchesRebuild()
+
+    def test_session_deleted_and_moved(self):
+        staff, intern = self.sample["staff"], self.sample["intern"]
+        sessions = list(Attendance.objects.filter(employee=staff).order_by("date")[:2])
+
+        sessions[0].delete()
+
+        moved = Attendance.objects.get(pk=sessions[1].pk)
+        moved.employee = intern
+        moved.date -= timedelta(days=40)
+        moved.save()
+
+        self.assertMatchesRebuild()
+
+    def test_employee_deleted(self):
+        self.sample["intern"].delete()
+        self.assertMatchesRebuild()
+
+    def test_views_read_the_rollups(self):
+        self.client.post("/apk/check/", {}, format="json")
+
+        dashboard = APIClient()
+        graph = dashboard.get("/dashboard/performance-graph/").json()["data"]
+        months = Attendance.objects.exclude(employee__employment_type="intern").dates("date", "month")
+        self.assertEqual(graph["months"], [month.strftime("%b") for month in months])
+        self.assertEqual(
+            sum(graph["values"]),
+            Attendance.objects.exclude(employee__employment_type="intern").count()
+        )
+
+        summary = dashboard.get("/dashboard/summary/").json()["data"]
+        self.assertGreater(summary["attendance_percent"], 0)
+
+    def test_backfill_command(self):
+        AttendanceDailyRollup.objects.all().delete()
+        AttendanceMonthlyRollup.objects.all().delete()
+
+        first = Attendance.objects.order_by("date").values_list("date", flat=True).first()
+        call_command("rebuild_attendance_rollups", since=first, stdout=StringIO())
+
+        self.assertTrue(self.rows()[0])
+        self.assertMatchesRebuild()
@@ -2,6 +2,7 @@ from django.urls import path
 from .views import (
     DashboardSummaryAPIView,
     OngoingProjectsAPIView,
+    PerfReportAPIView,
     PerformanceGraphAPIView,
     ProjectStatusAPIView
 )
@@ -11,4 +12,5 @@ urlpatterns = [
     path("ongoing-projects/", OngoingProjectsAPIView.as_view()),
     path("performance-graph/", PerformanceGraphAPIView.as_view()),
     path("project-status/", ProjectStatusAPIView.as_view()),
+    path("perf/", PerfReportAPIView.as_view()),
 ]
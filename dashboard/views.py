@@ -1,25 +1,29 @@
 from datetime import date
 
-from django.db.models import (
-    Count, Q, Case, When, Value, CharField,F
-)
-from django.db.models.functions import TruncMonth
+from django.conf import settings
+from django.db.models import Count, Q, Sum
 
 from rest_framework.views import APIView
-from rest_framework.permissions import AllowAny
+from rest_framework.permissions import AllowAny, IsAdminUser
 
+from codeedex.db_routers import replica_reads
+from codeedex.middleware import metrics
+from dashboard.cache import cached_dashboard
+from dashboard.models import AttendanceDailyRollup, AttendanceMonthlyRollup
 from dashboard.utils import api_response
+from employees.hashing import get_hashing_service
 from employees.models import Employee
 from project.models import Project
-from apk.models import Attendance
 
 
 # ---------------------------------------------
 # TOP DASHBOARD CARDS
 # ---------------------------------------------
+@replica_reads
 class DashboardSummaryAPIView(APIView):
     permission_classes = [AllowAny]
 
+    @cached_dashboard("summary")
     def get(self, request):
 
         active_employees = Employee.objects.filter(
@@ -34,10 +38,12 @@ class DashboardSummaryAPIView(APIView):
 
         project_count = Project.objects.count()
 
-        present_today = Attendance.objects.filter(
-            date=date.today(),
-            employee__employee_id__startswith="EMP"
-        ).values("employee").distinct().count()
+        # EMP ids are every non-intern (Employee.id_prefix)
+        present_today = AttendanceDailyRollup.objects.filter(
+            date=date.today()
+        ).exclude(
+            employment_type="intern"
+        ).aggregate(total=Sum("employees"))["total"] or 0
 
         attendance_percent = round(
             (present_today / active_employees) * 100, 1
@@ -58,29 +64,16 @@ class DashboardSummaryAPIView(APIView):
 # ---------------------------------------------
 # ONGOING PROJECT LIST (Optimized)
 # ---------------------------------------------
+@replica_reads
 class OngoingProjectsAPIView(APIView):
     permission_classes = [AllowAny]
 
+    @cached_dashboard("ongoing-projects")
     def get(self, request):
 
+        # Task counters are maintained on the row (project.signals)
         projects = (
             Project.objects
-            .annotate(
-                total_tasks=Count("phases__tasks", distinct=True),
-                completed_tasks=Count(
-                    "phases__tasks",
-                    filter=Q(phases__tasks__status="completed"),
-                    distinct=True
-                ),
-            )
-            .annotate(
-                computed_status=Case(
-                    When(total_tasks=0, then=Value("pending")),
-                    When(total_tasks=F("completed_tasks"), then=Value("completed")),
-                    default=Value("ongoing"),
-                    output_field=CharField(),
-                )
-            )
             .filter(computed_status="ongoing")
             .prefetch_related("team_members")[:10]
         )
@@ -113,17 +106,19 @@ class OngoingProjectsAPIView(APIView):
 # ---------------------------------------------
 # BAR GRAPH (Monthly Attendance)
 # ---------------------------------------------
+@replica_reads
 class PerformanceGraphAPIView(APIView):
     permission_classes = [AllowAny]
 
+    @cached_dashboard("performance-graph")
     def get(self, request):
 
+        # Maintained on write (dashboard.rollups) → one row per month/group
         qs = (
-            Attendance.objects
-            .filter(employee__employee_id__startswith="EMP")
-            .annotate(month=TruncMonth("date"))
+            AttendanceMonthlyRollup.objects
+            .exclude(employment_type="intern")
             .values("month")
-            .annotate(total=Count("id"))
+            .annotate(total=Sum("sessions"))
             .order_by("month")
         )
 
@@ -140,28 +135,36 @@ class PerformanceGraphAPIView(APIView):
 # ---------------------------------------------
 # DONUT CHART (Project Status - Optimized)
 # ---------------------------------------------
+@replica_reads
 class ProjectStatusAPIView(APIView):
     permission_classes = [AllowAny]
 
+    @cached_dashboard("project-status")
     def get(self, request):
 
-        projects = Project.objects.annotate(
-            total_tasks=Count("phases__tasks", distinct=True),
-            completed_tasks=Count(
-                "phases__tasks",
-                filter=Q(phases__tasks__status="completed"),
-                distinct=True
-            ),
-        ).annotate(
-            computed_status=Case(
-                When(total_tasks=0, then=Value("pending")),
-                When(total_tasks=F("completed_tasks"), then=Value("completed")),
-                default=Value("ongoing"),
-                output_field=CharField(),
-            )
+        # Optional filters: ?project_type=&priority=&manager=<employee_id>
+        projects = Project.objects.all()
+
+        project_type = request.GET.get("project_type")
+        priority = request.GET.get("priority")
+        manager = request.GET.get("manager")
+
+        if project_type:
+            projects = projects.filter(project_type=project_type)
+        if priority:
+            projects = projects.filter(priority=priority)
+        if manager:
+            projects = projects.filter(project_manager__employee_id=manager)
+
+        # One pass over the maintained computed_status column
+        counts = projects.aggregate(
+            total=Count("id"),
+            completed=Count("id", filter=Q(computed_status="completed")),
+            ongoing=Count("id", filter=Q(computed_status="ongoing")),
+            pending=Count("id", filter=Q(computed_status="pending")),
         )
 
-        total = projects.count()
+        total = counts["total"]
         if not total:
             return api_response(
                 success=True,
@@ -169,16 +172,32 @@ class ProjectStatusAPIView(APIView):
                 data={"completed": 0, "ongoing": 0, "pending": 0}
             )
 
-        completed = projects.filter(computed_status="completed").count()
-        ongoing = projects.filter(computed_status="ongoing").count()
-        pending = projects.filter(computed_status="pending").count()
-
         return api_response(
             success=True,
             message="Project status fetched successfully",
             data={
-                "completed": round((completed / total) * 100, 2),
-                "ongoing": round((ongoing / total) * 100, 2),
-                "pending": round((pending / total) * 100, 2),
+                "completed": round((counts["completed"] / total) * 100, 2),
+                "ongoing": round((counts["ongoing"] / total) * 100, 2),
+                "pending": round((counts["pending"] / total) * 100, 2),
+            }
+        )
+
+
+# ---------------------------------------------
+# REQUEST PROFILE (percentiles per route)
+# ---------------------------------------------
+class PerfReportAPIView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        # Samples of this worker process (codeedex.middleware)
+        return api_response(
+            success=True,
+            message="Request profile fetched successfully",
+            data={
+                "sample_rate": settings.REQUEST_PROFILING["SAMPLE_RATE"],
+                "routes": metrics.snapshot(),
+                # Login / import hashing pool (employees.hashing)
+                "password_hashing": get_hashing_service().metrics.snapshot(),
             }
-        )
\ No newline at end of file
+        )
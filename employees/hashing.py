@@ -0,0 +1,289 @@
+import multiprocessing
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from concurrent.futures import TimeoutError as FutureTimeout
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import (
+    get_hasher,
+    identify_hasher,
+    is_password_usable,
+    make_password,
+)
+
+
+# =====================================================
+# PASSWORD HASHING
+# =====================================================
+# PBKDF2 is deliberately slow (~tens of ms per password, more on small
+# machines). Hashing in the request thread ties up a web worker per
+# login, so logins are capped by worker count instead of CPU cores.
+#
+# PasswordHashingService sends hash/verify calls to a bounded process
+# pool. At most MAX_PENDING calls are queued; past that, callers wait up
+# to QUEUE_TIMEOUT for a slot and then get HashingBusy (→ HTTP 503)
+# instead of piling up. WORKERS = 0 hashes inline (tests, tiny installs).
+#
+# Bulk imports use the same pool: passwords go out in chunks, at most
+# one chunk per worker at a time, so an import never takes every queue
+# slot from logins. The views answer HashingBusy with 503 + Retry-After.
+
+BATCH_CHUNK_SIZE = 32
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+def _init_worker():
+    # Needed when the pool uses "spawn" instead of "fork"
+    django.setup()
+
+
+def is_hashed(value):
+    """True when `value` is already an encoded password from any configured hasher."""
+    if not value:
+        return False
+    try:
+        identify_hasher(value)
+    except ValueError:
+        return False
+    return True
+
+
+def _hash_chunk(passwords):
+    return [make_password(password) for password in passwords]
+
+
+def _verify(password, encoded):
+    """
+    Worker side of check_password: returns (matches, must_update).
+    must_update is True when the preferred hasher or its parameters
+    (e.g. iterations) changed since `encoded` was made.
+    """
+    if password is None or not is_password_usable(encoded):
+        return False, False
+
+    try:
+        hasher = identify_hasher(encoded)
+    except ValueError:
+        return False, False
+
+    preferred = get_hasher("default")
+    must_update = (
+        hasher.algorithm != preferred.algorithm
+        or preferred.must_update(encoded)
+    )
+    return hasher.verify(password, encoded), must_update
+
+
+# -----------------------------
+# METRICS
+# -----------------------------
+class HashMetrics:
+    """Latency of recent hash/verify calls (process-local)."""
+
+    def __init__(self, size=1000):
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=size)
+        self.calls = 0
+        self.rejected = 0
+        self.errors = 0
+        self.in_flight = 0
+
+    def bump(self, name, delta=1):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + delta)
+
+    def record(self, seconds):
+        with self._lock:
+            self.calls += 1
+            self._latencies.append(seconds)
+
+    def snapshot(self):
+        with self._lock:
+            latencies = sorted(self._latencies)
+            calls, rejected, errors, in_flight = self.calls, self.rejected, self.errors, self.in_flight
+
+        def percentile(p):
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000, 2)
+
+        return {
+            "calls": calls,
+            "rejected": rejected,
+            "errors": errors,
+            "in_flight": in_flight,
+            "p50_ms": percentile(0.50),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(latencies[-1] * 1000, 2) if latencies else None,
+        }
+
+
+# -----------------------------
+# SERVICE
+# -----------------------------
+class PasswordHashingService:
+
+    def __init__(self, workers, max_pending, queue_timeout, timeout, start_method="spawn"):
+        self.workers = workers
+        self.queue_timeout = queue_timeout
+        self.timeout = timeout
+        self.start_method = start_method
+        self.metrics = HashMetrics()
+
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls):
+        config = settings.PASSWORD_HASHING
+        return cls(
+            workers=config["WORKERS"],
+            max_pending=config["MAX_PENDING"],
+            queue_timeout=config["QUEUE_TIMEOUT"],
+            timeout=config["TIMEOUT"],
+            start_method=config.get("START_METHOD", "spawn"),
+        )
+
+    def _pool(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context(self.start_method),
+                        initializer=_init_worker,
+                    )
+        return self._executor
+
+    def _submit(self, fn, *args):
+        """Queue `fn(*args)` on the pool (inline with WORKERS = 0) → Future."""
+        # Backpressure: bounded number of queued + running calls
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            self.metrics.bump("rejected")
+            raise HashingBusy("Password hashing queue is full")
+
+        self.metrics.bump("in_flight")
+        started = time.perf_counter()
+
+        def done(_):
+            self.metrics.bump("in_flight", -1)
+            self.metrics.record(time.perf_counter() - started)
+            self._slots.release()
+
+        if self.workers:
+            try:
+                future = self._pool().submit(fn, *args)
+            except BrokenProcessPool:
+                done(None)
+                self._broken()
+        else:
+            future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as exc:
+                future.set_exception(exc)
+
+        future.add_done_callback(done)
+        return future
+
+    def _result(self, future):
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            self.metrics.bump("errors")
+            raise HashingBusy("Password hashing timed out")
+        except BrokenProcessPool:
+            self._broken()
+
+    def _broken(self):
+        # A worker died → start a fresh pool on the next call
+        self.metrics.bump("errors")
+        self.shutdown()
+        raise HashingBusy("Password hashing pool restarted")
+
+    def _run(self, fn, *args):
+        return self._result(self._submit(fn, *args))
+
+    def hash(self, password):
+        return self._run(make_password, password)
+
+    def hash_many(self, passwords):
+        """Hash a batch in chunks, keeping order; one chunk in flight per worker."""
+        chunks = [
+            passwords[start:start + BATCH_CHUNK_SIZE]
+            for start in range(0, len(passwords), BATCH_CHUNK_SIZE)
+        ]
+        in_flight, hashed = deque(), []
+
+        for chunk in chunks:
+            if len(in_flight) >= max(self.workers, 1):
+                hashed.extend(self._result(in_flight.popleft()))
+            in_flight.append(self._submit(_hash_chunk, chunk))
+
+        while in_flight:
+            hashed.extend(self._result(in_flight.popleft()))
+        return hashed
+
+    def verify(self, password, encoded, setter=None):
+        """
+        check_password() on the pool. When the stored hash uses outdated
+        hasher settings, `setter(password)` is called after a successful
+        match so the caller can store a fresh hash.
+        """
+        matches, must_update = self._run(_verify, password, encoded)
+        if matches and must_update and setter:
+            setter(password)
+        return matches
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_hashing_service():
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = PasswordHashingService.from_settings()
+    return _service
+
+
+def hash_password(password):
+    return get_hashing_service().hash(password)
+
+
+def verify_password(password, encoded, setter=None):
+    return get_hashing_service().verify(password, encoded, setter)
+
+
+# -----------------------------
+# BATCHES (bulk import)
+# -----------------------------
+def hash_passwords(passwords):
+    """
+    Hash raw passwords on the shared pool, keeping order. None stays None.
+    Raises HashingBusy like hash_password.
+    """
+    indexes = [i for i, password in enumerate(passwords) if password]
+    hashed = list(passwords)
+
+    results = get_hashing_service().hash_many([passwords[i] for i in indexes])
+    for i, value in zip(indexes, results):
+        hashed[i] = value
+
+    return hashed
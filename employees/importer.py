@@ -0,0 +1,277 @@
+import csv
+import io
+import json
+import re
+
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+from rest_framework import serializers
+
+from .hashing import hash_passwords
+from .models import Employee
+from .serializers import EmployeeCreateUpdateSerializer
+
+
+# =====================================================
+# BULK EMPLOYEE IMPORT
+# =====================================================
+# Rows are validated with the regular create rules, but every lookup
+# the per-employee API does (existing emails, reporting managers) is
+# loaded once for the whole file. IDs are reserved as a block, passwords
+# hashed in a process pool and rows inserted with bulk_create.
+
+IMPORT_FIELDS = [
+    'name',
+    'email',
+    'phone',
+    'gender',
+    'date_of_birth',
+
+    'department',
+    'employment_type',
+    'role',
+    'position',
+    'is_manager',
+    'reporting_manager',
+    'joining_date',
+    'status',
+
+    'salary',
+    'salary_type',
+    'payment_method',
+
+    'id_proof_type',
+    'address',
+    'password',
+]
+
+DEFAULT_BATCH_SIZE = 500
+
+
+class EmployeeImportRowSerializer(EmployeeCreateUpdateSerializer):
+    require_offer_letter = False
+
+    # Resolved from the preloaded manager map, not one query per row
+    reporting_manager = serializers.CharField(
+        required=False,
+        allow_null=True,
+        allow_blank=True
+    )
+
+    class Meta(EmployeeCreateUpdateSerializer.Meta):
+        fields = IMPORT_FIELDS
+        read_only_fields = []
+        extra_kwargs = {
+            # Uniqueness is checked against the preloaded email set
+            "email": {"validators": []},
+        }
+
+    def validate_email(self, value):
+        pattern = r'^[a-zA-Z0-9._%+-]+@gmail\.com$'
+        if not re.match(pattern, value):
+            raise serializers.ValidationError(
+                "Email must be a valid gmail.com address."
+            )
+
+        if value.lower() in self.context["taken_emails"]:
+            raise serializers.ValidationError(
+                "An employee with this email already exists."
+            )
+
+        return value
+
+    def validate(self, data):
+        # Rows without a type are inserted as staff (model default) by
+        # bulk_create, which skips Employee.save → apply the staff rules
+        data.setdefault("employment_type", "staff")
+        return super().validate(data)
+
+    def validate_reporting_manager(self, value):
+        if not value:
+            return None
+
+        manager = self.context["managers"].get(value)
+        if manager is None:
+            raise serializers.ValidationError(
+                f"Unknown reporting manager '{value}'."
+            )
+        return manager
+
+
+# -----------------------------
+# READERS
+# -----------------------------
+def _clean(row):
+    # Not an object → left for import_employees to report per row
+    if not isinstance(row, dict):
+        return row
+
+    # Empty CSV cells mean "not provided"
+    return {
+        key.strip(): value.strip() if isinstance(value, str) else value
+        for key, value in row.items()
+        if key and value not in ("", None)
+    }
+
+
+def read_rows(fileobj, file_type):
+    """Read CSV or JSONL (one JSON object per line) into dicts."""
+    if isinstance(fileobj.read(0), bytes):
+        fileobj = io.TextIOWrapper(fileobj, encoding="utf-8-sig")
+
+    if file_type == "csv":
+        return [_clean(row) for row in csv.DictReader(fileobj)]
+
+    if file_type == "jsonl":
+        return [_clean(json.loads(line)) for line in fileobj if line.strip()]
+
+    raise ValueError(f"Unsupported file type '{file_type}' (use csv or jsonl)")
+
+
+def detect_file_type(filename):
+    return "jsonl" if filename.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+
+# -----------------------------
+# IMPORT
+# -----------------------------
+def import_employees(rows, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Validate and insert employee rows. Returns a report:
+        {"created": n, "failed": n,
+         "employees": [{"row": 1, "employee_id": ..., "email": ...}],
+         "errors": [{"row": 2, "errors": {...}}]}
+    Row numbers are 1-based. Invalid rows are reported, valid rows are
+    still imported.
+    """
+    emails = {
+        str(row.get("email", "")).lower()
+        for row in rows
+        if isinstance(row, dict)
+    } - {""}
+
+    # 1️⃣ One query for every existing email (case-insensitive)
+    taken = set(
+        Employee.objects
+        .annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=emails)
+        .values_list("email_lower", flat=True)
+    )
+
+    # 2️⃣ One query for every possible reporting manager
+    managers = {
+        manager.employee_id: manager
+        for manager in Employee.objects.filter(
+            employment_type="staff",
+            is_manager=True
+        ).only("id", "employee_id", "employment_type", "is_manager")
+    }
+
+    context = {"taken_emails": taken, "managers": managers}
+
+    valid, errors = [], []
+    for number, row in enumerate(rows, start=1):
+        # JSON rows may be any value → only objects are employees
+        if not isinstance(row, dict):
+            errors.append({"row": number, "errors": {
+                "non_field_errors": [f"Expected an object, got {type(row).__name__}."]
+            }})
+            continue
+
+        serializer = EmployeeImportRowSerializer(data=row, context=context)
+
+        if not serializer.is_valid():
+            errors.append({"row": number, "errors": serializer.errors})
+            continue
+
+        data = serializer.validated_data
+        # Duplicates inside the file itself
+        taken.add(data["email"].lower())
+        valid.append((number, data))
+
+    created = []
+    if valid and not dry_run:
+        try:
+            created = _insert(valid, batch_size)
+        except IntegrityError:
+            # Emails written by a concurrent import since the preload →
+            # those rows are reported and the rest inserted once more
+            valid, clashes = _split_taken(valid)
+            errors = sorted(errors + clashes, key=lambda error: error["row"])
+            try:
+                created = _insert(valid, batch_size) if valid else []
+            except IntegrityError as exc:
+                errors = sorted(errors + [
+                    {"row": number, "errors": {"non_field_errors": [f"Could not be saved: {exc}"]}}
+                    for number, _ in valid
+                ], key=lambda error: error["row"])
+
+    return {
+        "created": len(created),
+        "failed": len(errors),
+        "employees": created,
+        "errors": errors,
+    }
+
+
+def _split_taken(valid):
+    """Split validated rows into (still free, [row errors for taken emails])."""
+    taken = set(
+        Employee.objects
+        .annotate(email_lower=Lower("email"))
+        .filter(email_lower__in=[data["email"].lower() for _, data in valid])
+        .values_list("email_lower", flat=True)
+    )
+
+    free, errors = [], []
+    for number, data in valid:
+        if data["email"].lower() in taken:
+            errors.append({"row": number, "errors": {
+                "email": ["An employee with this email already exists."]
+            }})
+        else:
+            free.append((number, data))
+    return free, errors
+
+
+def _insert(valid, batch_size):
+    # 3️⃣ Passwords hashed in parallel on the shared pool (employees.hashing)
+    hashed = hash_passwords([data.get("password") for _, data in valid])
+
+    # 4️⃣ IDs reserved as one block per prefix
+    counts = {}
+    for _, data in valid:
+        employment_type = data.get("employment_type", "staff")
+        counts[employment_type] = counts.get(employment_type, 0) + 1
+    ids = {
+        employment_type: iter(Employee.generate_ids(employment_type, count))
+        for employment_type, count in counts.items()
+    }
+
+    employees = []
+    for (number, data), password in zip(valid, hashed):
+        employee = Employee(**{**data, "password": password})
+        employee.employee_id = next(ids[employee.employment_type])
+
+        # Same normalisation as Employee.save
+        if employee.employment_type == "intern" or employee.is_manager:
+            employee.reporting_manager = None
+
+        employees.append(employee)
+
+    # 5️⃣ Chunked inserts, all or nothing
+    with transaction.atomic():
+        Employee.objects.bulk_create(employees, batch_size=batch_size)
+
+        # bulk_create skips model signals
+        from dashboard.cache import invalidate_on_commit
+        invalidate_on_commit()
+
+    return [
+        {
+            "row": number,
+            "employee_id": employee.employee_id,
+            "email": employee.email,
+        }
+        for (number, _), employee in zip(valid, employees)
+    ]
@@ -0,0 +1,55 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from employees.hashing import HashingBusy
+from employees.importer import DEFAULT_BATCH_SIZE, detect_file_type, import_employees, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk import employees from a CSV (header row) or JSONL file. "
+        "Reporting managers must already exist (employee_id)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="CSV or JSONL file")
+        parser.add_argument("--file-type", choices=["csv", "jsonl"], help="Default: from the file extension")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="Rows per INSERT")
+        parser.add_argument("--dry-run", action="store_true", help="Validate only, insert nothing")
+        parser.add_argument("--errors", help="Write the per-row error report (JSON) to this file")
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        file_type = options["file_type"] or detect_file_type(path)
+
+        try:
+            with open(path, encoding="utf-8-sig", newline="") as fileobj:
+                rows = read_rows(fileobj, file_type)
+        except (OSError, ValueError) as exc:
+            raise CommandError(f"Could not read {path}: {exc}")
+
+        # Password hashing processes: PASSWORD_HASHING_WORKERS
+        try:
+            report = import_employees(
+                rows,
+                batch_size=options["batch_size"],
+                dry_run=options["dry_run"],
+            )
+        except HashingBusy as exc:
+            raise CommandError(f"{exc}, please try again")
+
+        for error in report["errors"]:
+            self.stderr.write(f"Row {error['row']}: {json.dumps(error['errors'])}")
+
+        if options["errors"]:
+            with open(options["errors"], "w") as fileobj:
+                json.dump(report["errors"], fileobj, indent=2)
+
+        if options["dry_run"]:
+            valid = len(rows) - report["failed"]
+            self.stdout.write(f"Dry run: {valid} valid row(s), {report['failed']} row(s) failed")
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"{report['created']} employee(s) imported, {report['failed']} row(s) failed"
+            ))
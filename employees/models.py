@@ -1,6 +1,6 @@
-import re
 from django.db import models
-from django.contrib.auth.hashers import make_password
+
+from .hashing import hash_password, is_hashed
 
 
 class Employee(models.Model):
@@ -120,15 +120,48 @@ class Employee(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Cursor pagination order for the employee lists
+            models.Index(fields=["created_at", "id"], name="employee_created_idx"),
+        ]
     
     def __str__(self):
         return f"{self.employee_id} - {self.name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Code / email as loaded → employees.refs can drop the old keys after a rename
+        instance._loaded_keys = (
+            instance.__dict__.get("employee_id"),
+            instance.__dict__.get("email"),
+        )
+        return instance
+
+    @staticmethod
+    def id_prefix(employment_type):
+        return "INT" if employment_type == "intern" else "EMP"
+
+    @classmethod
+    def generate_ids(cls, employment_type, count=1):
+        """Reserve `count` employee IDs (block allocation for imports)."""
+        from .sequences import allocate, max_suffix
+
+        prefix = cls.id_prefix(employment_type)
+        numbers = allocate(
+            prefix,
+            count,
+            seed=lambda: max_suffix(cls.objects.all(), "employee_id", prefix)
+        )
+        return [f"{prefix}{number:03d}" for number in numbers]
+
     def save(self, *args, **kwargs):
 
-        # 🔐 HASH PASSWORD IF NOT HASHED
-        if self.password and not self.password.startswith("pbkdf2_sha256$"):
-            self.password = make_password(self.password)
+        # 🔐 HASH PASSWORD IF NOT HASHED (any configured hasher, not only pbkdf2)
+        if self.password and not is_hashed(self.password):
+            self.password = hash_password(self.password)
 
         # Intern → no position, no salary, no salary type, no payment method
         if self.employment_type == "intern":
@@ -181,22 +214,24 @@ class Employee(models.Model):
                 raise ValueError("Reporting Manager must be a manager")
 
 
-        # AUTO GENERATE EMPLOYEE ID
+        # AUTO GENERATE EMPLOYEE ID (atomic sequence, no last-row scan)
         if not self.employee_id or self.employee_id.strip() == "":
-            prefix = "INT" if self.employment_type == "intern" else "EMP"
-
-            last_emp = Employee.objects.filter(
-                employee_id__startswith=prefix
-            ).order_by("employee_id").last()
-
-            if last_emp:
-                match = re.search(r"(\d+)$", last_emp.employee_id)
-                last_number = int(match.group(1)) if match else 0
-            else:
-                last_number = 0
-
-            self.employee_id = f"{prefix}{last_number + 1:03d}"        
+            self.employee_id = Employee.generate_ids(self.employment_type)[0]
 
         super().save(*args, **kwargs)
 
 
+# =====================================================
+# ID SEQUENCES
+# =====================================================
+class IdSequence(models.Model):
+    """
+    Counter behind the human-readable IDs (EMP001, PRJ-2026-0001, ...).
+    One row per prefix (and year where the ID contains one); numbers
+    are handed out by employees.sequences.allocate().
+    """
+    key = models.CharField(max_length=50, unique=True)
+    value = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.key} = {self.value}"
@@ -0,0 +1,155 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import router
+
+from codeedex.lru import LRUCache
+
+from .models import Employee
+
+
+# =====================================================
+# EMPLOYEE REFERENCE CACHE
+# =====================================================
+# Every APK request starts by resolving an employee code (or the login
+# email) to an Employee. The few fields those views read are kept in a
+# process-wide LRU, optionally backed by the shared Django cache so a
+# fresh worker does not start cold.
+#
+# Refs are partial Employee instances: the REF_FIELDS are loaded, any
+# other field is fetched from the DB on first access. employees.signals
+# drops them on Employee save/delete. The password hash is never cached:
+# a worker's LRU would keep accepting the old one after a change made
+# in another process.
+
+REF_FIELDS = (
+    "id",
+    "employee_id",
+    "email",
+    "name",
+    "role",
+    "department",
+    "employment_type",
+    "status",
+)
+
+SHARED_KEY = "employees:ref:v2:{}"
+
+
+def _config():
+    return settings.EMPLOYEE_REF_CACHE
+
+
+_local = None
+
+
+def _lru():
+    global _local
+    if _local is None:
+        config = _config()
+        _local = LRUCache(config["SIZE"], config["LOCAL_TIMEOUT"])
+    return _local
+
+
+def _keys(code=None, email=None):
+    keys = []
+    if code:
+        keys.append(f"code:{code}")
+    if email:
+        keys.append(f"email:{email.lower()}")
+    return keys
+
+
+def _instance(values):
+    return partial(**dict(zip(REF_FIELDS, values)))
+
+
+def _lookup(key, **filters):
+    values = _lru().get(key)
+
+    if values is None and _config()["SHARED"]:
+        values = cache.get(SHARED_KEY.format(key))
+        if values is not None:
+            _lru().set(key, values)
+
+    if values is None:
+        values = (
+            Employee.objects
+            .filter(**filters)
+            .values_list(*REF_FIELDS)
+            .first()
+        )
+        if values is None:
+            return None
+        _remember(values)
+
+    return _instance(values)
+
+
+def _remember(values):
+    row = dict(zip(REF_FIELDS, values))
+    keys = _keys(row["employee_id"], row["email"])
+
+    for key in keys:
+        _lru().set(key, values)
+
+    if _config()["SHARED"]:
+        cache.set_many(
+            {SHARED_KEY.format(key): values for key in keys},
+            _config()["TIMEOUT"]
+        )
+
+
+# -----------------------------
+# PUBLIC API
+# -----------------------------
+def by_code(employee_code):
+    """Employee for an employee code, or None."""
+    if not employee_code:
+        return None
+    return _lookup(f"code:{employee_code}", employee_id=employee_code)
+
+
+def by_email(email):
+    """Employee for a login email (case-insensitive), or None."""
+    if not email:
+        return None
+    return _lookup(f"email:{email.lower()}", email__iexact=email)
+
+
+def forget(employee, codes=(), emails=()):
+    """
+    Drop cached refs of `employee`. `codes` / `emails` are extra keys to
+    drop, e.g. the values the employee was loaded with before a rename.
+    """
+    keys = _keys(employee.employee_id, employee.email)
+    for code in codes:
+        keys += _keys(code=code)
+    for email in emails:
+        keys += _keys(email=email)
+
+    pk = employee.pk
+    _lru().delete_where(lambda values: values[0] == pk)
+    for key in keys:
+        _lru().delete(key)
+
+    if _config()["SHARED"]:
+        cache.delete_many([SHARED_KEY.format(key) for key in keys])
+
+
+def partial(**fields):
+    """
+    Employee instance built from known field values without a query
+    (e.g. token claims). Fields not given load on first access.
+    """
+    # from_db expects the loaded fields in model field order
+    names = [f.attname for f in Employee._meta.concrete_fields if f.attname in fields]
+    return Employee.from_db(
+        router.db_for_read(Employee),
+        names,
+        [fields[name] for name in names]
+    )
+
+
+def clear():
+    """Empty this process's LRU (tests, management commands)."""
+    _lru().clear()
@@ -0,0 +1,87 @@
+import re
+
+from django.db import IntegrityError, connection, transaction
+
+from .models import IdSequence
+
+
+# =====================================================
+# ID SEQUENCE ALLOCATOR
+# =====================================================
+# Numbers come from a single atomic
+#     UPDATE ... SET value = value + n WHERE key = ... RETURNING value
+# so concurrent creates never read-then-write the same last row and
+# never wait on each other beyond that one-row update.
+
+def _table():
+    quote = connection.ops.quote_name
+    return quote(IdSequence._meta.db_table), quote("value"), quote("key")
+
+
+def _supports_returning():
+    return (
+        connection.vendor in ("postgresql", "sqlite")
+        and connection.features.can_return_columns_from_insert
+    )
+
+
+def _increment(key, count):
+    """Add `count` to the counter and return the new value (None = no row)."""
+    if _supports_returning():
+        table, value, key_column = _table()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {table} SET {value} = {value} + %s "
+                f"WHERE {key_column} = %s RETURNING {value}",
+                [count, key]
+            )
+            row = cursor.fetchone()
+        return row[0] if row else None
+
+    # Backends without UPDATE ... RETURNING → row lock for the same effect
+    with transaction.atomic():
+        sequence = IdSequence.objects.select_for_update().filter(key=key).first()
+        if sequence is None:
+            return None
+        sequence.value += count
+        sequence.save(update_fields=["value"])
+        return sequence.value
+
+
+def allocate(key, count=1, seed=None):
+    """
+    Reserve `count` consecutive numbers for `key` and return them as a
+    range. `seed` is called once, when the key has no counter yet, and
+    returns the highest number already in use (existing data).
+    """
+    if count < 1:
+        raise ValueError("count must be at least 1")
+
+    last = _increment(key, count)
+
+    if last is None:
+        start = seed() if seed else 0
+        try:
+            with transaction.atomic():
+                IdSequence.objects.create(key=key, value=start + count)
+            last = start + count
+        except IntegrityError:
+            # Another process created the counter first
+            last = _increment(key, count)
+
+    return range(last - count + 1, last + 1)
+
+
+def next_value(key, seed=None):
+    return allocate(key, 1, seed)[0]
+
+
+def max_suffix(queryset, field, prefix):
+    """Seed helper: highest trailing number among values starting with prefix."""
+    highest = 0
+    values = queryset.filter(**{f"{field}__startswith": prefix}).values_list(field, flat=True)
+    for value in values.iterator():
+        match = re.search(r"(\d+)$", value or "")
+        if match:
+            highest = max(highest, int(match.group(1)))
+    return highest
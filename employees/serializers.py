@@ -1,6 +1,8 @@
 import re
+from django.db.models import Count, Q
 from rest_framework import serializers
 
+from codeedex.serializers import SparseFieldsMixin
 from project.models import Project
 from .models import Employee
 
@@ -8,7 +10,7 @@ from .models import Employee
 # =====================================================
 # EMPLOYEE LIST SERIALIZER
 # =====================================================
-class EmployeeListSerializer(serializers.ModelSerializer):
+class EmployeeListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     profile_image_url = serializers.SerializerMethodField()
     id_proof_document_url = serializers.SerializerMethodField()
     offer_letter_url = serializers.SerializerMethodField()
@@ -60,6 +62,12 @@ class EmployeeListSerializer(serializers.ModelSerializer):
             'created_at',
             'updated_at',
         ]
+        # ?fields= / ?expand= (codeedex.serializers)
+        expandable_fields = ('profile_image_url', 'id_proof_document_url', 'offer_letter_url')
+        select_related_for = {
+            'reporting_manager': 'reporting_manager',
+            'reporting_manager_name': 'reporting_manager',
+        }
 
     def get_profile_image_url(self, obj):
         request = self.context.get("request")
@@ -90,6 +98,9 @@ class EmployeeListSerializer(serializers.ModelSerializer):
 # EMPLOYEE CREATE / UPDATE SERIALIZER
 # =====================================================
 class EmployeeCreateUpdateSerializer(serializers.ModelSerializer):
+    # Bulk import has no file uploads, documents are added afterwards
+    require_offer_letter = True
+
     password = serializers.CharField(write_only=True, required=False)
     reporting_manager = serializers.SlugRelatedField(
         queryset=Employee.objects.filter(
@@ -217,7 +228,7 @@ class EmployeeCreateUpdateSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError({
                     "payment_method": "Payment method is required for staff."
                 })
-            if not offer_letter:
+            if self.require_offer_letter and not offer_letter:
                 raise serializers.ValidationError({
                     "offer_letter": "Offer letter is required for staff."
                 })
@@ -247,7 +258,97 @@ class EmployeeCreateUpdateSerializer(serializers.ModelSerializer):
 # =====================================================
 # EMPLOYEE ALL LIST SERIALIZER
 # =====================================================
-class EmployeeAllListSerializer(serializers.ModelSerializer):
+PROJECT_FIELDS = ("assigned_projects", "completed_projects", "pending_projects")
+
+
+def load_employee_projects(employee_ids):
+    """
+    Batched loader: {employee pk: [project dict, ...]} for all employees
+    in two queries, whatever the headcount.
+
+    Each project's status is derived once with an aggregated query:
+    - no phases                          → pending
+    - every phase has tasks, all done    → completed
+    - anything else                      → ongoing
+    """
+    membership = (
+        Project.team_members.through.objects
+        .filter(employee_id__in=employee_ids)
+        .values_list("employee_id", "project_id")
+    )
+
+    members_by_project = {}
+    for employee_id, project_id in membership:
+        members_by_project.setdefault(project_id, []).append(employee_id)
+
+    projects = (
+        Project.objects
+        .filter(id__in=members_by_project.keys())
+        .annotate(
+            phase_count=Count("phases", distinct=True),
+            task_count=Count("phases__tasks", distinct=True),
+            completed_count=Count(
+                "phases__tasks",
+                filter=Q(phases__tasks__status="completed"),
+                distinct=True
+            ),
+            empty_phase_count=Count(
+                "phases",
+                filter=Q(phases__tasks__isnull=True),
+                distinct=True
+            ),
+        )
+        .values(
+            "id",
+            "project_id",
+            "project_name",
+            "start_date",
+            "end_date",
+            "phase_count",
+            "task_count",
+            "completed_count",
+            "empty_phase_count",
+        )
+        .order_by("id")
+    )
+
+    result = {employee_id: [] for employee_id in employee_ids}
+    for p in projects:
+        if not p["phase_count"]:
+            status = "pending"
+        elif not p["empty_phase_count"] and p["completed_count"] == p["task_count"]:
+            status = "completed"
+        else:
+            status = "ongoing"
+
+        project = {
+            "project_id": p["project_id"],
+            "project_name": p["project_name"],
+            "status": status,
+            "start_date": p["start_date"],
+            "end_date": p["end_date"],
+        }
+        for employee_id in members_by_project[p["id"]]:
+            result[employee_id].append(project)
+
+    return result
+
+
+class EmployeeAllListListSerializer(serializers.ListSerializer):
+    # Loads every employee's projects once for the whole page
+    def to_representation(self, data):
+        employees = list(data.all() if hasattr(data, "all") else data)
+
+        # Skipped when the flag or ?fields= / ?expand= drop the project fields
+        if any(name in self.child.fields for name in PROJECT_FIELDS):
+            self.child._projects = load_employee_projects(
+                [employee.pk for employee in employees]
+            )
+
+        return super().to_representation(employees)
+
+
+class EmployeeAllListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     salary = serializers.SerializerMethodField()
     offer_letter_url = serializers.SerializerMethodField()
 
@@ -258,6 +359,8 @@ class EmployeeAllListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Employee
         fields = "__all__"
+        list_serializer_class = EmployeeAllListListSerializer
+        expandable_fields = PROJECT_FIELDS + ('offer_letter_url',)
 
     def get_salary(self, obj):
         return obj.salary if obj.employment_type == "staff" else None
@@ -268,57 +371,45 @@ class EmployeeAllListSerializer(serializers.ModelSerializer):
         request = self.context.get("request")
         return request.build_absolute_uri(obj.offer_letter.url) if request else obj.offer_letter.url
 
-    # 🔥 REMOVE PROJECT DATA WHEN FLAG IS SET
-    def to_representation(self, instance):
-        data = super().to_representation(instance)
+    # 🔥 REMOVE PROJECT DATA WHEN FLAG IS SET (never computed)
+    def get_fields(self):
+        fields = super().get_fields()
 
         if self.context.get("exclude_projects"):
-            data.pop("assigned_projects", None)
-            data.pop("completed_projects", None)
-            data.pop("pending_projects", None)
+            for name in PROJECT_FIELDS:
+                fields.pop(name, None)
 
-        return data
+        return fields
 
-    # -------- PROJECT STATUS --------
-    def _project_status(self, project):
-        tasks = project.phases.all().values_list("tasks__status", flat=True)
-        if not tasks:
-            return "pending"
-        if all(status == "completed" for status in tasks):
-            return "completed"
-        return "ongoing"
+    # -------- PROJECTS (batched) --------
+    def _employee_projects(self, obj):
+        projects = getattr(self, "_projects", None)
+        if projects is None or obj.pk not in projects:
+            # Single instance → load just this employee
+            projects = load_employee_projects([obj.pk])
+        return projects[obj.pk]
 
     def get_assigned_projects(self, obj):
-        projects = Project.objects.filter(team_members=obj).prefetch_related("phases")
-        return [
-            {
-                "project_id": p.project_id,
-                "project_name": p.project_name,
-                "status": self._project_status(p),
-                "start_date": p.start_date,
-                "end_date": p.end_date,
-            }
-            for p in projects
-        ]
+        return self._employee_projects(obj)
 
     def get_completed_projects(self, obj):
         return [
             {
-                "project_id": p.project_id,
-                "project_name": p.project_name,
+                "project_id": p["project_id"],
+                "project_name": p["project_name"],
             }
-            for p in Project.objects.filter(team_members=obj).prefetch_related("phases")
-            if self._project_status(p) == "completed"
+            for p in self._employee_projects(obj)
+            if p["status"] == "completed"
         ]
 
     def get_pending_projects(self, obj):
         return [
             {
-                "project_id": p.project_id,
-                "project_name": p.project_name,
+                "project_id": p["project_id"],
+                "project_name": p["project_name"],
             }
-            for p in Project.objects.filter(team_members=obj).prefetch_related("phases")
-            if self._project_status(p) != "completed"
+            for p in self._employee_projects(obj)
+            if p["status"] != "completed"
         ]
 
 
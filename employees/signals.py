@@ -0,0 +1,23 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import refs
+from .models import Employee
+
+
+# =====================================================
+# EMPLOYEE REF CACHE INVALIDATION
+# =====================================================
+
+@receiver(post_save, sender=Employee)
+@receiver(post_delete, sender=Employee)
+def forget_employee_ref(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+
+    code, email = getattr(instance, "_loaded_keys", (None, None))
+    refs.forget(
+        instance,
+        codes=[code] if code else (),
+        emails=[email] if email else ()
+    )
@@ -1,3 +1,229 @@
-from django.test import TestCase
+from datetime import date
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from project.models import Project
+
+from .hashing import HashingBusy, PasswordHashingService, hash_passwords
+from .importer import import_employees
+from .models import Employee, IdSequence
+from .sequences import allocate
+
+
+# =====================================================
+# PASSWORD HASHING SERVICE
+# =====================================================
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class PasswordHashingServiceTests(SimpleTestCase):
+
+    def service(self, **kwargs):
+        options = {"workers": 0, "max_pending": 4, "queue_timeout": 0.01, "timeout": 5}
+        return PasswordHashingService(**{**options, **kwargs})
+
+    def test_batch_keeps_order_and_blanks(self):
+        service = self.service()
+        passwords = [f"secret-{n}" if n % 7 else None for n in range(100)]
+
+        with mock.patch("employees.hashing.get_hashing_service", return_value=service):
+            hashed = hash_passwords(passwords)
+
+        for password, encoded in zip(passwords, hashed):
+            if password is None:
+                self.assertIsNone(encoded)
+            else:
+                self.assertTrue(check_password(password, encoded))
+        self.assertEqual(service.metrics.snapshot()["calls"], 3)  # chunks of 32
+
+    def test_full_queue_is_busy(self):
+        service = self.service(max_pending=1)
+        service._slots.acquire()  # a call in flight
+
+        with self.assertRaises(HashingBusy):
+            service.hash("secret")
+        self.assertEqual(service.metrics.snapshot()["rejected"], 1)
+
+
+# =====================================================
+# HashingBusy → 503
+# =====================================================
+
+@override_settings(PASSWORD_HASHING={**settings.PASSWORD_HASHING, "WORKERS": 0})
+class HashingBusyResponseTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def assertBusy(self, response):
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], str(settings.PASSWORD_HASHING["RETRY_AFTER"]))
+
+    @mock.patch("employees.models.hash_password", side_effect=HashingBusy)
+    def test_register(self, _):
+        self.assertBusy(self.client.post("/employee/emp/", {
+            "name": "Busy Intern",
+            "email": "busy.intern@gmail.com",
+            "phone": "9876543210",
+            "department": "python",
+            "employment_type": "intern",
+            "joining_date": "2024-01-01",
+            "address": "-",
+            "password": "123456",
+        }, format="multipart"))
+
+    @mock.patch("employees.importer.hash_passwords", side_effect=HashingBusy)
+    def test_import(self, _):
+        self.assertBusy(self.client.post("/employee/emp/bulk-import/", {"employees": [{
+            "name": "Busy Intern",
+            "email": "busy.intern@gmail.com",
+            "phone": "9876543210",
+            "department": "python",
+            "employment_type": "intern",
+            "joining_date": "2024-01-01",
+            "address": "-",
+            "password": "123456",
+        }]}, format="json"))
+
+
+# =====================================================
+# BULK IMPORT ROW TYPES
+# =====================================================
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    PASSWORD_HASHING={**settings.PASSWORD_HASHING, "WORKERS": 0},
+)
+class EmployeeImportRowTypeTests(TestCase):
+
+    row = {
+        "name": "Row Intern",
+        "email": "row.intern@gmail.com",
+        "phone": "9876543210",
+        "department": "python",
+        "employment_type": "intern",
+        "joining_date": "2024-01-01",
+        "address": "-",
+        "password": "123456",
+    }
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def test_non_object_rows_are_row_errors(self):
+        response = self.client.post("/employee/emp/bulk-import/", {
+            "employees": [self.row, "someone@gmail.com", 42, ["a", "b"], None]
+        }, format="json")
+
+        self.assertEqual(response.status_code, 201)
+        data = response.json()["data"]
+        self.assertEqual(data["created"], 1)
+        self.assertEqual([error["row"] for error in data["errors"]], [2, 3, 4, 5])
+        self.assertIn("non_field_errors", data["errors"][0]["errors"])
+
+    def test_non_object_jsonl_line(self):
+        upload = SimpleUploadedFile("staff.jsonl", b'"just a string"\n[1, 2]\n')
+        response = self.client.post("/employee/emp/bulk-import/", {"file": upload}, format="multipart")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([error["row"] for error in response.json()["data"]["errors"]], [1, 2])
+
+
+# =====================================================
+# BULK IMPORT: DEFAULT TYPE AND CONCURRENT IMPORTS
+# =====================================================
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"],
+    PASSWORD_HASHING={**settings.PASSWORD_HASHING, "WORKERS": 0},
+)
+class EmployeeImportInsertTests(TestCase):
+
+    row = EmployeeImportRowTypeTests.row
+
+    def test_row_without_type_gets_the_staff_rules(self):
+        row = {key: value for key, value in self.row.items() if key != "employment_type"}
+        report = import_employees([row])
+
+        self.assertEqual(report["created"], 0)
+        self.assertIn("position", report["errors"][0]["errors"])
+        self.assertFalse(Employee.objects.filter(email=row["email"]).exists())
+
+    def test_email_taken_by_a_concurrent_import(self):
+        other = {**self.row, "email": "other.intern@gmail.com"}
+
+        calls = []
+
+        def concurrent_import(passwords):
+            # The other import commits between our preload and insert
+            if not calls:
+                Employee.objects.create(**{**self.row, "password": "x"})
+            calls.append(passwords)
+            return [make_password(password) for password in passwords]
+
+        with mock.patch("employees.importer.hash_passwords", side_effect=concurrent_import):
+            report = import_employees([self.row, other])
+
+        self.assertEqual(report["created"], 1)
+        self.assertEqual(report["employees"][0]["email"], other["email"])
+        self.assertEqual(report["errors"], [{"row": 1, "errors": {
+            "email": ["An employee with this email already exists."]
+        }}])
+
+
+# =====================================================
+# ID SEQUENCES
+# =====================================================
+
+class IdSequenceTests(TestCase):
+
+    def make_intern(self, employee_id=""):
+        return Employee.objects.create(
+            name="Seq Intern",
+            email=f"seq.{employee_id.lower() or 'auto'}@gmail.com",
+            phone="9876543210",
+            department="python",
+            employment_type="intern",
+            joining_date=date(2024, 1, 1),
+            address="-",
+            employee_id=employee_id,
+        )
+
+    def test_seeded_from_existing_ids(self):
+        # Rows from before the counter existed
+        self.make_intern("INT041")
+        self.make_intern("INT007")
+
+        self.assertEqual(Employee.generate_ids("intern"), ["INT042"])
+        self.assertEqual(self.make_intern().employee_id, "INT043")
+
+    def test_block_allocation(self):
+        self.assertEqual(Employee.generate_ids("staff", 3), ["EMP001", "EMP002", "EMP003"])
+        self.assertEqual(Employee.generate_ids("staff", 2), ["EMP004", "EMP005"])
+        self.assertEqual(IdSequence.objects.get(key="EMP").value, 5)
+
+        with self.assertRaises(ValueError):
+            allocate("EMP", 0)
+
+    def test_first_allocation_race(self):
+        def seed():
+            # Another process creates the counter between our UPDATE and INSERT
+            IdSequence.objects.create(key="RACE", value=5)
+            return 0
+
+        self.assertEqual(list(allocate("RACE", 2, seed=seed)), [6, 7])
+        self.assertEqual(IdSequence.objects.get(key="RACE").value, 7)
+
+    def test_project_ids(self):
+        prefix = f"PRJ-{timezone.now().year}-"
+        Project.objects.bulk_create([Project(project_name="old", project_type="web", project_id=f"{prefix}0009")])
+
+        first = Project.objects.create(project_name="first", project_type="web")
+        second = Project.objects.create(project_name="second", project_type="web")
+
+        self.assertEqual([first.project_id, second.project_id], [f"{prefix}0010", f"{prefix}0011"])
@@ -1,5 +1,5 @@
 from django.urls import path
-from .views import EmployeeAndInternAllListAPIView, EmployeeFullDetailAPIView, EmployeeOnlyListView, EmployeeViewSet, InternOnlyListView, ManagerListAPIView
+from .views import EmployeeAndInternAllListAPIView, EmployeeBulkImportView, EmployeeFullDetailAPIView, EmployeeOnlyListView, EmployeeViewSet, InternOnlyListView, ManagerListAPIView
 
 employee_create = EmployeeViewSet.as_view({
     'post': 'create',
@@ -10,6 +10,7 @@ employee_delete = EmployeeViewSet.as_view({'delete': 'destroy',})
 
 urlpatterns = [
     path('emp/', employee_create, name='employee-create'),
+    path('emp/bulk-import/', EmployeeBulkImportView.as_view(), name='employee-bulk-import'),
     path('emp-edit/<str:employee_id>/',employee_edit,name='emp_edit'),
     path('emp-delete/<str:employee_id>/',employee_delete,name='emp_delete'),
     path("employees-interns/all/",EmployeeAndInternAllListAPIView.as_view(),name="employee-intern-all-list"),
@@ -1,3 +1,4 @@
+from django.conf import settings
 from rest_framework.response import Response
 
 def api_response(success, message, data=None, status_code=200):
@@ -6,3 +7,10 @@ def api_response(success, message, data=None, status_code=200):
         "message": message,
         "data": data
     }, status=status_code)
+
+
+def hashing_busy_response():
+    """Password hashing queue full (employees.hashing.HashingBusy) → 503."""
+    response = api_response(False, "Server busy, please try again", None, 503)
+    response["Retry-After"] = str(settings.PASSWORD_HASHING["RETRY_AFTER"])
+    return response
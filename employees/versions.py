@@ -0,0 +1,33 @@
+from django.db.models import F, OuterRef
+
+from codeedex.conditional import count_of, latest, max_of
+from project.models import Project
+
+from .models import Employee
+
+
+# =====================================================
+# EMPLOYEE VERSION VECTOR (ETag / Last-Modified)
+# =====================================================
+# Employee detail shows the employee, their reporting manager's name and
+# their project cards. Team changes bump Project.updated_at; the project
+# count catches removals.
+
+def employee_version(request, employee_id, **kwargs):
+    row = (
+        Employee.objects
+        .filter(employee_id=employee_id)
+        .annotate(
+            manager_at=F("reporting_manager__updated_at"),
+            projects_at=max_of(Project.objects.filter(team_members=OuterRef("pk"))),
+            project_count=count_of(Project.objects.filter(team_members=OuterRef("pk"))),
+        )
+        .values_list("updated_at", "manager_at", "projects_at", "project_count")
+        .first()
+    )
+
+    if row is None:
+        return None
+
+    updated_at, manager_at, projects_at, _ = row
+    return row, latest(updated_at, manager_at, projects_at)
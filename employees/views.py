@@ -5,10 +5,15 @@ from rest_framework.views import APIView
 from rest_framework.permissions import AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import generics
-from rest_framework.parsers import MultiPartParser, FormParser
+from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
 from rest_framework.generics import ListAPIView
 from project.models import PhaseTask, Project
+from codeedex.conditional import conditional
+from codeedex.db_routers import replica_reads
+from codeedex.pagination import KeysetPagination
 
+from .hashing import HashingBusy
+from .importer import detect_file_type, import_employees, read_rows
 from .models import Employee
 from .serializers import (
     EmployeeAllListSerializer,
@@ -16,7 +21,8 @@ from .serializers import (
     EmployeeCreateUpdateSerializer,
     ManagerListSerializer,
 )
-from .utils import api_response
+from .utils import api_response, hashing_busy_response
+from .versions import employee_version
 
 
 class EmployeeViewSet(viewsets.ModelViewSet):
@@ -24,19 +30,26 @@ class EmployeeViewSet(viewsets.ModelViewSet):
     parser_classes = (MultiPartParser, FormParser)
     lookup_field = "employee_id"
     lookup_url_kwarg = "employee_id"
+    pagination_class = KeysetPagination
+    cursor_ordering = ("-created_at", "id")
 
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
 
     filterset_fields = ['status', 'department', 'employment_type', 'role', 'position', 'gender']
     search_fields = ['name', 'email', 'employee_id', 'phone']
-    ordering_fields = ['created_at', 'joining_date', 'name']
-    ordering = ['-created_at']
 
     def get_serializer_class(self):
         if self.action in ['list', 'retrieve']:
             return EmployeeListSerializer
         return EmployeeCreateUpdateSerializer
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ['list', 'retrieve']:
+            # Join only what ?fields= / ?expand= render
+            queryset = EmployeeListSerializer.setup_queryset(queryset, self.request)
+        return queryset
+
 
     # ▶ CREATE
     def create(self, request, *args, **kwargs):
@@ -45,7 +58,10 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             context={'request': request}
         )
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        try:
+            self.perform_create(serializer)
+        except HashingBusy:
+            return hashing_busy_response()
 
         read_serializer = EmployeeListSerializer(
             serializer.instance,
@@ -69,7 +85,10 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             context={'request': request}
         )
         serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
+        try:
+            self.perform_update(serializer)
+        except HashingBusy:
+            return hashing_busy_response()
 
         read_serializer = EmployeeListSerializer(
             serializer.instance,
@@ -96,14 +115,15 @@ class EmployeeViewSet(viewsets.ModelViewSet):
         )
 
 
-    # ▶ LIST with message
+    # ▶ LIST with message (cursor paginated)
     def list(self, request, *args, **kwargs):
-        response = super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
 
-        return api_response(
-            success=True,
-            message="Employee list fetched successfully",
-            data=response.data
+        return self.paginator.get_paginated_response(
+            serializer.data,
+            message="Employee list fetched successfully"
         )
 
 
@@ -117,6 +137,7 @@ class EmployeeViewSet(viewsets.ModelViewSet):
             data=response.data
         )
     
+@replica_reads
 class EmployeeAndInternAllListAPIView(ListAPIView):
     serializer_class = EmployeeAllListSerializer
     permission_classes = [AllowAny]
@@ -145,46 +166,53 @@ class EmployeeAndInternAllListAPIView(ListAPIView):
 
 
 # STAFF ONLY LIST
+@replica_reads
 class EmployeeOnlyListView(generics.ListAPIView):
     serializer_class = EmployeeListSerializer
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("-created_at", "id")
 
     def get_queryset(self):
-        return Employee.objects.filter(employment_type="staff").order_by('-created_at')
+        queryset = Employee.objects.filter(employment_type="staff").order_by('-created_at')
+        return EmployeeListSerializer.setup_queryset(queryset, self.request)
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.serializer_class(queryset, many=True, context={"request": request})
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.serializer_class(page, many=True, context={"request": request})
 
-        return api_response(
-            success=True,
-            message="Staff employees fetched successfully",
-            data=serializer.data
+        return self.paginator.get_paginated_response(
+            serializer.data,
+            message="Staff employees fetched successfully"
         )
 
 
 # ✅ INTERN ONLY FULL LIST
+@replica_reads
 class InternOnlyListView(generics.ListAPIView):
     serializer_class = EmployeeListSerializer
     permission_classes = [AllowAny]
+    pagination_class = KeysetPagination
+    cursor_ordering = ("-created_at", "id")
 
     def get_queryset(self):
-        return Employee.objects.filter(employment_type="intern").order_by('-created_at')
+        queryset = Employee.objects.filter(employment_type="intern").order_by('-created_at')
+        return EmployeeListSerializer.setup_queryset(queryset, self.request)
 
     def list(self, request, *args, **kwargs):
-        queryset = self.get_queryset()
-        serializer = self.serializer_class(queryset, many=True, context={"request": request})
+        page = self.paginate_queryset(self.get_queryset())
+        serializer = self.serializer_class(page, many=True, context={"request": request})
 
-        return api_response(
-            success=True,
-            message="Intern employees fetched successfully",
-            data=serializer.data
+        return self.paginator.get_paginated_response(
+            serializer.data,
+            message="Intern employees fetched successfully"
         )
 
 
 class EmployeeFullDetailAPIView(APIView):
     permission_classes = [AllowAny]
 
+    @conditional(employee_version)
     def get(self, request, employee_id):
         employee = get_object_or_404(Employee, employee_id=employee_id)
 
@@ -231,6 +259,7 @@ class EmployeeFullDetailAPIView(APIView):
             }
         )
 
+@replica_reads
 class ManagerListAPIView(ListAPIView):
     serializer_class = ManagerListSerializer
     permission_classes = [AllowAny]
@@ -253,4 +282,50 @@ class ManagerListAPIView(ListAPIView):
             message="Manager list fetched successfully",
             data=serializer.data
         )
-    
\ No newline at end of file
+
+
+# =====================================================
+# BULK IMPORT (CSV / JSONL / JSON)
+# =====================================================
+class EmployeeBulkImportView(APIView):
+    permission_classes = [AllowAny]
+    parser_classes = (MultiPartParser, FormParser, JSONParser)
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+
+        try:
+            if upload:
+                file_type = request.data.get("file_type") or detect_file_type(upload.name)
+                rows = read_rows(upload.file, file_type)
+            else:
+                rows = request.data.get("employees")
+                if not isinstance(rows, list):
+                    return api_response(
+                        False,
+                        "Upload a CSV/JSONL `file` or send an `employees` list",
+                        None,
+                        status.HTTP_400_BAD_REQUEST
+                    )
+        except (ValueError, UnicodeDecodeError) as exc:
+            return api_response(False, f"Could not read import file: {exc}", None, status.HTTP_400_BAD_REQUEST)
+
+        dry_run = str(request.data.get("dry_run", "")).lower() in ("1", "true", "yes")
+        try:
+            report = import_employees(rows, dry_run=dry_run)
+        except HashingBusy:
+            return hashing_busy_response()
+
+        if report["failed"] and not report["created"] and not dry_run:
+            return api_response(False, "No employees imported", report, status.HTTP_400_BAD_REQUEST)
+
+        return api_response(
+            success=not report["failed"],
+            message=(
+                f"{report['created']} employee(s) imported, {report['failed']} row(s) failed"
+                if not dry_run else
+                f"Dry run: {len(rows) - report['failed']} valid row(s), {report['failed']} row(s) failed"
+            ),
+            data=report,
+            status_code=status.HTTP_201_CREATED if report["created"] else status.HTTP_200_OK
+        )
@@ -0,0 +1,182 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db.models import Max
+from django.utils import timezone
+
+from codeedex.pagination import KeysetPagination
+
+from .models import PhaseTask, Project, ProjectPhase, Tombstone
+from .serializers import (
+    PhaseTaskChangeSerializer,
+    ProjectChangeSerializer,
+    ProjectPhaseChangeSerializer,
+)
+
+
+# =====================================================
+# PROJECT CHANGE FEED
+# =====================================================
+# Clients keep a sync token and ask for what changed since. The token
+# holds a (updated_at, id) watermark per model plus the last tombstone
+# seen, so each call reads one index range per model.
+#
+# Rows written in the last SETTLE_SECONDS are left for the next poll:
+# a transaction that commits late can carry an older updated_at than
+# rows already handed out.
+
+ORDERING = ("updated_at", "id")
+
+
+class InvalidToken(Exception):
+    pass
+
+
+class ExpiredToken(Exception):
+    pass
+
+
+FEEDS = (
+    (
+        "projects",
+        lambda: Project.objects
+        .select_related("project_manager")
+        .prefetch_related("team_members"),
+        ProjectChangeSerializer,
+    ),
+    (
+        "phases",
+        lambda: ProjectPhase.objects
+        .select_related("project")
+        .prefetch_related("assigned_to"),
+        ProjectPhaseChangeSerializer,
+    ),
+    (
+        "tasks",
+        lambda: PhaseTask.objects
+        .select_related("phase")
+        .prefetch_related("assigned_to"),
+        PhaseTaskChangeSerializer,
+    ),
+)
+
+
+def _config():
+    return settings.PROJECT_CHANGE_FEED
+
+
+# -----------------------------
+# TOKENS
+# -----------------------------
+def encode_token(state):
+    payload = json.dumps(state, separators=(",", ":"))
+    return urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _aware_datetime(value):
+    moment = datetime.fromisoformat(value)  # TypeError unless a string
+    if timezone.is_naive(moment):
+        raise ValueError("naive datetime")
+    return moment
+
+
+def _is_int(value):
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def decode_token(token):
+    """Token → state. Anything malformed is InvalidToken (→ 400)."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        state = json.loads(urlsafe_b64decode(padded.encode()).decode())
+        issued = _aware_datetime(state["at"])
+
+        for name, _, _ in FEEDS:
+            watermark = state[name]
+            if watermark is None:
+                continue
+            if not isinstance(watermark, list) or len(watermark) != len(ORDERING):
+                raise ValueError("bad watermark")
+            _aware_datetime(watermark[0])
+            if not _is_int(watermark[1]):
+                raise ValueError("bad watermark id")
+
+        if not _is_int(state["deleted"]):
+            raise ValueError("bad tombstone id")
+
+        # Tombstones that old may be pruned → deletes could be missed
+        expired = issued < timezone.now() - timedelta(days=_config()["TOMBSTONE_DAYS"])
+    except (TypeError, ValueError, KeyError, AttributeError):
+        raise InvalidToken()
+
+    if expired:
+        raise ExpiredToken()
+
+    return state
+
+
+def _initial_state(horizon):
+    # Full load: every live row, and no tombstone from before it
+    last_deleted = (
+        Tombstone.objects
+        .filter(deleted_at__lt=horizon)
+        .aggregate(last=Max("id"))["last"]
+    )
+    state = {name: None for name, _, _ in FEEDS}
+    state["deleted"] = last_deleted or 0
+    return state
+
+
+# -----------------------------
+# FEED
+# -----------------------------
+def changes_since(token, context):
+    """
+    Rows changed after `token` (None → everything) and the token for
+    the next call. `has_more` means call again right away.
+    """
+    horizon = timezone.now() - timedelta(seconds=_config()["SETTLE_SECONDS"])
+    limit = _config()["PAGE_SIZE"]
+
+    state = decode_token(token) if token else _initial_state(horizon)
+    data = {}
+    has_more = False
+
+    for name, queryset, serializer_class in FEEDS:
+        rows = queryset().filter(updated_at__lt=horizon)
+        if state[name] is not None:
+            rows = rows.filter(KeysetPagination._after(ORDERING, state[name]))
+
+        rows = list(rows.order_by(*ORDERING)[:limit + 1])
+        if len(rows) > limit:
+            has_more = True
+            rows = rows[:limit]
+
+        if rows:
+            last = rows[-1]
+            state[name] = [last.updated_at.isoformat(), last.id]
+
+        data[name] = serializer_class(rows, many=True, context=context).data
+
+    tombstones = list(
+        Tombstone.objects
+        .filter(id__gt=state["deleted"], deleted_at__lt=horizon)
+        .order_by("id")[:limit + 1]
+    )
+    if len(tombstones) > limit:
+        has_more = True
+        tombstones = tombstones[:limit]
+    if tombstones:
+        state["deleted"] = tombstones[-1].id
+
+    data["deleted"] = [
+        {"type": row.kind, "id": row.object_id, "key": row.object_key}
+        for row in tombstones
+    ]
+
+    state["at"] = timezone.now().isoformat()
+    data["next"] = encode_token(state)
+    data["has_more"] = has_more
+    return data
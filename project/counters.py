@@ -0,0 +1,101 @@
+from django.db.models import Case, CharField, Count, F, IntegerField, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Now
+from django.db.models.lookups import Exact
+
+from .models import PhaseTask, Project, ProjectPhase
+
+
+# =====================================================
+# TASK COUNTERS
+# =====================================================
+# Project and ProjectPhase carry denormalized total_tasks /
+# completed_tasks / computed_status columns so the dashboard reads them
+# directly instead of joining phases and tasks on every request.
+# project.signals keeps them in step with PhaseTask writes; the
+# `rebuild_project_counters` command recomputes them from scratch.
+# update() skips auto_now → every counter change sets updated_at itself,
+# so the change feed (project.changes) hands the row out again.
+#
+# Task writes that bypass the model (QuerySet.update(), bulk_create(),
+# bulk_update()) must call rebuild_counters() for the projects involved,
+# as codeedex.synthetic does after its bulk inserts.
+
+def computed_status_expression(total=F("total_tasks"), completed=F("completed_tasks")):
+    return Case(
+        When(Exact(total, 0), then=Value("pending")),
+        When(Exact(total, completed), then=Value("completed")),
+        default=Value("ongoing"),
+        output_field=CharField(),
+    )
+
+
+def _delta_update(total_delta, completed_delta):
+    # Counters and status in one UPDATE; the status is computed from the
+    # new values because SET expressions all see the old row.
+    total = F("total_tasks") + total_delta
+    completed = F("completed_tasks") + completed_delta
+    return {
+        "total_tasks": total,
+        "completed_tasks": completed,
+        "computed_status": computed_status_expression(total, completed),
+        "updated_at": Now(),
+    }
+
+
+def apply_task_delta(phase_id, total_delta, completed_delta):
+    """Shift the counters of a phase and of its project."""
+    if not phase_id or (not total_delta and not completed_delta):
+        return
+
+    values = _delta_update(total_delta, completed_delta)
+
+    ProjectPhase.objects.filter(pk=phase_id).update(**values)
+    Project.objects.filter(phases=phase_id).update(**values)
+
+
+def rebuild_counters(projects=None):
+    """
+    Recompute every counter from the task table.
+    `projects` optionally limits the rebuild to a Project queryset.
+    """
+    phases = ProjectPhase.objects.all()
+    if projects is None:
+        projects = Project.objects.all()
+    else:
+        phases = phases.filter(project__in=projects)
+
+    def task_count(outer, completed=False):
+        tasks = PhaseTask.objects.filter(**{outer: OuterRef("pk")})
+        if completed:
+            tasks = tasks.filter(status="completed")
+        return Coalesce(
+            Subquery(
+                tasks.order_by().values(outer).annotate(n=Count("id")).values("n"),
+                output_field=IntegerField()
+            ),
+            0
+        )
+
+    def touch_changed(rows, outer):
+        # Only rows whose counters move are handed out again by the feed
+        rows.annotate(
+            new_total=task_count(outer),
+            new_completed=task_count(outer, completed=True),
+        ).exclude(
+            total_tasks=F("new_total"),
+            completed_tasks=F("new_completed"),
+        ).update(updated_at=Now())
+
+    touch_changed(phases, "phase")
+    phases.update(
+        total_tasks=task_count("phase"),
+        completed_tasks=task_count("phase", completed=True),
+    )
+    phases.update(computed_status=computed_status_expression())
+
+    touch_changed(projects, "phase__project")
+    projects.update(
+        total_tasks=task_count("phase__project"),
+        completed_tasks=task_count("phase__project", completed=True),
+    )
+    projects.update(computed_status=computed_status_expression())
@@ -0,0 +1,24 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from project.models import Tombstone
+
+
+class Command(BaseCommand):
+    help = "Delete change-feed tombstones older than PROJECT_CHANGE_FEED['TOMBSTONE_DAYS']"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=settings.PROJECT_CHANGE_FEED["TOMBSTONE_DAYS"],
+            help="Keep this many days of tombstones (sync tokens older than that must do a full reload)."
+        )
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(days=options["days"])
+        deleted, _ = Tombstone.objects.filter(deleted_at__lt=cutoff).delete()
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} tombstone(s)"))
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from project.counters import rebuild_counters
+from project.models import Project
+
+
+class Command(BaseCommand):
+    help = "Recompute total_tasks / completed_tasks / computed_status for projects and phases"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "project_ids",
+            nargs="*",
+            help="Only rebuild these projects (project_id codes). Default: all."
+        )
+
+    def handle(self, *args, **options):
+        projects = None
+        if options["project_ids"]:
+            projects = Project.objects.filter(project_id__in=options["project_ids"])
+
+        with transaction.atomic():
+            rebuild_counters(projects)
+
+        count = projects.count() if projects is not None else Project.objects.count()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt task counters for {count} project(s)"))
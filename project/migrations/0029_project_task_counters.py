@@ -0,0 +1,79 @@
+# Generated by Django 5.2.8 on 2026-10-18 06:10
+
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_task_counters(apps, schema_editor):
+    ProjectPhase = apps.get_model("project", "ProjectPhase")
+    PhaseTask = apps.get_model("project", "PhaseTask")
+    Project = apps.get_model("project", "Project")
+
+    def status(total, completed):
+        if not total:
+            return "pending"
+        return "completed" if total == completed else "ongoing"
+
+    project_totals = {}
+    rows = (
+        PhaseTask.objects
+        .values("phase_id", "phase__project_id")
+        .annotate(total=Count("id"), completed=Count("id", filter=Q(status="completed")))
+    )
+    for row in rows:
+        ProjectPhase.objects.filter(pk=row["phase_id"]).update(
+            total_tasks=row["total"],
+            completed_tasks=row["completed"],
+            computed_status=status(row["total"], row["completed"]),
+        )
+        totals = project_totals.setdefault(row["phase__project_id"], [0, 0])
+        totals[0] += row["total"]
+        totals[1] += row["completed"]
+
+    for project_id, (total, completed) in project_totals.items():
+        Project.objects.filter(pk=project_id).update(
+            total_tasks=total,
+            completed_tasks=completed,
+            computed_status=status(total, completed),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('project', '0028_project_project_created_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='project',
+            name='completed_tasks',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='computed_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('ongoing', 'Ongoing'), ('completed', 'Completed')], db_index=True, default='pending', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='project',
+            name='total_tasks',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='projectphase',
+            name='completed_tasks',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='projectphase',
+            name='computed_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('ongoing', 'Ongoing'), ('completed', 'Completed')], default='pending', editable=False, max_length=20),
+        ),
+        migrations.AddField(
+            model_name='projectphase',
+            name='total_tasks',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_task_counters, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,7 @@
 from decimal import Decimal
 from django.db import models
 from employees.models import Employee
+from employees.sequences import max_suffix, next_value
 from django.utils import timezone
 from django.db import transaction
 
@@ -32,6 +33,14 @@ class Project(models.Model):
     ('completed', 'Completed'),
     ]
 
+    # Derived from task counters: no tasks → pending,
+    # all tasks completed → completed, otherwise ongoing
+    COMPUTED_STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('ongoing', 'Ongoing'),
+        ('completed', 'Completed'),
+    ]
+
 
     project_id = models.CharField(
         max_length=20,
@@ -113,23 +122,39 @@ class Project(models.Model):
         default=Decimal("0.00")
     )
 
+    # =============================
+    # Task Counters (maintained by project.signals)
+    # =============================
+    total_tasks = models.PositiveIntegerField(default=0, editable=False)
+    completed_tasks = models.PositiveIntegerField(default=0, editable=False)
+    computed_status = models.CharField(
+        max_length=20,
+        choices=COMPUTED_STATUS_CHOICES,
+        default='pending',
+        editable=False,
+        db_index=True
+    )
+
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Cursor pagination order for the project list
+            models.Index(fields=["created_at", "id"], name="project_created_idx"),
+            # Change feed watermark (project.changes)
+            models.Index(fields=["updated_at", "id"], name="project_updated_idx"),
+        ]
 
     def save(self, *args, **kwargs):
-        # Auto-generate project_id
+        # Auto-generate project_id (atomic per-year sequence)
         if not self.project_id:
-            year = timezone.now().year
-            last_project = Project.objects.filter(
-                project_id__startswith=f"PRJ-{year}"
-            ).order_by('-id').first()
-
-            if last_project:
-                last_number = int(last_project.project_id.split('-')[-1])
-                new_number = last_number + 1
-            else:
-                new_number = 1
-
-            self.project_id = f"PRJ-{year}-{new_number:04d}"
+            prefix = f"PRJ-{timezone.now().year}-"
+            number = next_value(
+                prefix,
+                seed=lambda: max_suffix(Project.objects.all(), "project_id", prefix)
+            )
+            self.project_id = f"{prefix}{number:04d}"
 
         # Auto-calculate remaining budget
         self.remaining_amount = self.total_budget - self.spent_amount
@@ -185,6 +210,18 @@ class ProjectPhase(models.Model):
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
 
+    # Task counters (maintained by project.signals)
+    total_tasks = models.PositiveIntegerField(default=0, editable=False)
+    completed_tasks = models.PositiveIntegerField(default=0, editable=False)
+    computed_status = models.CharField(
+        max_length=20,
+        choices=Project.COMPUTED_STATUS_CHOICES,
+        default='pending',
+        editable=False
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
     class Meta:
         constraints = [
             models.UniqueConstraint(
@@ -192,13 +229,34 @@ class ProjectPhase(models.Model):
                 name="unique_phase_per_project"
             )
         ]
+        indexes = [
+            # Change feed watermark (project.changes)
+            models.Index(fields=["updated_at", "id"], name="phase_updated_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Project the task counters were added to (project.signals)
+        instance._counted_project = instance.__dict__.get("project_id")
+        return instance
 
     def save(self, *args, **kwargs):
         if not self.phase_id:
             phase_code = self.PHASE_CODES[self.phase_type]
             self.phase_id = f"{self.project.project_id}-{phase_code}"
 
-        super().save(*args, **kwargs)
+        # Phase row and counters (post_save) commit together
+        with transaction.atomic():
+            if not self._state.adding:
+                # Current project of the locked row, not the load-time one
+                self._counted_project = (
+                    ProjectPhase.objects.select_for_update()
+                    .filter(pk=self.pk)
+                    .values_list("project_id", flat=True)
+                    .first()
+                )
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return self.phase_id
@@ -247,31 +305,89 @@ class PhaseTask(models.Model):
     start_date = models.DateField(null=True, blank=True)
     end_date = models.DateField(null=True, blank=True)
 
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            # Change feed watermark (project.changes)
+            models.Index(fields=["updated_at", "id"], name="task_updated_idx"),
+        ]
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what the counters were built from
+        instance._counted_state = instance.counter_state()
+        return instance
+
+    def counter_state(self):
+        deferred = self.get_deferred_fields()
+        if "phase_id" in deferred or "status" in deferred:
+            return None
+        return (self.phase_id, self.status == "completed")
+
+    def locked_counter_state(self):
+        """
+        counter_state of the stored row, locked until commit. Concurrent
+        edits of the task wait here, so each diffs against the committed
+        state instead of its own load-time snapshot. None if deleted.
+        """
+        row = (
+            PhaseTask.objects.select_for_update()
+            .filter(pk=self.pk)
+            .values_list("phase_id", "status")
+            .first()
+        )
+        return None if row is None else (row[0], row[1] == "completed")
+
     def save(self, *args, **kwargs):
         # Auto-set project
         if self.phase and not self.project:
             self.project = self.phase.project
 
-        # Auto-generate task_id (transaction-safe)
+        # Auto-generate task_id (atomic per-year sequence, no row lock)
         if not self.task_id:
-            with transaction.atomic():
-                year = timezone.now().year
-                last_task = (
-                    PhaseTask.objects
-                    .select_for_update()
-                    .filter(task_id__startswith=f"TASK-{year}")
-                    .order_by("-id")
-                    .first()
-                )
+            prefix = f"TASK-{timezone.now().year}-"
+            number = next_value(
+                prefix,
+                seed=lambda: max_suffix(PhaseTask.objects.all(), "task_id", prefix)
+            )
+            self.task_id = f"{prefix}{number:04d}"
+
+        # Task row and counters (post_save) commit together
+        with transaction.atomic():
+            if not self._state.adding:
+                self._counted_state = self.locked_counter_state()
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            self._counted_state = self.locked_counter_state()
+            if self._counted_state is None:
+                # Deleted concurrently → already taken off the counters
+                self._uncounted = True
+            return super().delete(*args, **kwargs)
 
-                last_number = (
-                    int(last_task.task_id.split("-")[-1])
-                    if last_task else 0
-                )
+    def __str__(self):
+        return f"{self.title} ({self.task_id})"
 
-                self.task_id = f"TASK-{year}-{last_number + 1:04d}"
 
-        super().save(*args, **kwargs)
+# =====================================================
+# Tombstone (deleted rows, for the change feed)
+# =====================================================
+
+class Tombstone(models.Model):
+
+    KIND_CHOICES = [
+        ("project", "Project"),
+        ("phase", "Phase"),
+        ("task", "Task"),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.PositiveBigIntegerField()
+    object_key = models.CharField(max_length=50)  # project_id / phase_id / task_id
+    deleted_at = models.DateTimeField(auto_now_add=True, db_index=True)
 
     def __str__(self):
-        return f"{self.title} ({self.task_id})"
+        return f"{self.kind} {self.object_key}"
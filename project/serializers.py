@@ -1,6 +1,7 @@
 from decimal import Decimal
 import re
 
+from django.db.models import Prefetch
 from rest_framework import serializers
 
 from .models import (
@@ -9,6 +10,7 @@ from .models import (
     ProjectPhase,
 )
 
+from codeedex.serializers import SparseFieldsMixin
 from employees.models import Employee
 
 
@@ -35,11 +37,47 @@ class EmployeeBasicSerializer(serializers.ModelSerializer):
         return None
 
 
+# =====================================================
+# PREFETCH PLANS
+# =====================================================
+# Columns the nested serializers read, so prefetches skip the rest
+# (descriptions of people, budgets, files...).
+
+EMPLOYEE_BASIC_COLUMNS = ("id", "employee_id", "name", "department", "profile_image")
+
+TASK_COLUMNS = (
+    "id",
+    "task_id",
+    "phase_id",
+    "title",
+    "description",
+    "status",
+    "start_date",
+    "end_date",
+)
+
+
+def employee_basic_prefetch(lookup="assigned_to"):
+    """Employees rendered by EmployeeBasicSerializer, basic columns only."""
+    return Prefetch(
+        lookup,
+        queryset=Employee.objects.only(*EMPLOYEE_BASIC_COLUMNS)
+    )
+
+
+def phase_tasks_prefetch():
+    """Phase → tasks → assignees in two queries, whatever the task count."""
+    return (
+        Prefetch("tasks", queryset=PhaseTask.objects.only(*TASK_COLUMNS)),
+        employee_basic_prefetch("tasks__assigned_to"),
+    )
+
+
 # =====================================================
 # PROJECT SERIALIZERS
 # =====================================================
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     project_logo_url = serializers.SerializerMethodField()
 
     # ---------- READ ----------
@@ -117,6 +155,13 @@ class ProjectSerializer(serializers.ModelSerializer):
 
             'created_at',
         ]
+        # ?fields= / ?expand= (codeedex.serializers)
+        expandable_fields = ['team_members', 'project_logo_url']
+        select_related_for = {
+            'project_manager': 'project_manager',
+            'project_manager_name': 'project_manager',
+        }
+        prefetch_related_for = {'team_members': lambda: employee_basic_prefetch('team_members')}
 
     # -------------------------------------------------
     # FIELD VALIDATIONS
@@ -202,7 +247,7 @@ class ProjectSerializer(serializers.ModelSerializer):
         return instance
 
 
-class ProjectListSerializer(serializers.ModelSerializer):
+class ProjectListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     project_logo_url = serializers.SerializerMethodField()
 
     project_manager = serializers.CharField(
@@ -248,6 +293,13 @@ class ProjectListSerializer(serializers.ModelSerializer):
 
             'created_at',
         ]
+        # ?fields= / ?expand= (codeedex.serializers)
+        expandable_fields = ['team_members', 'project_logo_url']
+        select_related_for = {
+            'project_manager': 'project_manager',
+            'project_manager_name': 'project_manager',
+        }
+        prefetch_related_for = {'team_members': lambda: employee_basic_prefetch('team_members')}
 
     def get_project_logo_url(self, obj):
         request = self.context.get("request")
@@ -260,7 +312,7 @@ class ProjectListSerializer(serializers.ModelSerializer):
 # PHASE TASK SERIALIZER
 # =====================================================
 
-class PhaseTaskSerializer(serializers.ModelSerializer):
+class PhaseTaskSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     assigned_to = EmployeeBasicSerializer(many=True, read_only=True)
     phase_id = serializers.CharField(write_only=True)
 
@@ -285,6 +337,9 @@ class PhaseTaskSerializer(serializers.ModelSerializer):
             "assigned_to",
             "employee_ids",
         ]
+        # ?fields= / ?expand= (codeedex.serializers)
+        expandable_fields = ["assigned_to"]
+        prefetch_related_for = {"assigned_to": employee_basic_prefetch}
 
     def validate(self, attrs):
         phase_id = attrs.pop("phase_id", None)
@@ -341,7 +396,7 @@ class PhaseTaskSerializer(serializers.ModelSerializer):
 # PROJECT PHASE SERIALIZER
 # =====================================================
 
-class ProjectPhaseSerializer(serializers.ModelSerializer):
+class ProjectPhaseSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     tasks = PhaseTaskSerializer(many=True, read_only=True)
 
     project_id = serializers.SlugRelatedField(
@@ -384,6 +439,16 @@ class ProjectPhaseSerializer(serializers.ModelSerializer):
             "employee_ids",
             "tasks",
         ]
+        # ?fields= / ?expand= (codeedex.serializers)
+        expandable_fields = ["assigned_to", "tasks"]
+        select_related_for = {
+            "project": "project",
+            "project_name": "project",
+        }
+        prefetch_related_for = {
+            "assigned_to": employee_basic_prefetch,
+            "tasks": phase_tasks_prefetch,
+        }
 
     def create(self, validated_data):
         emp_codes = validated_data.pop("employee_ids", [])
@@ -428,3 +493,32 @@ class ProjectPhaseSerializer(serializers.ModelSerializer):
             instance.assigned_to.set(employees)
 
         return super().update(instance, validated_data)
+
+
+# =====================================================
+# CHANGE FEED SERIALIZERS
+# =====================================================
+# Flat rows for project.changes: tasks are sent on their own, so phases
+# do not nest them and tasks name their phase.
+
+class ProjectPhaseChangeSerializer(ProjectPhaseSerializer):
+    tasks = None
+
+    class Meta(ProjectPhaseSerializer.Meta):
+        fields = [
+            field for field in ProjectPhaseSerializer.Meta.fields
+            if field != "tasks"
+        ] + ["updated_at"]
+
+
+class PhaseTaskChangeSerializer(PhaseTaskSerializer):
+    phase = serializers.CharField(source="phase.phase_id", read_only=True)
+
+    class Meta(PhaseTaskSerializer.Meta):
+        fields = PhaseTaskSerializer.Meta.fields + ["phase", "updated_at"]
+
+
+class ProjectChangeSerializer(ProjectListSerializer):
+
+    class Meta(ProjectListSerializer.Meta):
+        fields = ProjectListSerializer.Meta.fields + ["updated_at"]
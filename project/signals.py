@@ -0,0 +1,122 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .counters import apply_task_delta, rebuild_counters
+from .models import PhaseTask, Project, ProjectPhase, Tombstone
+
+
+# =====================================================
+# TASK COUNTER MAINTENANCE
+# =====================================================
+# PhaseTask.save wraps the write in a transaction and Django runs
+# post_delete inside the delete transaction, so counters always commit
+# (or roll back) together with the task row. save() / delete() diff
+# against the locked row (PhaseTask.locked_counter_state), so concurrent
+# edits of one task apply their deltas one after the other.
+#
+# QuerySet.update(), bulk_create() and bulk_update() send no signals:
+# callers rebuild the counters of the projects they touched (see
+# project.counters).
+
+def _resync(phase_id):
+    # Task was loaded with deferred fields → cannot diff, recount its project
+    rebuild_counters(Project.objects.filter(phases=phase_id))
+
+
+@receiver(post_save, sender=PhaseTask)
+def count_saved_task(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+
+    state = instance.counter_state()
+    previous = None if created else getattr(instance, "_counted_state", None)
+
+    if state is None or (not created and previous is None):
+        _resync(instance.phase_id)
+    elif created:
+        phase_id, completed = state
+        apply_task_delta(phase_id, 1, int(completed))
+    elif previous != state:
+        old_phase, old_completed = previous
+        new_phase, new_completed = state
+
+        if old_phase == new_phase:
+            apply_task_delta(new_phase, 0, int(new_completed) - int(old_completed))
+        else:
+            apply_task_delta(old_phase, -1, -int(old_completed))
+            apply_task_delta(new_phase, 1, int(new_completed))
+
+    instance._counted_state = state
+
+
+@receiver(post_delete, sender=PhaseTask)
+def count_deleted_task(sender, instance, **kwargs):
+    if getattr(instance, "_uncounted", False):
+        return
+
+    state = getattr(instance, "_counted_state", None) or instance.counter_state()
+
+    if state is None:
+        _resync(instance.phase_id)
+        return
+
+    phase_id, completed = state
+    apply_task_delta(phase_id, -1, -int(completed))
+
+
+@receiver(post_save, sender=ProjectPhase)
+def count_moved_phase(sender, instance, created, raw=False, **kwargs):
+    # Phase moved to another project → both projects recount
+    old_project = getattr(instance, "_counted_project", None)
+    if not raw and not created and old_project != instance.project_id:
+        rebuild_counters(Project.objects.filter(pk__in=[old_project, instance.project_id]))
+
+    instance._counted_project = instance.project_id
+
+
+# =====================================================
+# CHANGE FEED (project.changes)
+# =====================================================
+# Deletes leave a tombstone; m2m edits do not touch the row, so they
+# bump updated_at explicitly.
+
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=ProjectPhase)
+@receiver(post_delete, sender=PhaseTask)
+def record_tombstone(sender, instance, **kwargs):
+    kind, key = {
+        Project: ("project", "project_id"),
+        ProjectPhase: ("phase", "phase_id"),
+        PhaseTask: ("task", "task_id"),
+    }[sender]
+
+    Tombstone.objects.create(
+        kind=kind,
+        object_id=instance.pk,
+        object_key=getattr(instance, key) or ""
+    )
+
+
+@receiver(m2m_changed, sender=Project.team_members.through)
+@receiver(m2m_changed, sender=ProjectPhase.assigned_to.through)
+@receiver(m2m_changed, sender=PhaseTask.assigned_to.through)
+def touch_on_assignment(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if reverse:
+        # Changed from the Employee side → `model` rows are the ones to bump
+        field = next(
+            f.name for f in model._meta.many_to_many
+            if f.remote_field.through is sender
+        )
+        if action in ("post_add", "post_remove"):
+            rows = model.objects.filter(pk__in=pk_set)
+        elif action == "pre_clear":
+            rows = model.objects.filter(**{field: instance})
+        else:
+            return
+    elif action in ("post_add", "post_remove", "post_clear"):
+        rows = type(instance).objects.filter(pk=instance.pk)
+    else:
+        return
+
+    rows.update(updated_at=timezone.now())
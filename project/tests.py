@@ -1,3 +1,293 @@
-from django.test import TestCase
+import time
+from datetime import date, datetime
+from io import StringIO
 
-# Create your tests here.
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+
+from employees.models import Employee
+
+from .changes import decode_token, encode_token
+from .models import PhaseTask, Project, ProjectPhase
+
+
+def make_employee(n):
+    # Interns skip the staff-only required fields and need no password
+    return Employee.objects.create(
+        name=f"Intern {n}",
+        email=f"intern{n}@gmail.com",
+        phone="9999999999",
+        department="python",
+        address="-",
+        joining_date=date(2024, 1, 1),
+        employment_type="intern",
+    )
+
+
+def make_project(name, phase_types, tasks_per_phase, people):
+    project = Project.objects.create(project_name=name, project_type="web")
+    project.team_members.set(people)
+
+    for phase_type in phase_types:
+        phase = ProjectPhase.objects.create(project=project, phase_type=phase_type)
+        phase.assigned_to.set(people)
+
+        for n in range(tasks_per_phase):
+            task = PhaseTask.objects.create(phase=phase, title=f"{phase_type} {n}")
+            task.assigned_to.set(people[:1])
+
+    return project
+
+
+# =====================================================
+# PHASE LIST QUERY PLAN
+# =====================================================
+
+class ProjectPhaseListQueryTests(TestCase):
+    # phases + project (join), phase assignees, tasks, task assignees
+    LIST_QUERIES = 4
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.people = [make_employee(n) for n in range(3)]
+        cls.small = make_project("small", ["planning"], 1, cls.people)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def grow(self):
+        make_project(
+            "large",
+            ["planning", "design", "development", "testing"],
+            5,
+            self.people
+        )
+
+    def test_all_phases_query_count_is_constant(self):
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get("/project/phases/list/")
+        self.assertEqual(len(response.json()["data"]), 1)
+
+        self.grow()
+
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get("/project/phases/list/")
+
+        phases = response.json()["data"]
+        self.assertEqual(len(phases), 5)
+        self.assertEqual(sum(len(phase["tasks"]) for phase in phases), 21)
+
+    def test_project_phases_query_count_is_constant(self):
+        self.grow()
+        project = Project.objects.get(project_name="large")
+
+        # + the project lookup for the path param
+        with self.assertNumQueries(self.LIST_QUERIES + 1):
+            response = self.client.get(f"/project/projects/phases/{project.project_id}/")
+
+        phases = response.json()["data"]
+        self.assertEqual(len(phases), 4)
+
+        task = phases[0]["tasks"][0]
+        self.assertEqual(phases[0]["project_name"], "large")
+        self.assertEqual(len(phases[0]["assigned_to"]), 3)
+        self.assertEqual(task["assigned_to"][0]["employee_id"], self.people[0].employee_id)
+
+    def test_sparse_fields_skip_prefetches(self):
+        self.grow()
+
+        with self.assertNumQueries(1):
+            response = self.client.get("/project/phases/list/", {"fields": "phase_id,project_name"})
+
+        self.assertEqual(set(response.json()["data"][0]), {"phase_id", "project_name"})
+
+
+# =====================================================
+# PROJECT FULL DETAIL QUERY BUDGET
+# =====================================================
+
+class ProjectFullDetailQueryTests(TestCase):
+    # ETag version, project + manager, team, phases, tasks, task assignees
+    DETAIL_QUERIES = 6
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.people = [make_employee(n) for n in range(3)]
+        cls.project = make_project("tree", ["planning"], 2, cls.people)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = f"/project/projects/full/{self.project.project_id}/"
+
+    def test_query_budget_is_constant(self):
+        with self.assertNumQueries(self.DETAIL_QUERIES):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+
+        for phase_type in ("design", "development", "testing"):
+            phase = ProjectPhase.objects.create(project=self.project, phase_type=phase_type)
+            for n in range(4):
+                PhaseTask.objects.create(
+                    phase=phase,
+                    title=f"{phase_type} {n}",
+                    status="completed" if n % 2 else "pending"
+                ).assigned_to.set(self.people)
+
+        with self.assertNumQueries(self.DETAIL_QUERIES):
+            response = self.client.get(self.url)
+
+        data = response.json()["data"]
+        self.assertEqual(len(data["phases"]), 4)
+        self.assertEqual(len(data["project"]["team_members"]), 3)
+        self.assertEqual(len(data["phases"][1]["tasks"][0]["assigned_to"]), 3)
+
+    def test_progress_from_loaded_tasks(self):
+        phase = self.project.phases.get()
+        PhaseTask.objects.filter(phase=phase).update(status="completed")
+        PhaseTask.objects.create(phase=phase, title="open")
+
+        # 2 of 3 done
+        response = self.client.get(self.url)
+        self.assertEqual(response.json()["data"]["progress_percent"], 66)
+
+    def test_not_modified_skips_the_tree(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_deleted_phase_is_not_served_as_unmodified(self):
+        ProjectPhase.objects.create(project=self.project, phase_type="design")
+        response = self.client.get(self.url)
+        self.assertNotIn("Last-Modified", response)
+
+        ProjectPhase.objects.filter(project=self.project, phase_type="design").delete()
+
+        # Date-only revalidation, as a client without the ETag would send
+        response = self.client.get(self.url, HTTP_IF_MODIFIED_SINCE=http_date(time.time() + 3600))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()["data"]["phases"]), 1)
+
+
+# =====================================================
+# CHANGE FEED
+# =====================================================
+
+@override_settings(PROJECT_CHANGE_FEED={**settings.PROJECT_CHANGE_FEED, "SETTLE_SECONDS": 0})
+class ProjectChangeFeedTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.people = [make_employee(n) for n in range(2)]
+        cls.project = make_project("feed", ["planning"], 1, cls.people)
+
+    def setUp(self):
+        self.client = APIClient()
+
+    def poll(self, since=None):
+        response = self.client.get("/project/changes/", {"since": since} if since else {})
+        return response.status_code, response.json()["data"]
+
+    def test_counter_updates_are_in_the_feed(self):
+        _, first = self.poll()
+        self.assertTrue(first["projects"])
+
+        time.sleep(0.01)
+        PhaseTask.objects.create(phase=self.project.phases.get(), title="new")
+        time.sleep(0.01)
+
+        _, changes = self.poll(first["next"])
+        self.assertEqual([row["id"] for row in changes["projects"]], [self.project.id])
+        self.assertEqual(len(changes["phases"]), 1)
+
+    def test_bad_cursor_is_400(self):
+        _, first = self.poll()
+        state = decode_token(first["next"])
+
+        naive = {**state, "at": datetime.now().isoformat()}
+        text_id = {**state, "deleted": "5"}
+        bad_watermark = {**state, "projects": [state["projects"][0], "1 OR 1"]}
+        naive_watermark = {**state, "projects": ["2024-01-01T00:00:00", 1]}
+
+        for bad in (naive, text_id, bad_watermark, naive_watermark):
+            status, _ = self.poll(encode_token(bad))
+            self.assertEqual(status, 400, bad)
+
+        self.assertEqual(self.poll("not-a-token")[0], 400)
+
+
+# =====================================================
+# TASK COUNTERS
+# =====================================================
+
+class TaskCounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.people = [make_employee(n) for n in range(2)]
+
+    def setUp(self):
+        self.project = make_project("counted", ["planning", "design"], 2, self.people)
+        self.planning, self.design = self.project.phases.order_by("id")
+
+    def counters(self, row):
+        row.refresh_from_db()
+        return row.total_tasks, row.completed_tasks, row.computed_status
+
+    def test_create_and_status_change(self):
+        self.assertEqual(self.counters(self.project), (4, 0, "ongoing"))
+
+        for task in PhaseTask.objects.filter(phase=self.planning):
+            task.status = "completed"
+            task.save()
+
+        self.assertEqual(self.counters(self.planning), (2, 2, "completed"))
+        self.assertEqual(self.counters(self.project), (4, 2, "ongoing"))
+
+    def test_stale_instances_do_not_count_twice(self):
+        task = PhaseTask.objects.filter(phase=self.planning).first()
+        first, second = PhaseTask.objects.get(pk=task.pk), PhaseTask.objects.get(pk=task.pk)
+
+        # Both loaded as pending, as two concurrent requests would
+        first.status = "completed"
+        first.save()
+        second.status = "completed"
+        second.save()
+
+        self.assertEqual(self.counters(self.project), (4, 1, "ongoing"))
+
+        first.delete()
+        second.delete()
+        self.assertEqual(self.counters(self.project), (3, 0, "ongoing"))
+
+    def test_task_moved_between_phases(self):
+        task = PhaseTask.objects.filter(phase=self.planning).first()
+        task.phase = self.design
+        task.status = "completed"
+        task.save()
+
+        self.assertEqual(self.counters(self.planning), (1, 0, "ongoing"))
+        self.assertEqual(self.counters(self.design), (3, 1, "ongoing"))
+
+    def test_phase_moved_to_another_project(self):
+        other = make_project("other", ["testing"], 1, self.people)
+
+        self.design.project = other
+        self.design.save()
+
+        self.assertEqual(self.counters(self.project), (2, 0, "ongoing"))
+        self.assertEqual(self.counters(other), (3, 0, "ongoing"))
+
+    def test_rebuild_after_bulk_update(self):
+        # update() sends no signals → counters stale until rebuilt
+        PhaseTask.objects.filter(phase__project=self.project).update(status="completed")
+        self.assertEqual(self.counters(self.project), (4, 0, "ongoing"))
+
+        call_command("rebuild_project_counters", self.project.project_id, stdout=StringIO())
+
+        self.assertEqual(self.counters(self.project), (4, 4, "completed"))
+        self.assertEqual(self.counters(self.design), (2, 2, "completed"))
@@ -3,6 +3,7 @@ from .views import (
 
     # Project
     PhaseTaskViewSet,
+    ProjectChangesAPIView,
     ProjectFullDetailAPIView,
     ProjectPhaseViewSet,
     ProjectViewSet,
@@ -72,7 +73,12 @@ urlpatterns = [
     path('tasks/list/', task_list, name='task-list'),
     path('tasks/edit/<str:task_id>/', task_edit, name='task-edit'),
     path('tasks/delete/<str:task_id>/', task_delete, name='task-delete'),
-    path("projects/phases/<str:phase_id>/tasks/",PhaseTaskViewSet.as_view({"get": "list"}),name="phase-tasks")
+    path("projects/phases/<str:phase_id>/tasks/",PhaseTaskViewSet.as_view({"get": "list"}),name="phase-tasks"),
+
+    # -----------------------------
+    # Change feed
+    # -----------------------------
+    path('changes/', ProjectChangesAPIView.as_view(), name='project-changes'),
 
     
 ]
@@ -0,0 +1,62 @@
+from django.db.models import OuterRef
+
+from codeedex.conditional import count_of, max_of
+from employees.models import Employee
+
+from .models import PhaseTask, Project, ProjectPhase
+
+
+# =====================================================
+# PROJECT VERSION VECTOR (ETag)
+# =====================================================
+# Everything a project detail payload shows, as one indexed query:
+# the project row and counters, max updated_at of its phases / tasks /
+# people, and the phase count (deletes do not move a max). Assignment
+# edits bump the row's updated_at (project.signals), and the task
+# counters move on task deletes.
+#
+# No Last-Modified: a delete (phase, task, team member) changes the
+# vector but need not advance any updated_at, so If-Modified-Since
+# alone would answer 304 with the deleted rows still shown.
+#
+# People get one MAX per relation (team, manager, phase and task
+# assignees): each walks its own index from the project side, where one
+# OR over all four would join them together and fan out.
+
+PEOPLE = {
+    "team_at": "project_teams",
+    "manager_at": "managed_projects",
+    "phase_people_at": "assigned_phases__project",
+    "task_people_at": "assigned_tasks__phase__project",
+}
+
+
+def project_version(request, project_id, **kwargs):
+    row = (
+        Project.objects
+        .filter(project_id=project_id)
+        .annotate(
+            phases_at=max_of(ProjectPhase.objects.filter(project=OuterRef("pk"))),
+            phase_count=count_of(ProjectPhase.objects.filter(project=OuterRef("pk"))),
+            tasks_at=max_of(PhaseTask.objects.filter(phase__project=OuterRef("pk"))),
+            **{
+                name: max_of(Employee.objects.filter(**{relation: OuterRef("pk")}))
+                for name, relation in PEOPLE.items()
+            },
+        )
+        .values_list(
+            "updated_at",
+            "total_tasks",
+            "completed_tasks",
+            "phases_at",
+            "phase_count",
+            "tasks_at",
+            *PEOPLE,
+        )
+        .first()
+    )
+
+    if row is None:
+        return None
+
+    return row, None
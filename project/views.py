@@ -1,3 +1,4 @@
+from django.db.models import Prefetch
 from django.shortcuts import get_object_or_404
 from rest_framework import viewsets, generics, status
 from rest_framework.permissions import AllowAny
@@ -10,13 +11,20 @@ from .models import (
 )
 
 from .serializers import (
+    TASK_COLUMNS,
     ProjectSerializer,
     ProjectListSerializer,
     ProjectPhaseSerializer,
     PhaseTaskSerializer,
+    employee_basic_prefetch,
 )
 
+from .changes import ExpiredToken, InvalidToken, changes_since
 from .utils import api_response
+from .versions import project_version
+from codeedex.conditional import conditional
+from codeedex.db_routers import replica_reads
+from codeedex.pagination import KeysetPagination
 
 
 # =====================================================
@@ -28,6 +36,9 @@ class ProjectViewSet(viewsets.ModelViewSet):
     permission_classes = [AllowAny]
     lookup_field = "project_id"
     lookup_url_kwarg = "project_id"
+    replica_reads = {"list"}  # codeedex.db_routers
+    pagination_class = KeysetPagination
+    cursor_ordering = ("-created_at", "id")
 
     def get_serializer_class(self):
         return (
@@ -39,19 +50,26 @@ class ProjectViewSet(viewsets.ModelViewSet):
     def get_serializer_context(self):
         return {"request": self.request}
 
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ("list", "retrieve"):
+            # Join / prefetch only what ?fields= / ?expand= render
+            queryset = self.get_serializer_class().setup_queryset(queryset, self.request)
+        return queryset
+
     # -----------------------------
     # LIST
     # -----------------------------
     def list(self, request, *args, **kwargs):
+        page = self.paginate_queryset(self.get_queryset())
         serializer = self.get_serializer(
-            self.get_queryset(),
+            page,
             many=True,
             context={"request": request}
         )
-        return api_response(
-            success=True,
-            message="Projects fetched successfully",
-            data=serializer.data
+        return self.paginator.get_paginated_response(
+            serializer.data,
+            message="Projects fetched successfully"
         )
 
     # -----------------------------
@@ -75,6 +93,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
     # -----------------------------
     # RETRIEVE
     # -----------------------------
+    @conditional(project_version)
     def retrieve(self, request, *args, **kwargs):
         serializer = self.get_serializer(
             self.get_object(),
@@ -121,14 +140,16 @@ class ProjectViewSet(viewsets.ModelViewSet):
 # PROJECT FILTER BY TYPE
 # =====================================================
 
+@replica_reads
 class ProjectTypeFilterView(generics.ListAPIView):
     serializer_class = ProjectListSerializer
     permission_classes = [AllowAny]
 
     def get_queryset(self):
-        return Project.objects.filter(
+        queryset = Project.objects.filter(
             project_type=self.kwargs["ptype"]
         ).order_by("-created_at")
+        return ProjectListSerializer.setup_queryset(queryset, self.request)
 
     def list(self, request, *args, **kwargs):
         serializer = self.get_serializer(
@@ -155,6 +176,7 @@ class ProjectPhaseViewSet(viewsets.ModelViewSet):
 
     lookup_field = "phase_id"
     lookup_url_kwarg = "phase_id"
+    replica_reads = {"list"}  # codeedex.db_routers
 
     # -----------------------------
     # LIST BY PROJECT (PATH PARAM)
@@ -171,6 +193,8 @@ class ProjectPhaseViewSet(viewsets.ModelViewSet):
         else:
             queryset = ProjectPhase.objects.all().order_by("start_date")
 
+        queryset = ProjectPhaseSerializer.setup_queryset(queryset, request)
+
         serializer = self.get_serializer(
             queryset,
             many=True,
@@ -246,6 +270,9 @@ class PhaseTaskViewSet(viewsets.ModelViewSet):
 
     lookup_field = "task_id"
     lookup_url_kwarg = "task_id"
+    replica_reads = {"list"}  # codeedex.db_routers
+    pagination_class = KeysetPagination
+    cursor_ordering = ("id",)
 
     # -----------------------------
     # LIST TASKS BY PHASE (PATH)
@@ -258,20 +285,22 @@ class PhaseTaskViewSet(viewsets.ModelViewSet):
 
             queryset = PhaseTask.objects.filter(
                 phase__phase_id=phase_id
-            ).order_by("start_date")
+            )
         else:
-            queryset = PhaseTask.objects.all().order_by("start_date")
+            queryset = PhaseTask.objects.all()
+
+        queryset = PhaseTaskSerializer.setup_queryset(queryset, request)
 
+        page = self.paginate_queryset(queryset)
         serializer = self.get_serializer(
-            queryset,
+            page,
             many=True,
             context={"request": request}
         )
 
-        return api_response(
-            success=True,
-            message="Phase tasks fetched successfully",
-            data=serializer.data
+        return self.paginator.get_paginated_response(
+            serializer.data,
+            message="Phase tasks fetched successfully"
         )
 
     # -----------------------------
@@ -329,37 +358,35 @@ class PhaseTaskViewSet(viewsets.ModelViewSet):
 class ProjectFullDetailAPIView(APIView):
     permission_classes = [AllowAny]
 
+    @conditional(project_version)
     def get(self, request, project_id):
-        project = get_object_or_404(
-            Project,
-            project_id=project_id
+        # Whole tree in one pass: project + manager, team, phases,
+        # tasks, task assignees (5 queries whatever the size)
+        queryset = ProjectSerializer.setup_queryset(
+            Project.objects.all(),
+            request
+        ).prefetch_related(
+            Prefetch("phases", queryset=ProjectPhase.objects.order_by("id")),
+            Prefetch("phases__tasks", queryset=PhaseTask.objects.only(*TASK_COLUMNS)),
+            employee_basic_prefetch("phases__tasks__assigned_to"),
         )
 
+        project = get_object_or_404(queryset, project_id=project_id)
+
         project_data = ProjectSerializer(
             project,
             context={"request": request}
         ).data
 
-        phases = (
-            ProjectPhase.objects
-            .filter(project=project)
-            .prefetch_related(
-                "tasks",
-                "tasks__assigned_to"
-            )
-        )
-
         phase_data = []
-        total_tasks = 0
-        completed_tasks = 0
+        total_tasks = completed_tasks = 0
 
-        for phase in phases:
+        for phase in project.phases.all():
             tasks = phase.tasks.all()
 
-            total_tasks += tasks.count()
-            completed_tasks += tasks.filter(
-                status="completed"
-            ).count()
+            # Progress from the loaded tasks, no COUNT queries
+            total_tasks += len(tasks)
+            completed_tasks += sum(1 for task in tasks if task.status == "completed")
 
             phase_data.append({
                 "id": phase.id,
@@ -389,3 +416,28 @@ class ProjectFullDetailAPIView(APIView):
                 "progress_percent": progress
             }
         )
+
+
+# =====================================================
+# CHANGE FEED (projects / phases / tasks since a sync token)
+# =====================================================
+
+class ProjectChangesAPIView(APIView):
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        try:
+            data = changes_since(
+                request.query_params.get("since"),
+                context={"request": request}
+            )
+        except InvalidToken:
+            return api_response(False, "Invalid sync token", None, 400)
+        except ExpiredToken:
+            return api_response(False, "Sync token expired, reload everything", None, 410)
+
+        return api_response(
+            success=True,
+            message="Changes fetched successfully",
+            data=data
+        )